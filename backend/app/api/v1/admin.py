@@ -0,0 +1,66 @@
+"""Admin API endpoints."""
+import logging
+from typing import Dict
+from fastapi import APIRouter, Depends, HTTPException, status, Path
+from app.models.schemas import CachePurgeResponse, DemoPrerenderStatusResponse
+from app.services.audio_service import processed_audio_cache
+from app.services.demo_prerender import demo_prerenderer
+from app.services.tts_service import tts_service
+from app.core.security import require_admin_key
+from app.utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+router = APIRouter(dependencies=[Depends(require_admin_key)])
+
+
+def _get_caches() -> Dict[str, LRUCache]:
+    """Return the purgeable in-memory caches by name."""
+    caches = {"asr_audio": processed_audio_cache}
+    if tts_service.cache is not None:
+        caches["tts"] = tts_service.cache
+    return caches
+
+
+@router.get("/admin/cache")
+async def get_cache_stats():
+    """
+    Get statistics for all in-memory caches.
+    
+    Returns:
+        Cache statistics keyed by cache name
+    """
+    return {name: cache.stats() for name, cache in _get_caches().items()}
+
+
+@router.delete("/admin/cache/{cache_name}", response_model=CachePurgeResponse)
+async def purge_cache(cache_name: str = Path(..., description="Cache name (e.g., 'tts', 'asr_audio')")):
+    """
+    Remove all entries from an in-memory cache.
+    
+    Args:
+        cache_name: Name of the cache to purge
+    
+    Returns:
+        Number of entries removed
+    """
+    cache = _get_caches().get(cache_name)
+    if cache is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown cache '{cache_name}'"
+        )
+    
+    purged = cache.clear()
+    logger.info(f"Purged {purged} entries from the {cache_name} cache")
+    return CachePurgeResponse(cache=cache_name, purged=purged)
+
+
+@router.get("/admin/prerender", response_model=DemoPrerenderStatusResponse)
+async def get_prerender_status():
+    """
+    Get coverage and staleness of the pre-rendered demo catalog.
+    
+    Returns:
+        Demo pre-render status
+    """
+    return DemoPrerenderStatusResponse(**demo_prerenderer.snapshot())
@@ -1,10 +1,12 @@
 """Automatic Speech Recognition API endpoints."""
+import asyncio
 import logging
 from fastapi import APIRouter, HTTPException, status, UploadFile, File, Form, Request
 from app.models.schemas import ASRResponse
 from app.services.asr_service import asr_service
 from app.services.audio_service import AudioService
 from app.core.security import get_rate_limiter
+from app.core.exceptions import ServiceOverloadedError
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -34,12 +36,24 @@ async def speech_to_text(
         audio_content = await audio.read()
         filename = audio.filename or "audio.wav"
         
-        # Validate and process audio
-        is_valid, error_msg, processed_audio = audio_service.validate_and_process_audio(
-            audio_content,
-            filename,
-            apply_noise_reduction=True
-        )
+        # Validate and process audio on the worker pool
+        try:
+            is_valid, error_msg, processed_audio = await audio_service.validate_and_process_audio_async(
+                audio_content,
+                filename,
+                apply_noise_reduction=True
+            )
+        except ServiceOverloadedError as e:
+            raise HTTPException(
+                status_code=e.status_code,
+                detail=str(e),
+                headers={"Retry-After": str(e.retry_after)}
+            )
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Audio processing timed out. Please try again later."
+            )
         
         if not is_valid:
             raise HTTPException(
@@ -48,10 +62,17 @@ async def speech_to_text(
             )
         
         # Transcribe audio
-        transcribed_text = await asr_service.transcribe(
-            processed_audio,
-            language=language
-        )
+        try:
+            transcribed_text = await asr_service.transcribe(
+                processed_audio,
+                language=language
+            )
+        except ServiceOverloadedError as e:
+            raise HTTPException(
+                status_code=e.status_code,
+                detail=str(e),
+                headers={"Retry-After": str(e.retry_after)}
+            )
         
         if transcribed_text is None:
             raise HTTPException(
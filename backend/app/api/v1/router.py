@@ -1,6 +1,6 @@
 """API v1 router aggregation."""
 from fastapi import APIRouter
-from app.api.v1 import tts, asr, voices, contact
+from app.api.v1 import tts, asr, voices, contact, admin
 
 router = APIRouter()
 
@@ -9,4 +9,5 @@ router.include_router(tts.router, tags=["TTS"])
 router.include_router(asr.router, tags=["ASR"])
 router.include_router(voices.router, tags=["Voices"])
 router.include_router(contact.router, tags=["Contact"])
+router.include_router(admin.router, tags=["Admin"])
 
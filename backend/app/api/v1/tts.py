@@ -1,16 +1,53 @@
 """Text-to-Speech API endpoints."""
 import logging
 from fastapi import APIRouter, HTTPException, status, Request
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from app.models.schemas import TTSRequest
 from app.services.tts_service import tts_service
+from app.services.speaker_registry import reference_speaker_registry
+from app.utils.output_codec import OUTPUT_FORMATS, OUTPUT_SAMPLE_RATES, negotiate_output_format
 from app.core.security import get_rate_limiter
+from app.core.exceptions import ServiceOverloadedError
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 limiter = get_rate_limiter()
 
 
+def _check_sample_rate(tts_request: TTSRequest):
+    """
+    Reject unsupported output sample rates.
+    
+    Args:
+        tts_request: TTS request
+        
+    Raises:
+        HTTPException: 400 if sample_rate is not one of OUTPUT_SAMPLE_RATES
+    """
+    if tts_request.sample_rate and tts_request.sample_rate not in OUTPUT_SAMPLE_RATES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported sample_rate {tts_request.sample_rate}. Supported: {', '.join(map(str, OUTPUT_SAMPLE_RATES))}"
+        )
+
+
+def _check_ref_id(tts_request: TTSRequest):
+    """
+    Reject requests that reference an unregistered reference speaker.
+    
+    Args:
+        tts_request: TTS request
+        
+    Raises:
+        HTTPException: 404 if ref_id is set but not registered
+    """
+    if tts_request.ref_id and not reference_speaker_registry.exists(tts_request.ref_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Reference speaker '{tts_request.ref_id}' not found. Register it via /voices/clone-reference."
+        )
+
+
 @router.post("/tts")
 @limiter.limit("30/minute")
 async def text_to_speech(request: Request, tts_request: TTSRequest):
@@ -22,10 +59,14 @@ async def text_to_speech(request: Request, tts_request: TTSRequest):
         tts_request: TTS request containing text and optional parameters
         
     Returns:
-        Audio file (WAV format)
+        Audio file in the requested format (WAV, FLAC, MP3 or Opus/OGG;
+        chosen by the format field or the Accept header, WAV by default)
     """
     try:
         logger.info(f"Received TTS request: text='{tts_request.text[:50]}...', voice={tts_request.voice}, language={tts_request.language}, cloneing={tts_request.cloneing}")
+        _check_ref_id(tts_request)
+        _check_sample_rate(tts_request)
+        output_format = negotiate_output_format(tts_request.format, request.headers.get("accept"))
         
         # Synthesize speech
         audio_content = await tts_service.synthesize(
@@ -34,7 +75,10 @@ async def text_to_speech(request: Request, tts_request: TTSRequest):
             language=tts_request.language,
             cloneing=tts_request.cloneing or False,
             ref_speker_base64=tts_request.ref_speker_base64,
-            ref_speker_name=tts_request.ref_speker_name
+            ref_speker_name=tts_request.ref_speker_name,
+            ref_id=tts_request.ref_id,
+            output_format=output_format,
+            sample_rate=tts_request.sample_rate
         )
         
         if audio_content is None:
@@ -44,20 +88,29 @@ async def text_to_speech(request: Request, tts_request: TTSRequest):
                 detail=f"TTS service is unavailable for voice '{tts_request.voice}'. Please try again later."
             )
         
-        logger.info(f"TTS synthesis successful: {len(audio_content)} bytes")
+        logger.info(f"TTS synthesis successful: {len(audio_content)} bytes as {output_format}")
         
         # Return audio response
+        spec = OUTPUT_FORMATS[output_format]
         return Response(
             content=audio_content,
-            media_type="audio/wav",
+            media_type=spec.media_type,
             headers={
-                "Content-Disposition": "attachment; filename=tts.wav"
+                "Content-Disposition": f"attachment; filename=tts.{spec.extension}",
+                "Vary": "Accept"
             }
         )
         
     except HTTPException as e:
         logger.warning(f"HTTPException in TTS endpoint: {e.status_code} - {e.detail}")
         raise
+    except ServiceOverloadedError as e:
+        logger.warning(f"TTS request shed: {e}")
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except Exception as e:
         logger.error(f"Error in TTS endpoint: {e}", exc_info=True)
         raise HTTPException(
@@ -65,3 +118,83 @@ async def text_to_speech(request: Request, tts_request: TTSRequest):
             detail=f"An error occurred while processing your request: {str(e)}"
         )
 
+
+
+@router.post("/tts/stream")
+@limiter.limit("30/minute")
+async def text_to_speech_stream(request: Request, tts_request: TTSRequest):
+    """
+    Convert text to speech, streaming audio sentence by sentence.
+    
+    The response is a WAV stream with an open-ended length: playback can
+    start as soon as the first sentence has been synthesized.
+    
+    Args:
+        request: FastAPI request object (for rate limiting)
+        tts_request: TTS request containing text and optional parameters
+        
+    Returns:
+        Streaming audio response (WAV format)
+    """
+    logger.info(f"Received streaming TTS request: text='{tts_request.text[:50]}...', voice={tts_request.voice}, language={tts_request.language}")
+    _check_ref_id(tts_request)
+    if (tts_request.format and tts_request.format != "wav") or tts_request.sample_rate:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Streaming TTS returns WAV at the synthesized sample rate; use /tts for other formats."
+        )
+    
+    stream = tts_service.synthesize_stream(
+        text=tts_request.text,
+        voice=tts_request.voice,
+        language=tts_request.language,
+        cloneing=tts_request.cloneing or False,
+        ref_speker_base64=tts_request.ref_speker_base64,
+        ref_speker_name=tts_request.ref_speker_name,
+        ref_id=tts_request.ref_id
+    )
+    
+    # Wait for the first sentence so failures can still return a proper status
+    try:
+        first_chunk = await stream.__anext__()
+    except StopAsyncIteration:
+        first_chunk = None
+    except ServiceOverloadedError as e:
+        logger.warning(f"Streaming TTS request shed: {e}")
+        await stream.aclose()
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except Exception as e:
+        logger.error(f"Error in streaming TTS endpoint: {e}", exc_info=True)
+        await stream.aclose()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"An error occurred while processing your request: {str(e)}"
+        )
+    
+    if first_chunk is None:
+        logger.warning(f"Streaming TTS produced no audio for voice={tts_request.voice}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"TTS service is unavailable for voice '{tts_request.voice}'. Please try again later."
+        )
+    
+    async def audio_stream():
+        try:
+            yield first_chunk
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.aclose()
+    
+    return StreamingResponse(
+        audio_stream(),
+        media_type="audio/wav",
+        headers={
+            "Content-Disposition": "attachment; filename=tts.wav",
+            "Cache-Control": "no-cache"
+        }
+    )
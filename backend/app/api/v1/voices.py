@@ -1,13 +1,19 @@
 """Voice management API endpoints."""
+import asyncio
 import logging
-from fastapi import APIRouter, HTTPException, status, Path
+from fastapi import APIRouter, HTTPException, status, Path, UploadFile, File, Request
 from fastapi.responses import Response
-from app.models.schemas import VoiceListResponse, ReferenceVoice
+from app.models.schemas import VoiceListResponse, ReferenceVoice, ReferenceSpeakerResponse
 from app.services.voice_service import voice_service
+from app.services.speaker_registry import register_reference_speaker
+from app.core.executor import audio_worker_pool
+from app.core.exceptions import ServiceOverloadedError
+from app.core.security import get_rate_limiter
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
+limiter = get_rate_limiter()
 
 
 @router.get("/voices/reference", response_model=VoiceListResponse)
@@ -42,3 +48,61 @@ async def list_reference_voices():
 # This endpoint is kept for API compatibility but voices should be accessed
 # directly from the model server if needed.
 
+
+@router.post("/voices/clone-reference", response_model=ReferenceSpeakerResponse)
+@limiter.limit("10/minute")
+async def register_clone_reference(
+    request: Request,
+    audio: UploadFile = File(..., description="Reference speaker audio for voice cloning")
+):
+    """
+    Register a reference speaker clip for voice cloning.
+    
+    The clip is trimmed, converted to 16 kHz mono and capped in length,
+    then stored under a content hash. Pass the returned ref_id in TTS
+    requests instead of ref_speker_base64. Uploading the same clip again
+    returns the same ref_id.
+    
+    Args:
+        request: FastAPI request object (for rate limiting)
+        audio: Reference audio file (WAV, MP3, M4A, WebM, etc.)
+        
+    Returns:
+        The ref_id and details of the stored clip
+    """
+    try:
+        audio_content = await audio.read()
+        filename = audio.filename or "reference.wav"
+        
+        try:
+            ref_id, error_msg, info = await audio_worker_pool.run(
+                register_reference_speaker, audio_content, filename
+            )
+        except ServiceOverloadedError as e:
+            raise HTTPException(
+                status_code=e.status_code,
+                detail=str(e),
+                headers={"Retry-After": str(e.retry_after)}
+            )
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Audio processing timed out. Please try again later."
+            )
+        
+        if ref_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=error_msg
+            )
+        
+        return ReferenceSpeakerResponse(ref_id=ref_id, **info)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error registering reference speaker: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An error occurred while registering the reference speaker."
+        )
@@ -18,10 +18,135 @@ class Settings(BaseSettings):
     # Model Base URL (points to LitServe /predict endpoint)
     MODEL_BASE_URL: str = ""
     
+    # LitServe replicas (comma-separated base URLs, same form as MODEL_BASE_URL;
+    # empty = MODEL_BASE_URL only). Calls go to the least-loaded healthy replica.
+    MODEL_REPLICA_URLS_STR: str = ""
+    # Circuit breaker: consecutive failures before a replica's circuit opens,
+    # and seconds between health probes while it is open
+    BACKEND_EJECT_FAILURES: int = 3
+    BACKEND_EJECT_SEC: float = 10.0
+    # Hedged requests: duplicate a call to another replica when it has not
+    # returned within the given percentile of recent latencies
+    BACKEND_HEDGE_ENABLED: bool = False
+    BACKEND_HEDGE_PERCENTILE: float = 95.0
+    BACKEND_HEDGE_MIN_DELAY_SEC: float = 0.05
+    BACKEND_HEDGE_MAX_RATIO: float = 0.1  # at most this fraction of calls is hedged
+    # Background health probing of the replicas (feeds /health and the circuit
+    # breakers; /health probes live only when no recent round exists)
+    HEALTH_PROBE_ENABLED: bool = True
+    HEALTH_PROBE_INTERVAL_SEC: float = 5.0
+    HEALTH_PROBE_TIMEOUT_SEC: float = 2.0
+    HEALTH_PROBE_HISTORY: int = 60  # probe results kept per replica
+    # Adaptive concurrency limit for model server calls (shared by TTS and ASR):
+    # the limit follows backend latency between MIN and MAX; calls beyond it
+    # wait in a bounded queue and are shed with 429 (queue full) or 503 (waited
+    # longer than BACKEND_QUEUE_TIMEOUT_SEC)
+    BACKEND_CONCURRENCY_ENABLED: bool = True
+    BACKEND_CONCURRENCY_INITIAL: int = 8
+    BACKEND_CONCURRENCY_MIN: int = 2
+    BACKEND_CONCURRENCY_MAX: int = 20  # below MODEL_HTTP_MAX_CONNECTIONS, leaving room for hedges and probes
+    BACKEND_QUEUE_DEPTH: int = 64
+    BACKEND_QUEUE_TIMEOUT_SEC: float = 10.0
+    
+    # Shared HTTP client for model server calls. HTTP/2 is negotiated on https
+    # replicas when the h2 package is installed; otherwise HTTP/1.1 is used.
+    MODEL_HTTP2_ENABLED: bool = True
+    # Speak HTTP/2 to http:// replicas without negotiation (h2c prior
+    # knowledge). Only for model servers that accept cleartext HTTP/2.
+    MODEL_HTTP2_PRIOR_KNOWLEDGE: bool = False
+    MODEL_HTTP_MAX_CONNECTIONS: int = 32
+    MODEL_HTTP_MAX_KEEPALIVE: int = 16
+    MODEL_HTTP_KEEPALIVE_EXPIRY_SEC: float = 30.0
+    MODEL_HTTP_CONNECT_TIMEOUT_SEC: float = 5.0
+    MODEL_HTTP_READ_TIMEOUT_SEC: float = 300.0  # long texts and audio files
+    MODEL_HTTP_WRITE_TIMEOUT_SEC: float = 60.0
+    MODEL_HTTP_POOL_TIMEOUT_SEC: float = 10.0  # wait for a free connection
+    
+    # Audio codec used between the gateway and LitServe: "wav", "flac" or "pcm16"
+    BACKEND_AUDIO_CODEC: str = "wav"
+    
+    # Audio transport between the gateway and LitServe: "json" (base64 audio
+    # in JSON, the original contract) or "binary" (length-prefixed frames of
+    # JSON metadata + raw audio bytes)
+    BACKEND_TRANSPORT: str = "json"
+    
+    # TTS response cache (keyed by normalized text, voice, language and format)
+    TTS_CACHE_ENABLED: bool = True
+    TTS_CACHE_MB: int = 128
+    
+    # Pre-render the demo catalog (example texts x voices) into the TTS cache
+    DEMO_PRERENDER_ENABLED: bool = False
+    DEMO_PRERENDER_REFRESH_SEC: float = 21600.0  # 0 = render once at startup
+    DEMO_PRERENDER_CONCURRENCY: int = 2
+    
+    # Reference speaker registry for voice cloning (clips stored once, referenced by ref_id)
+    REF_SPEAKER_DIR: str = "storage/reference_speakers"
+    REF_SPEAKER_MAX_SEC: float = 30.0
+    REF_SPEAKER_MIN_SEC: float = 1.0
+    REF_SPEAKER_CACHE_MB: int = 64
+    
+    # Long-form TTS: split long text into sentences and synthesize them
+    # concurrently. Off by default: the stitched audio has sentence pauses
+    # and prosody that differ from one request, so clients opt in
+    TTS_LONG_FORM_ENABLED: bool = False
+    TTS_LONG_FORM_MIN_CHARS: int = 300  # shorter texts are sent as one request
+    TTS_CHUNK_MAX_CHARS: int = 250
+    TTS_FANOUT_LIMIT: int = 4
+    TTS_SENTENCE_PAUSE_MS: float = 150.0  # silence inserted between sentences
+    
+    # Coalesce identical concurrent TTS/ASR requests into one backend call
+    SINGLE_FLIGHT_ENABLED: bool = True
+    
     # Audio Processing Configuration
     MAX_AUDIO_SIZE_MB: int = 50
     MAX_AUDIO_DURATION_SEC: int = 300
     NOISE_SUPPRESSION_ENABLED: bool = True
+    NOISE_SUPPRESSION_STATIONARY: bool = False
+    # Audio longer than one block is denoised block by block to bound memory,
+    # always in stationary mode with one noise profile for the whole recording
+    NOISE_SUPPRESSION_STREAMING: bool = True
+    NOISE_SUPPRESSION_BLOCK_SEC: float = 20.0
+    NOISE_SUPPRESSION_OVERLAP_SEC: float = 1.0
+    NOISE_SUPPRESSION_CONTEXT_SEC: float = 6.0
+    
+    # Voice Activity Detection (silence trimming before ASR). Off by default:
+    # when enabled, leading, trailing and internal pauses longer than
+    # VAD_MIN_SILENCE_MS are removed from the audio sent to the model
+    VAD_ENABLED: bool = False
+    VAD_FRAME_MS: int = 30
+    VAD_THRESHOLD_DB: float = 40.0  # frames quieter than peak minus this are silence
+    VAD_MAX_SPECTRAL_FLATNESS: float = 0.45  # flatter (noise-like) frames are silence
+    VAD_MIN_SILENCE_MS: int = 600  # shorter pauses are kept
+    VAD_PAD_MS: int = 200  # audio kept around each speech region
+    
+    # Processed ASR audio cache (keyed by upload content hash)
+    ASR_AUDIO_CACHE_ENABLED: bool = True
+    ASR_AUDIO_CACHE_MB: int = 256
+    
+    # Long-form ASR: split long audio at pauses and transcribe segments
+    # concurrently. Off by default: segment boundaries can change the
+    # transcription, so clients opt in
+    ASR_LONG_FORM_ENABLED: bool = False
+    ASR_SEGMENT_MAX_SEC: float = 30.0
+    ASR_SEGMENT_MIN_PAUSE_MS: int = 300
+    ASR_FANOUT_LIMIT: int = 4
+    
+    # Audio Worker Pool Configuration
+    AUDIO_WORKER_MODE: str = "thread"  # "thread" or "process"
+    AUDIO_WORKERS: int = 0  # 0 = one worker per CPU core
+    AUDIO_WORKER_QUEUE_DEPTH: int = 16
+    AUDIO_TASK_TIMEOUT_SEC: float = 120.0
+    AUDIO_PRELOAD_LIBRARIES: bool = False  # Import librosa/noisereduce at startup instead of first use
+    
+    # Pooled ffmpeg decoder for m4a/webm uploads (falls back to librosa without ffmpeg)
+    FFMPEG_DECODER_ENABLED: bool = True
+    FFMPEG_BINARY: str = "ffmpeg"
+    FFMPEG_DECODER_POOL_SIZE: int = 2
+    FFMPEG_DECODE_TIMEOUT_SEC: float = 60.0
+    
+    # Startup warm-up (/ready reports ready once it has finished)
+    WARMUP_ENABLED: bool = True
+    WARMUP_STEP_TIMEOUT_SEC: float = 60.0
     
     # CORS Configuration (comma-separated string, will be split)
     CORS_ORIGINS_STR: str = "http://localhost:5173,http://localhost:3000,http://localhost:8000,https://somya.ai,https://www.somya.ai,http://somya.ai,http://www.somya.ai"
@@ -34,6 +159,9 @@ class Settings(BaseSettings):
     RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_PER_MINUTE: int = 60
     
+    # Admin endpoints and /metrics require this key in the X-Admin-Key header (empty = disabled)
+    ADMIN_API_KEY: str = ""
+    
     # Supported Languages
     SUPPORTED_LANGUAGES: List[str] = ["en", "hi", "kn", "te", "ma", "sa"]
     SUPPORTED_GENDERS: List[str] = ["male", "female"]
@@ -61,6 +189,12 @@ class Settings(BaseSettings):
         if not self.MODEL_BASE_URL:
             self.MODEL_BASE_URL = f"{self.LITSERVE_SERVER_URL.rstrip('/')}/predict"
     
+    @property
+    def MODEL_REPLICA_URLS(self) -> List[str]:
+        """Split model server replica URLs into list, defaulting to MODEL_BASE_URL."""
+        urls = [url.strip() for url in self.MODEL_REPLICA_URLS_STR.split(",") if url.strip()]
+        return urls or [self.MODEL_BASE_URL]
+    
     @property
     def CORS_ORIGINS(self) -> List[str]:
         """Split CORS origins string into list."""
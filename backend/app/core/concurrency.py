@@ -0,0 +1,193 @@
+"""Adaptive concurrency limiting and admission control."""
+import math
+import asyncio
+from collections import deque
+from typing import Deque, Optional
+from app.core.exceptions import ServiceOverloadedError
+from app.core.metrics import metrics
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit that adapts to observed latency (gradient style).
+    
+    Each completed call updates a short-term and a long-term EWMA of its
+    latency. While the short-term latency stays within tolerance of the
+    long-term one the limit grows by about sqrt(limit) per step; as calls
+    slow down (queueing in the backend) the limit shrinks in proportion to
+    the slowdown. Failed calls cut the limit multiplicatively (AIMD). The
+    limit only grows while it is actually being used.
+    
+    Calls beyond the limit wait in a bounded FIFO queue. A call that finds
+    the queue full is rejected at once (429); one that waits longer than
+    max_queue_sec is rejected when its wait expires (503). Both raise
+    ServiceOverloadedError with a Retry-After estimate.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 20,
+        max_queue: int = 64,
+        max_queue_sec: float = 10.0,
+        tolerance: float = 1.5,
+        long_window: int = 100,
+        smoothing: float = 0.2,
+        backoff_ratio: float = 0.9
+    ):
+        """
+        Initialize limiter.
+        
+        Args:
+            name: Limiter name used in metrics
+            initial_limit: Starting concurrency limit
+            min_limit: Lower bound for the limit
+            max_limit: Upper bound for the limit
+            max_queue: Maximum number of waiting calls
+            max_queue_sec: Maximum time a call may wait for a slot
+            tolerance: Slowdown of short- vs long-term latency tolerated before shrinking
+            long_window: Approximate number of calls the long-term latency averages over
+            smoothing: Weight of each new limit estimate
+            backoff_ratio: Factor applied to the limit when a call fails
+        """
+        self.name = name
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.max_queue = max_queue
+        self.max_queue_sec = max_queue_sec
+        self.tolerance = tolerance
+        self._long_alpha = 2.0 / (max(1, long_window) + 1)
+        self.smoothing = smoothing
+        self.backoff_ratio = backoff_ratio
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._short_rtt: Optional[float] = None
+        self._long_rtt: Optional[float] = None
+        self._rejected = 0
+        self._timed_out = 0
+    
+    def _retry_after(self) -> int:
+        """Estimate in seconds until a slot frees up."""
+        rtt = self._long_rtt or 1.0
+        backlog = (len(self._waiters) + 1) / max(1, int(self.limit))
+        return max(1, math.ceil(rtt * backlog))
+    
+    async def acquire(self):
+        """
+        Wait for a concurrency slot.
+        
+        Raises:
+            ServiceOverloadedError: If the queue is full (429) or the wait
+                exceeds max_queue_sec (503)
+        """
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            self._update_gauges()
+            return
+        
+        if len(self._waiters) >= self.max_queue:
+            self._rejected += 1
+            metrics.increment(f"concurrency.{self.name}.rejected")
+            raise ServiceOverloadedError(
+                "Too many requests in flight to the model server. Please try again later.",
+                retry_after=self._retry_after(),
+                status_code=429
+            )
+        
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._update_gauges()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=self.max_queue_sec)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just as the wait expired: keep the slot
+                return
+            waiter.cancel()
+            self._timed_out += 1
+            metrics.increment(f"concurrency.{self.name}.queue_timeouts")
+            raise ServiceOverloadedError(
+                "Model server is overloaded. Please try again later.",
+                retry_after=self._retry_after(),
+                status_code=503
+            )
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed to us; pass it on
+                self.release()
+            else:
+                waiter.cancel()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            self._update_gauges()
+    
+    def release(self, latency: Optional[float] = None, dropped: bool = False):
+        """
+        Return a slot and adapt the limit.
+        
+        Args:
+            latency: Duration of the call in seconds (None = no sample)
+            dropped: Whether the call failed (error, timeout or 5xx)
+        """
+        in_use = self.in_flight
+        self.in_flight -= 1
+        if dropped:
+            self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+        elif latency is not None:
+            self._adapt(latency, in_use)
+        
+        # Hand free slots to waiters in arrival order
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+        self._update_gauges()
+    
+    def _adapt(self, latency: float, in_use: int):
+        """Move the limit toward the latency gradient estimate."""
+        if self._short_rtt is None:
+            self._short_rtt = self._long_rtt = latency
+            return
+        self._short_rtt += 0.5 * (latency - self._short_rtt)
+        self._long_rtt += self._long_alpha * (latency - self._long_rtt)
+        if self._long_rtt > 2 * self._short_rtt:
+            # Recovering from a slow period: let the baseline catch up
+            self._long_rtt *= 0.95
+        
+        gradient = max(0.5, min(1.0, self.tolerance * self._long_rtt / self._short_rtt))
+        new_limit = self.limit * gradient + math.sqrt(self.limit)
+        if new_limit > self.limit and in_use < self.limit / 2:
+            # Only grow a limit that is being used
+            return
+        self.limit = (1 - self.smoothing) * self.limit + self.smoothing * new_limit
+        self.limit = min(self.max_limit, max(self.min_limit, self.limit))
+    
+    def _update_gauges(self):
+        """Publish limit, in-flight and queue depth gauges."""
+        metrics.set_gauge(f"concurrency.{self.name}.limit", round(self.limit, 2))
+        metrics.set_gauge(f"concurrency.{self.name}.in_flight", self.in_flight)
+        metrics.set_gauge(f"concurrency.{self.name}.queue_depth", len(self._waiters))
+    
+    def stats(self) -> dict:
+        """
+        Get limiter statistics.
+        
+        Returns:
+            Dictionary with limit, in-flight, queue depth, latency and rejection counts
+        """
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queue_depth": len(self._waiters),
+            "short_latency_ms": round(self._short_rtt * 1000, 1) if self._short_rtt is not None else None,
+            "long_latency_ms": round(self._long_rtt * 1000, 1) if self._long_rtt is not None else None,
+            "rejected": self._rejected,
+            "queue_timeouts": self._timed_out,
+        }
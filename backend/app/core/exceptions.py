@@ -1,10 +1,27 @@
-"""Custom exception handlers."""
+"""Custom exceptions and exception handlers."""
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 
+class ServiceOverloadedError(Exception):
+    """Raised when a bounded work queue is full and a request is shed."""
+    
+    def __init__(self, message: str, retry_after: int = 1, status_code: int = 503):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.status_code = status_code
+
+
+class BackendUnavailableError(Exception):
+    """Raised when every model server replica's circuit breaker is open."""
+    
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle validation errors."""
     return JSONResponse(
@@ -23,7 +40,8 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
         content={
             "detail": exc.detail,
             "message": exc.detail
-        }
+        },
+        headers=getattr(exc, "headers", None)
     )
 
 
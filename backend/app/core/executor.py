@@ -0,0 +1,229 @@
+"""Worker pool for CPU-bound audio processing."""
+import os
+import asyncio
+import logging
+import functools
+import threading
+import multiprocessing.util
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+from app.config import settings
+from app.core.exceptions import ServiceOverloadedError
+from app.core.metrics import metrics
+from app.utils.ffmpeg_decoder import ffmpeg_decoder_pool
+
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_worker(preload_libraries: bool = False) -> int:
+    """
+    Pre-load the audio stack inside a worker.
+    
+    Args:
+        preload_libraries: Also import librosa/soundfile/noisereduce, which
+            are otherwise imported lazily by the first request that needs them
+    
+    Returns:
+        Worker process id
+    """
+    from app.utils import audio_utils
+    audio_utils.start_audio_decoders()
+    if preload_libraries:
+        audio_utils.preload_audio_libraries()
+    return os.getpid()
+
+
+def _init_worker() -> None:
+    """
+    Set up a worker process.
+    
+    Registers shutdown of the worker's ffmpeg decoder pool with
+    multiprocessing, which runs it when the worker exits, so idle decoder
+    processes do not outlive the executor.
+    """
+    multiprocessing.util.Finalize(None, ffmpeg_decoder_pool.shutdown, exitpriority=10)
+
+
+def _call_capturing_metrics(fn: Callable[..., Any]) -> Tuple[Any, list]:
+    """
+    Run fn in a worker process and return its result with the metric events it recorded.
+    
+    Worker processes have their own metrics registry, so events are shipped
+    back to the parent and replayed there.
+    """
+    metrics.begin_capture()
+    try:
+        result = fn()
+    finally:
+        events = metrics.end_capture()
+    return result, events
+
+
+class AudioWorkerPool:
+    """
+    Bounded executor that runs synchronous audio processing off the event loop.
+    
+    Work is dispatched to a thread or process pool so the uvicorn event loop
+    stays responsive while audio is decoded and denoised. At most
+    ``max_workers + queue_depth`` tasks may be admitted at once; beyond that
+    new tasks are rejected with ServiceOverloadedError instead of queueing
+    without bound.
+    """
+    
+    def __init__(
+        self,
+        mode: str = "thread",
+        max_workers: int = 0,
+        queue_depth: int = 16,
+        task_timeout: Optional[float] = None
+    ):
+        """
+        Initialize worker pool.
+        
+        Args:
+            mode: "thread" or "process"
+            max_workers: Number of workers (0 = one per CPU core)
+            queue_depth: Maximum number of tasks waiting for a free worker
+            task_timeout: Per-task timeout in seconds (None = no timeout)
+        """
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unsupported audio worker mode: {mode}")
+        self.mode = mode
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.queue_depth = queue_depth
+        self.task_timeout = task_timeout
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timed_out = 0
+    
+    def _get_executor(self) -> Executor:
+        """Get or create the underlying executor."""
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="audio-worker"
+                )
+            logger.info(f"Audio worker pool created: mode={self.mode}, workers={self.max_workers}, queue_depth={self.queue_depth}")
+        return self._executor
+    
+    async def start(self):
+        """
+        Create the executor and pre-warm every worker.
+        
+        Each worker is spawned up front, along with its idle ffmpeg decoder
+        processes, so the first request does not pay for process start-up.
+        The heavy audio libraries are only imported here when
+        AUDIO_PRELOAD_LIBRARIES is set; otherwise they load on first use,
+        keeping startup fast for pods that never process audio.
+        """
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+        try:
+            pids = await asyncio.gather(*[
+                loop.run_in_executor(executor, _warm_worker, settings.AUDIO_PRELOAD_LIBRARIES)
+                for _ in range(self.max_workers)
+            ])
+            logger.info(f"Audio worker pool warmed up ({len(set(pids))} process(es))")
+        except Exception as e:
+            logger.warning(f"Audio worker pool warm-up failed: {e}")
+    
+    def _on_task_done(self, future):
+        """Release the admission slot once the worker has actually finished."""
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+    
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a synchronous function on the pool.
+        
+        In process mode the function and its arguments must be picklable.
+        
+        Args:
+            fn: Function to run
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+            
+        Returns:
+            The function's return value
+            
+        Raises:
+            ServiceOverloadedError: If the pool and its queue are full
+            asyncio.TimeoutError: If the task exceeds the per-task timeout
+        """
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.queue_depth:
+                self._rejected += 1
+                raise ServiceOverloadedError("Audio processing queue is full. Please try again later.")
+            self._in_flight += 1
+        
+        task = functools.partial(fn, *args, **kwargs)
+        if self.mode == "process":
+            task = functools.partial(_call_capturing_metrics, task)
+        try:
+            future = self._get_executor().submit(task)
+        except Exception:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        # A timed-out task keeps its slot until the worker actually finishes it
+        future.add_done_callback(self._on_task_done)
+        
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.task_timeout)
+        except asyncio.TimeoutError:
+            self._timed_out += 1
+            logger.error(f"Audio processing task timed out after {self.task_timeout}s")
+            raise
+        
+        if self.mode == "process":
+            result, events = result
+            metrics.replay(events)
+        return result
+    
+    def stats(self) -> dict:
+        """
+        Get pool statistics.
+        
+        Returns:
+            Dictionary with pool configuration and counters
+        """
+        return {
+            "mode": self.mode,
+            "workers": self.max_workers,
+            "queue_depth": self.queue_depth,
+            "in_flight": self._in_flight,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "timed_out": self._timed_out
+        }
+    
+    def shutdown(self):
+        """
+        Shut down the executor, cancelling tasks that have not started.
+        
+        Process workers terminate their idle ffmpeg decoders as they exit.
+        Thread workers use this process's own decoder pool, which is shut
+        down separately.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            logger.debug("Audio worker pool shut down")
+
+
+# Global audio worker pool instance
+audio_worker_pool = AudioWorkerPool(
+    mode=settings.AUDIO_WORKER_MODE,
+    max_workers=settings.AUDIO_WORKERS,
+    queue_depth=settings.AUDIO_WORKER_QUEUE_DEPTH,
+    task_timeout=settings.AUDIO_TASK_TIMEOUT_SEC or None
+)
+metrics.register_collector("audio_worker_pool", audio_worker_pool.stats)
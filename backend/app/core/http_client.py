@@ -0,0 +1,175 @@
+"""Shared HTTP client for model server calls."""
+import logging
+import importlib.util
+from collections import Counter
+from typing import Optional
+import httpx
+from app.config import settings
+from app.core.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+class ModelServerHTTPClient:
+    """
+    Lazily created httpx.AsyncClient shared by every model server caller.
+    
+    One connection pool serves the TTS and ASR services, the backend
+    client's health probes and hedged requests, so pool size, keepalive
+    and timeouts are tuned in one place. With HTTP/2 (negotiated via ALPN
+    on https replicas, or spoken directly to http:// replicas with prior
+    knowledge) concurrent requests share a connection instead of each
+    large upload holding one; without the optional h2 package the client
+    falls back to HTTP/1.1.
+    
+    Every connection the pool opens is counted through httpcore's trace
+    hook, so connection churn can be compared with the request count.
+    """
+    
+    def __init__(
+        self,
+        http2: bool = True,
+        http2_prior_knowledge: bool = False,
+        max_connections: int = 32,
+        max_keepalive_connections: int = 16,
+        keepalive_expiry: float = 30.0,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 300.0,
+        write_timeout: float = 60.0,
+        pool_timeout: float = 10.0
+    ):
+        """
+        Initialize client factory.
+        
+        Args:
+            http2: Whether to offer HTTP/2 via ALPN on https replicas (needs the h2 package)
+            http2_prior_knowledge: Speak HTTP/2 without negotiation (h2c),
+                also to http:// replicas; the model server must accept it
+            max_connections: Maximum open connections
+            max_keepalive_connections: Maximum idle connections kept open
+            keepalive_expiry: Seconds an idle connection is kept open
+            connect_timeout: Seconds to establish a connection
+            read_timeout: Seconds to wait for response data (synthesis and transcription time)
+            write_timeout: Seconds to send a chunk of the request body
+            pool_timeout: Seconds to wait for a free connection from the pool
+        """
+        self.http2 = http2 or http2_prior_knowledge
+        self.http2_prior_knowledge = http2_prior_knowledge
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.timeout = httpx.Timeout(
+            connect=connect_timeout,
+            read=read_timeout,
+            write=write_timeout,
+            pool=pool_timeout
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+        self._requests = 0
+        self._connections_opened = 0
+        self._connect_failures = 0
+        self._http_versions: Counter = Counter()
+    
+    def get(self) -> httpx.AsyncClient:
+        """Get or create the shared client."""
+        if self._client is None or self._client.is_closed:
+            if self.http2 and importlib.util.find_spec("h2") is None:
+                logger.warning("HTTP/2 enabled for the model server but the h2 package is not installed; using HTTP/1.1")
+                self.http2 = self.http2_prior_knowledge = False
+            self._client = httpx.AsyncClient(
+                http1=not self.http2_prior_knowledge,
+                http2=self.http2,
+                limits=self.limits,
+                timeout=self.timeout,
+                event_hooks={"request": [self._on_request], "response": [self._on_response]}
+            )
+            logger.info(f"Model server HTTP client created: http2={self.http2}, prior_knowledge={self.http2_prior_knowledge}, max_connections={self.limits.max_connections}")
+        return self._client
+    
+    async def _on_request(self, request: httpx.Request):
+        """Count the request and attach the connection trace hook."""
+        self._requests += 1
+        request.extensions["trace"] = self._trace
+    
+    async def _on_response(self, response: httpx.Response):
+        """Count the negotiated HTTP version."""
+        self._http_versions[response.http_version] += 1
+    
+    async def _trace(self, event_name: str, info: dict):
+        """Count new connections reported by httpcore."""
+        if event_name == "connection.connect_tcp.complete":
+            self._connections_opened += 1
+            metrics.increment("http_pool.connections_opened")
+        elif event_name == "connection.connect_tcp.failed":
+            self._connect_failures += 1
+    
+    def _pool_connections(self) -> list:
+        """Connections currently held by the pool (empty for custom transports)."""
+        if self._client is None:
+            return []
+        pool = getattr(self._client._transport, "_pool", None)
+        return list(getattr(pool, "connections", []))
+    
+    def stats(self) -> dict:
+        """
+        Get connection pool statistics.
+        
+        Returns:
+            Dictionary with pool settings, open/active/idle connections,
+            utilization, opened connections (churn) and requests per connection
+        """
+        connections = self._pool_connections()
+        active = sum(1 for connection in connections if not connection.is_idle())
+        max_connections = self.limits.max_connections
+        utilization = round(active / max_connections, 4) if max_connections else 0.0
+        return {
+            "http2": self.http2,
+            "http2_prior_knowledge": self.http2_prior_knowledge,
+            "max_connections": max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry_sec": self.limits.keepalive_expiry,
+            "open_connections": len(connections),
+            "active_connections": active,
+            "idle_connections": len(connections) - active,
+            "utilization": utilization,
+            "requests": self._requests,
+            "connections_opened": self._connections_opened,
+            "connect_failures": self._connect_failures,
+            "requests_per_connection": round(self._requests / self._connections_opened, 2) if self._connections_opened else None,
+            "http_versions": dict(self._http_versions),
+        }
+    
+    async def close(self):
+        """Close the shared client and its connections."""
+        if self._client is not None:
+            try:
+                await self._client.aclose()
+                logger.debug("Model server HTTP client closed")
+            except Exception as e:
+                logger.warning(f"Error closing model server HTTP client: {e}")
+            finally:
+                self._client = None
+
+
+# Global HTTP client factory shared by the TTS and ASR services. ALPN only
+# happens over TLS, so HTTP/2 is offered only when a replica uses https.
+model_http_client = ModelServerHTTPClient(
+    http2=settings.MODEL_HTTP2_ENABLED and any(url.startswith("https://") for url in settings.MODEL_REPLICA_URLS),
+    http2_prior_knowledge=settings.MODEL_HTTP2_PRIOR_KNOWLEDGE,
+    max_connections=settings.MODEL_HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.MODEL_HTTP_MAX_KEEPALIVE,
+    keepalive_expiry=settings.MODEL_HTTP_KEEPALIVE_EXPIRY_SEC,
+    connect_timeout=settings.MODEL_HTTP_CONNECT_TIMEOUT_SEC,
+    read_timeout=settings.MODEL_HTTP_READ_TIMEOUT_SEC,
+    write_timeout=settings.MODEL_HTTP_WRITE_TIMEOUT_SEC,
+    pool_timeout=settings.MODEL_HTTP_POOL_TIMEOUT_SEC
+)
+metrics.register_collector("http_pool", model_http_client.stats)
+
+
+async def cleanup_model_http_client():
+    """Cleanup function for the shared HTTP client - call during application shutdown."""
+    await model_http_client.close()
@@ -0,0 +1,130 @@
+"""In-process metrics registry."""
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class MetricsRegistry:
+    """
+    Minimal thread-safe registry of counters, gauges and summaries.
+    
+    Components with their own statistics (caches, pools) register a
+    collector callable whose result is included in every snapshot.
+    """
+    
+    def __init__(self):
+        """Initialize registry."""
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._summaries: Dict[str, dict] = {}
+        self._collectors: Dict[str, Callable[[], dict]] = {}
+        self._captured: Optional[List[Tuple[str, str, float]]] = None
+    
+    def increment(self, name: str, value: float = 1) -> None:
+        """
+        Increment a counter.
+        
+        Args:
+            name: Counter name
+            value: Amount to add
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+            if self._captured is not None:
+                self._captured.append(("increment", name, value))
+    
+    def set_gauge(self, name: str, value: float) -> None:
+        """
+        Set a gauge to the given value.
+        
+        Args:
+            name: Gauge name
+            value: Current value
+        """
+        with self._lock:
+            self._gauges[name] = value
+            if self._captured is not None:
+                self._captured.append(("set_gauge", name, value))
+    
+    def observe(self, name: str, value: float) -> None:
+        """
+        Record an observation in a summary (count, sum, min, max, last).
+        
+        Args:
+            name: Summary name
+            value: Observed value
+        """
+        with self._lock:
+            if self._captured is not None:
+                self._captured.append(("observe", name, value))
+            summary = self._summaries.get(name)
+            if summary is None:
+                self._summaries[name] = {"count": 1, "sum": value, "min": value, "max": value, "last": value}
+                return
+            summary["count"] += 1
+            summary["sum"] += value
+            summary["min"] = min(summary["min"], value)
+            summary["max"] = max(summary["max"], value)
+            summary["last"] = value
+    
+    def begin_capture(self) -> None:
+        """Start recording metric events so they can be replayed elsewhere."""
+        with self._lock:
+            self._captured = []
+    
+    def end_capture(self) -> List[Tuple[str, str, float]]:
+        """
+        Stop recording metric events.
+        
+        Returns:
+            Events recorded since begin_capture()
+        """
+        with self._lock:
+            events, self._captured = self._captured or [], None
+            return events
+    
+    def replay(self, events: List[Tuple[str, str, float]]) -> None:
+        """
+        Apply metric events recorded by another registry (e.g. a worker process).
+        
+        Args:
+            events: Events returned by end_capture()
+        """
+        for kind, name, value in events:
+            getattr(self, kind)(name, value)
+    
+    def register_collector(self, name: str, collector: Callable[[], dict]) -> None:
+        """
+        Register a callable that reports component statistics.
+        
+        Args:
+            name: Section name in the snapshot
+            collector: Callable returning a dictionary of statistics
+        """
+        with self._lock:
+            self._collectors[name] = collector
+    
+    def snapshot(self) -> dict:
+        """
+        Get a point-in-time copy of all metrics.
+        
+        Returns:
+            Dictionary with counters, gauges, summaries and collector sections
+        """
+        with self._lock:
+            result = {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "summaries": {
+                    name: {**summary, "avg": summary["sum"] / summary["count"]}
+                    for name, summary in self._summaries.items()
+                },
+            }
+            collectors = dict(self._collectors)
+        for name, collector in collectors.items():
+            result[name] = collector()
+        return result
+
+
+# Global metrics registry
+metrics = MetricsRegistry()
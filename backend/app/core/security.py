@@ -1,5 +1,7 @@
 """Security middleware and utilities."""
-from fastapi import Request, HTTPException, status
+import secrets
+from typing import Optional
+from fastapi import Header, Request, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
@@ -35,3 +37,22 @@ def get_rate_limiter():
     """Get rate limiter instance."""
     return limiter
 
+
+
+async def require_admin_key(x_admin_key: Optional[str] = Header(None)):
+    """
+    Dependency that guards admin endpoints with the X-Admin-Key header.
+    
+    Raises:
+        HTTPException: 403 if admin endpoints are disabled or the key is wrong
+    """
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin API is disabled"
+        )
+    if x_admin_key is None or not secrets.compare_digest(x_admin_key, settings.ADMIN_API_KEY):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid admin key"
+        )
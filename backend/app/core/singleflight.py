@@ -0,0 +1,102 @@
+"""Coalescing of identical concurrent requests (single-flight)."""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+from app.core.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Share one in-flight call between concurrent callers with the same key.
+    
+    The first caller for a key (the leader) starts the call as a task;
+    callers arriving while it runs await the same task instead of starting
+    their own. The entry is dropped as soon as the task finishes, so later
+    callers start a fresh call. Each caller awaits the task through
+    asyncio.shield, so one caller being cancelled (e.g. a disconnected
+    client) does not cancel the call for the others. Once the last waiting
+    caller is cancelled the call itself is cancelled, so abandoned backend
+    work does not keep running.
+    """
+    
+    def __init__(self, name: str):
+        """
+        Initialize single-flight group.
+        
+        Args:
+            name: Group name used in metrics
+        """
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        # Callers currently awaiting each in-flight task
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self._leaders = 0
+        self._coalesced = 0
+        self._abandoned = 0
+    
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn, or join an identical call that is already in flight.
+        
+        Args:
+            key: Identity of the call; equal keys must produce equal results
+            fn: Coroutine function performing the call
+        
+        Returns:
+            The call's result (shared by all callers with the same key)
+        """
+        task = self._calls.get(key)
+        # Tasks left behind by a loop that has since closed cannot be awaited
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            self._coalesced += 1
+            metrics.increment(f"singleflight.{self.name}.saved_calls")
+            logger.debug(f"Joined in-flight {self.name} call")
+            return await self._wait(task)
+        
+        task = asyncio.ensure_future(fn())
+        self._calls[key] = task
+        self._leaders += 1
+        metrics.increment(f"singleflight.{self.name}.calls")
+        task.add_done_callback(lambda _: self._forget(key, task))
+        return await self._wait(task)
+    
+    async def _wait(self, task: asyncio.Task) -> Any:
+        """Await a shared task, cancelling it if the last waiting caller is cancelled."""
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        cancelled = False
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                if cancelled and not task.done():
+                    self._abandoned += 1
+                    metrics.increment(f"singleflight.{self.name}.abandoned")
+                    task.cancel()
+    
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        """Remove a finished call, unless the key already belongs to a newer one."""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+    
+    def stats(self) -> dict:
+        """
+        Get single-flight statistics.
+        
+        Returns:
+            Dictionary with in-flight, backend call, saved call and
+            abandoned (cancelled without waiters) call counts
+        """
+        return {
+            "in_flight": len(self._calls),
+            "calls": self._leaders,
+            "saved_calls": self._coalesced,
+            "abandoned_calls": self._abandoned,
+        }
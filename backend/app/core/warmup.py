@@ -0,0 +1,158 @@
+"""Startup warm-up and readiness tracking."""
+import time
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import numpy as np
+from app.config import settings
+from app.core.executor import audio_worker_pool
+
+
+logger = logging.getLogger(__name__)
+
+
+def _synthetic_clip(sample_rate: int = 44100, duration_sec: float = 3.0) -> np.ndarray:
+    """
+    Generate a speech-like test clip: voiced tones with a pause and background noise.
+    
+    Args:
+        sample_rate: Sample rate of the clip
+        duration_sec: Clip length in seconds
+    
+    Returns:
+        Mono float32 samples
+    """
+    rng = np.random.default_rng(0)
+    t = np.arange(int(sample_rate * duration_sec)) / sample_rate
+    voiced = 0.3 * np.sin(2 * np.pi * 220 * t) * (1 + 0.5 * np.sin(2 * np.pi * 3 * t))
+    # Silence in the middle so the VAD and pause detection have work to do
+    voiced[(t > duration_sec * 0.4) & (t < duration_sec * 0.7)] = 0.0
+    noise = 0.01 * rng.standard_normal(len(t))
+    return (voiced + noise).astype(np.float32)
+
+
+def warm_audio_pipeline() -> bool:
+    """
+    Run a synthetic clip through the full ASR audio pipeline.
+    
+    Triggers the lazy library imports and numba JIT compilation inside
+    librosa/noisereduce. Module-level so it can run in worker processes.
+    
+    Returns:
+        True if the clip was processed successfully
+    """
+    from app.services.audio_service import AudioService
+    from app.utils.audio_utils import encode_wav_pcm16, preload_audio_libraries, split_audio_for_asr
+    
+    preload_audio_libraries()
+    # 44.1 kHz input exercises decode, resampling, denoising, VAD and encoding
+    clip = encode_wav_pcm16(_synthetic_clip(), 44100)
+    is_valid, error_msg, processed = AudioService.validate_and_process_audio(clip, "warmup.wav", apply_noise_reduction=True)
+    if not is_valid or processed is None:
+        logger.warning(f"Audio pipeline warm-up failed: {error_msg}")
+        return False
+    split_audio_for_asr(processed, 1.0, settings.ASR_SEGMENT_MIN_PAUSE_MS)
+    return True
+
+
+async def _warm_audio_workers() -> Dict[str, Any]:
+    """Warm the audio pipeline on every worker of the audio pool."""
+    # Each process has its own JIT and import state; threads share one
+    runs = audio_worker_pool.max_workers if audio_worker_pool.mode == "process" else 1
+    results = await asyncio.gather(*[audio_worker_pool.run(warm_audio_pipeline) for _ in range(runs)])
+    if not all(results):
+        raise RuntimeError("audio pipeline warm-up did not complete")
+    return {"runs": runs}
+
+
+async def _warm_backend_connections() -> Dict[str, Any]:
+    """Create the model server clients and open their connections."""
+    from app.services.asr_service import asr_service
+    from app.services.tts_service import tts_service
+    
+    # Health checks create the lazy httpx clients and establish pooled connections
+    asr_available, tts_available = await asyncio.gather(
+        asr_service.is_available(),
+        tts_service.is_available()
+    )
+    return {"asr_available": asr_available, "tts_available": tts_available}
+
+
+class WarmupState:
+    """Tracks the progress of the startup warm-up."""
+    
+    def __init__(self):
+        """Initialize warm-up state."""
+        self.status = "pending"
+        self.steps: Dict[str, Dict[str, Any]] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+    
+    @property
+    def ready(self) -> bool:
+        """Whether the worker may receive traffic."""
+        return self.status in ("ready", "disabled")
+    
+    def reset(self):
+        """Return to the pending state."""
+        self.__init__()
+    
+    def snapshot(self) -> dict:
+        """Return warm-up state for the readiness endpoint."""
+        duration = None
+        if self.started_at is not None:
+            duration = (self.finished_at or time.time()) - self.started_at
+        return {
+            "status": self.status,
+            "duration_sec": round(duration, 3) if duration is not None else None,
+            "steps": self.steps,
+        }
+
+
+# Global warm-up state
+warmup_state = WarmupState()
+
+# Warm-up steps, run in order: (name, coroutine function returning details)
+WARMUP_STEPS: List[Tuple[str, Callable[[], Awaitable[Dict[str, Any]]]]] = [
+    ("audio_pipeline", _warm_audio_workers),
+    ("backend_connections", _warm_backend_connections),
+]
+
+
+async def run_warmup(state: WarmupState = warmup_state) -> WarmupState:
+    """
+    Run all warm-up steps and mark the worker ready.
+    
+    A failing or timed-out step is recorded and logged but does not block
+    readiness: a missing optional dependency or an unreachable model server
+    must not keep the worker out of rotation forever.
+    
+    Args:
+        state: State object to update
+    
+    Returns:
+        The updated state
+    """
+    if not settings.WARMUP_ENABLED:
+        state.status = "disabled"
+        return state
+    
+    state.status = "running"
+    state.started_at = time.time()
+    for name, step in WARMUP_STEPS:
+        step_start = time.perf_counter()
+        try:
+            details = await asyncio.wait_for(step(), timeout=settings.WARMUP_STEP_TIMEOUT_SEC)
+            state.steps[name] = {"ok": True, **details}
+        except asyncio.TimeoutError:
+            state.steps[name] = {"ok": False, "error": "timeout"}
+            logger.warning(f"Warm-up step {name} timed out after {settings.WARMUP_STEP_TIMEOUT_SEC}s")
+        except Exception as e:
+            state.steps[name] = {"ok": False, "error": str(e)}
+            logger.warning(f"Warm-up step {name} failed: {e}")
+        state.steps[name]["seconds"] = round(time.perf_counter() - step_start, 3)
+    
+    state.finished_at = time.time()
+    state.status = "ready"
+    logger.info(f"Warm-up finished in {state.finished_at - state.started_at:.2f}s")
+    return state
@@ -1,9 +1,11 @@
 """FastAPI application entry point."""
+import asyncio
 import logging
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.core.security import setup_cors, setup_rate_limiting
+from app.core.security import require_admin_key, setup_cors, setup_rate_limiting
 from app.core.exceptions import (
     validation_exception_handler,
     http_exception_handler,
@@ -12,9 +14,17 @@ from app.core.exceptions import (
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from app.api.v1.router import router as api_v1_router
-from app.models.schemas import HealthResponse
-from app.services.tts_service import tts_service, cleanup_tts_service
-from app.services.asr_service import asr_service, cleanup_asr_service
+from app.models.schemas import HealthResponse, ReadinessResponse
+from app.services.tts_service import tts_service
+from app.services.asr_service import asr_service
+from app.services.backend_client import model_backend
+from app.core.http_client import cleanup_model_http_client
+from app.core.executor import audio_worker_pool
+from app.utils.ffmpeg_decoder import ffmpeg_decoder_pool
+from app.core.metrics import metrics
+from app.core.warmup import run_warmup, warmup_state
+from app.services.demo_prerender import demo_prerenderer
+from app.services.health_prober import health_prober
 
 # Configure logging
 logging.basicConfig(
@@ -45,12 +55,32 @@ app.add_exception_handler(Exception, general_exception_handler)
 app.include_router(api_v1_router, prefix=settings.API_V1_PREFIX)
 
 
+@app.on_event("startup")
+async def startup_event():
+    """Initialize resources on application startup."""
+    await audio_worker_pool.start()
+    if health_prober.enabled:
+        # Probe the model server in the background; /health reads the cached state
+        app.state.health_task = asyncio.create_task(health_prober.run())
+    # Warm up in the background so /health and /ready answer while it runs
+    app.state.warmup_task = asyncio.create_task(run_warmup())
+    if demo_prerenderer.enabled:
+        # Fill the TTS cache with the demo catalog once the worker is warm
+        app.state.prerender_task = asyncio.create_task(demo_prerenderer.run(after=app.state.warmup_task))
+
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup resources on application shutdown."""
     logger.info("Shutting down application, cleaning up resources...")
-    await cleanup_tts_service()
-    await cleanup_asr_service()
+    for task_name in ("warmup_task", "prerender_task", "health_task"):
+        task = getattr(app.state, task_name, None)
+        if task is not None and not task.done():
+            task.cancel()
+    await model_backend.close()
+    await cleanup_model_http_client()
+    audio_worker_pool.shutdown()
+    ffmpeg_decoder_pool.shutdown()
     logger.info("Shutdown complete")
 
 # Root endpoint
@@ -69,12 +99,21 @@ async def health_check():
     """
     Health check endpoint.
     
+    Answers from the background health prober's last round; ASR and TTS
+    are served by the same model server replicas. Without a recent round
+    (prober disabled or still starting) the model server is checked live.
+    
     Returns:
         Health status of the API and connected services
     """
-    # Check model availability (non-blocking, quick check)
-    asr_available = await asr_service.is_available()
-    tts_available = await tts_service.is_available()
+    model_available = health_prober.cached_health()
+    if model_available is not None:
+        asr_available = tts_available = model_available
+    else:
+        asr_available, tts_available = await asyncio.gather(
+            asr_service.is_available(),
+            tts_service.is_available()
+        )
     
     return HealthResponse(
         status="healthy" if (asr_available or tts_available) else "degraded",
@@ -83,6 +122,34 @@ async def health_check():
         tts_model_available=tts_available
     )
 
+# Readiness endpoint
+@app.get("/ready", response_model=ReadinessResponse)
+async def readiness_check():
+    """
+    Readiness endpoint.
+    
+    Reports ready only after the startup warm-up has finished, so load
+    balancers do not route traffic to a cold worker.
+    
+    Returns:
+        Warm-up status (HTTP 503 while warming up)
+    """
+    readiness = ReadinessResponse(ready=warmup_state.ready, **warmup_state.snapshot())
+    if not readiness.ready:
+        return JSONResponse(status_code=503, content=readiness.model_dump())
+    return readiness
+
+# Metrics endpoint (exposes replica URLs and traffic details, so admin only)
+@app.get("/metrics", dependencies=[Depends(require_admin_key)])
+async def get_metrics():
+    """
+    Metrics endpoint. Requires the X-Admin-Key header.
+    
+    Returns:
+        Snapshot of in-process counters, gauges, summaries and component statistics
+    """
+    return metrics.snapshot()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -1,6 +1,6 @@
 """Pydantic schemas for request/response validation."""
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 
 
 class TTSRequest(BaseModel):
@@ -11,6 +11,17 @@ class TTSRequest(BaseModel):
     cloneing: Optional[bool] = Field(default=False, description="Enable voice cloning")
     ref_speker_base64: Optional[str] = Field(default=None, description="Base64 encoded reference audio for cloning")
     ref_speker_name: Optional[str] = Field(default=None, description="Name for the cloned voice")
+    ref_id: Optional[str] = Field(default=None, description="Registered reference speaker id (replaces ref_speker_base64)")
+    format: Optional[str] = Field(default=None, pattern="^(wav|flac|mp3|opus)$", description="Output format: wav, flac, mp3 or opus (default: from the Accept header, else wav)")
+    sample_rate: Optional[int] = Field(default=None, description="Output sample rate in Hz (default: the synthesized rate)")
+
+
+class ReferenceSpeakerResponse(BaseModel):
+    """Response schema for a registered reference speaker."""
+    ref_id: str = Field(..., description="Id to pass as ref_id in TTS requests")
+    duration_sec: float = Field(..., description="Duration of the stored clip in seconds")
+    sample_rate: int = Field(..., description="Sample rate of the stored clip")
+    deduplicated: bool = Field(..., description="Whether the clip was already registered")
 
 
 class ASRResponse(BaseModel):
@@ -53,6 +64,33 @@ class HealthResponse(BaseModel):
     tts_model_available: bool
 
 
+class ReadinessResponse(BaseModel):
+    """Readiness check response schema."""
+    ready: bool
+    status: str
+    duration_sec: Optional[float] = None
+    steps: Dict[str, Dict[str, Any]] = {}
+
+
+class DemoPrerenderStatusResponse(BaseModel):
+    """Coverage and staleness of the pre-rendered demo catalog."""
+    status: str
+    entries: int = Field(..., description="Example text x voice combinations in the catalog")
+    cached: int = Field(..., description="Combinations currently in the TTS cache")
+    coverage: float = Field(..., description="Fraction of the catalog served from the cache")
+    stale: int = Field(..., description="Combinations missing or due for refresh")
+    oldest_age_sec: Optional[float] = None
+    refresh_interval_sec: float
+    next_run_at: Optional[float] = None
+    last_run: Optional[Dict[str, float]] = None
+
+
+class CachePurgeResponse(BaseModel):
+    """Response schema for purging a cache."""
+    cache: str
+    purged: int
+
+
 class ContactFormRequest(BaseModel):
     """Request schema for Contact Form."""
     first: str = Field(..., min_length=1, description="First name")
@@ -1,9 +1,20 @@
 """Automatic Speech Recognition service."""
+import asyncio
+import hashlib
 import logging
 import base64
 import httpx
-from typing import Optional
+from typing import List, Optional
 from app.config import settings
+from app.core.executor import audio_worker_pool
+from app.core.exceptions import BackendUnavailableError, ServiceOverloadedError
+from app.core.http_client import model_http_client
+from app.core.metrics import metrics
+from app.core.singleflight import SingleFlight
+from app.services.backend_client import model_backend
+from app.utils.audio_codec import encode_transport_audio
+from app.utils.audio_utils import AudioTooLongError, split_audio_for_asr
+from app.utils.transport_frames import FRAME_CONTENT_TYPE, encode_frame
 
 
 logger = logging.getLogger(__name__)
@@ -15,18 +26,17 @@ class ASRService:
     def __init__(self):
         """Initialize ASR service."""
         self.model_url = settings.MODEL_BASE_URL
-        self.timeout = 300.0  # 300 seconds timeout for longer audio files
-        # Create a persistent async client for connection pooling
-        self._client: Optional[httpx.AsyncClient] = None
+        # Replica routing state and the connection pool are shared with the
+        # other model server clients
+        self.backend = model_backend
+        self.http = model_http_client
+        self.audio_codec = settings.BACKEND_AUDIO_CODEC
+        self.transport = settings.BACKEND_TRANSPORT
+        self._inflight: Optional[SingleFlight] = SingleFlight("asr") if settings.SINGLE_FLIGHT_ENABLED else None
     
     async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create async HTTP client with connection pooling."""
-        if self._client is None:
-            self._client = httpx.AsyncClient(
-                timeout=self.timeout,
-                limits=httpx.Limits(max_keepalive_connections=10, max_connections=20)
-            )
-        return self._client
+        """Get the shared model server HTTP client."""
+        return self.http.get()
     
     async def transcribe(
         self,
@@ -36,36 +46,167 @@ class ASRService:
         """
         Transcribe audio to text using LitServe server.
         
+        Audio longer than ASR_SEGMENT_MAX_SEC is split at pauses and the
+        segments are transcribed concurrently (long-form mode). Concurrent
+        requests for the same audio and language share one transcription.
+        
+        Args:
+            audio_content: Audio file content as bytes
+            language: Language code
+            
+        Returns:
+            Transcribed text, or None if transcription fails
+            
+        Raises:
+            ServiceOverloadedError: If the model server call is shed by admission control
+        """
+        if self._inflight is None:
+            return await self._transcribe(audio_content, language)
+        
+        digest = await asyncio.to_thread(lambda: hashlib.blake2b(audio_content, digest_size=32).hexdigest())
+        return await self._inflight.do(
+            (digest, language or ""),
+            lambda: self._transcribe(audio_content, language)
+        )
+    
+    async def _transcribe(
+        self,
+        audio_content: bytes,
+        language: str = None
+    ) -> Optional[str]:
+        """
+        Transcribe audio, splitting long audio into concurrently transcribed segments.
+        
+        Args:
+            audio_content: Audio file content as bytes
+            language: Language code
+            
+        Returns:
+            Transcribed text, or None if transcription fails
+        """
+        if settings.ASR_LONG_FORM_ENABLED:
+            try:
+                segments = await audio_worker_pool.run(
+                    split_audio_for_asr,
+                    audio_content,
+                    settings.ASR_SEGMENT_MAX_SEC,
+                    settings.ASR_SEGMENT_MIN_PAUSE_MS
+                )
+            except AudioTooLongError as e:
+                logger.error(f"ASR audio rejected: {e}")
+                return None
+            except Exception as e:
+                logger.warning(f"Could not split audio for long-form ASR, sending as one request: {e}")
+                segments = [audio_content]
+            if len(segments) > 1:
+                return await self._transcribe_segments(segments, language)
+        
+        return await self._transcribe_single(audio_content, language)
+    
+    async def _transcribe_segments(self, segments: List[bytes], language: str = None) -> Optional[str]:
+        """
+        Transcribe audio segments concurrently and join the texts in order.
+        
+        Args:
+            segments: WAV segments in playback order
+            language: Language code
+            
+        Returns:
+            Joined transcription of the non-empty segments, or None if any
+            segment request fails or every segment is empty
+        """
+        semaphore = asyncio.Semaphore(max(1, settings.ASR_FANOUT_LIMIT))
+        
+        async def transcribe_segment(segment: bytes) -> Optional[str]:
+            async with semaphore:
+                return await self._transcribe_single(segment, language, allow_empty=True)
+        
+        logger.info(f"Long-form ASR: {len(segments)} segments, fan-out limit {settings.ASR_FANOUT_LIMIT}")
+        metrics.increment("asr.long_form.requests")
+        metrics.increment("asr.long_form.segments", len(segments))
+        texts = await asyncio.gather(*(transcribe_segment(segment) for segment in segments))
+        
+        if any(text is None for text in texts):
+            logger.error(f"Long-form ASR failed for {sum(text is None for text in texts)} of {len(segments)} segments")
+            return None
+        # Silent or noise-only segments come back empty and are skipped
+        transcription = " ".join(text.strip() for text in texts if text.strip())
+        if not transcription:
+            logger.warning("Long-form ASR returned no speech in any segment")
+            return None
+        return transcription
+    
+    async def _transcribe_single(
+        self,
+        audio_content: bytes,
+        language: str = None,
+        transport: Optional[str] = None,
+        codec: Optional[str] = None,
+        allow_empty: bool = False
+    ) -> Optional[str]:
+        """
+        Transcribe one piece of audio with a single LitServe request.
+        
         Args:
             audio_content: Audio file content as bytes
             language: Language code
+            transport: Transport for this call ("json" or "binary"); defaults
+                to the configured transport
+            codec: Audio codec for this call; defaults to the configured codec
+            allow_empty: Return "" for an empty transcription instead of None,
+                so callers can tell silence from a failed request
             
         Returns:
             Transcribed text, or None if transcription fails
         """
         try:
-            # Convert audio bytes to base64
-            audio_base64 = base64.b64encode(audio_content).decode('utf-8')
+            # Compress audio for transport
+            codec = codec or self.audio_codec
+            transport_audio = audio_content
+            if codec != "wav":
+                transport_audio, codec = await asyncio.to_thread(encode_transport_audio, audio_content, codec)
             
             # Prepare LitServe request payload
             payload = {
-                "endpoint": "asr",
-                "audio_base64": audio_base64
+                "endpoint": "asr"
             }
+            if codec != "wav":
+                payload["audio_codec"] = codec
             
             # Add language if provided
             if language:
                 payload["language"] = language
             
-            logger.info(f"Sending ASR request: language={language}, audio_size={len(audio_content)} bytes")
+            transport = transport or self.transport
+            metrics.increment("asr.transport.audio_bytes", len(audio_content))
+            metrics.increment("asr.transport.sent_bytes", len(transport_audio))
+            logger.info(f"Sending ASR request: language={language}, audio_size={len(audio_content)} bytes, codec={codec}, transport={transport}, sent={len(transport_audio)} bytes")
             
-            # Make request to LitServe server
+            # Make request to LitServe server: raw audio in a binary frame, or base64 in JSON
             client = await self._get_client()
-            response = await client.post(
-                f"{self.model_url}/predict",
-                json=payload,
-                headers={"Content-Type": "application/json"}
-            )
+            if transport == "binary":
+                response = await self.backend.post(
+                    client,
+                    "/predict",
+                    operation="asr",
+                    content=encode_frame(payload, transport_audio),
+                    headers={"Content-Type": FRAME_CONTENT_TYPE}
+                )
+                if response.status_code == 415:
+                    # Replica does not accept binary frames (other replicas
+                    # may): resend this call as base64 JSON
+                    logger.warning("LitServe rejected binary transport (status 415), retrying as base64 JSON")
+                    metrics.increment("asr.transport.binary_fallbacks")
+                    return await self._transcribe_single(audio_content, language=language, transport="json", codec=codec, allow_empty=allow_empty)
+            else:
+                payload["audio_base64"] = base64.b64encode(transport_audio).decode('utf-8')
+                response = await self.backend.post(
+                    client,
+                    "/predict",
+                    operation="asr",
+                    json=payload,
+                    headers={"Content-Type": "application/json"}
+                )
             
             if response.status_code == 200:
                 # Parse LitServe response
@@ -77,18 +218,33 @@ class ASRService:
                     if transcription:
                         logger.info(f"ASR transcription successful: {len(transcription)} characters")
                         return transcription
+                    elif allow_empty:
+                        logger.info("LitServe returned an empty transcription")
+                        return ""
                     else:
                         logger.warning("LitServe response missing transcription")
                         return None
                 else:
                     error_msg = result.get("message", "Unknown error")
                     error_code = result.get("error", "UNKNOWN_ERROR")
+                    if error_code == "UNSUPPORTED_CODEC" and codec != "wav":
+                        # Replica does not understand the codec (other replicas
+                        # may): resend this call as WAV
+                        logger.warning(f"LitServe does not support audio codec {codec}, retrying as WAV")
+                        metrics.increment("asr.transport.codec_fallbacks")
+                        return await self._transcribe_single(audio_content, language=language, transport=transport, codec="wav", allow_empty=allow_empty)
                     logger.error(f"LitServe ASR failed: {error_code} - {error_msg}")
                     return None
             else:
                 logger.error(f"LitServe server returned status {response.status_code}: {response.text}")
                 return None
                     
+        except ServiceOverloadedError:
+            # Shed by admission control: the caller answers 429/503 with Retry-After
+            raise
+        except BackendUnavailableError as e:
+            logger.error(f"ASR request not sent: {e}")
+            return None
         except httpx.TimeoutException:
             logger.error("ASR model request timed out")
             return None
@@ -110,8 +266,12 @@ class ASRService:
             client = await self._get_client()
             # Call LitServe health endpoint
             payload = {"endpoint": "health"}
-            response = await client.post(
-                f"{self.model_url}/health",
+            response = await self.backend.post(
+                client,
+                "/health",
+                update_latency=False,
+                hedge=False,
+                admit=False,
                 json=payload,
                 headers={"Content-Type": "application/json"},
                 timeout=5.0
@@ -125,29 +285,10 @@ class ASRService:
         except Exception as e:
             logger.debug(f"LitServe health check failed: {e}")
             return False
-    
-    async def close(self):
-        """
-        Close the HTTP client and clean up resources.
-        
-        Should be called when the service is no longer needed,
-        e.g., during application shutdown.
-        """
-        if self._client is not None:
-            try:
-                await self._client.aclose()
-                logger.debug("ASR service HTTP client closed")
-            except Exception as e:
-                logger.warning(f"Error closing ASR service HTTP client: {e}")
-            finally:
-                self._client = None
 
 
 # Global ASR service instance
 asr_service = ASRService()
-
-
-async def cleanup_asr_service():
-    """Cleanup function for ASR service - call during application shutdown."""
-    await asr_service.close()
+if asr_service._inflight is not None:
+    metrics.register_collector("asr_singleflight", asr_service._inflight.stats)
 
@@ -1,18 +1,55 @@
 """Audio processing service."""
+import asyncio
+import hashlib
 import logging
 from typing import Tuple, Optional
 from app.utils.audio_utils import (
+    ASR_SAMPLE_RATE,
+    AudioPipeline,
+    AudioTooLongError,
     validate_audio_file,
-    validate_audio_duration,
     prepare_audio_for_asr,
     apply_noise_suppression,
     convert_audio_to_wav
 )
 from app.config import settings
+from app.core.executor import audio_worker_pool
+from app.core.metrics import metrics
+from app.utils.cache import LRUCache
 
 
 logger = logging.getLogger(__name__)
 
+# Cache of processed 16 kHz WAV keyed by upload content hash + processing parameters
+processed_audio_cache = LRUCache(
+    max_bytes=settings.ASR_AUDIO_CACHE_MB * 1024 * 1024,
+    name="asr_audio"
+)
+metrics.register_collector("asr_audio_cache", processed_audio_cache.stats)
+
+
+def processed_audio_cache_key(audio_content: bytes, apply_noise_reduction: bool) -> str:
+    """
+    Build the content-addressed cache key for processed ASR audio.
+    
+    Args:
+        audio_content: Raw uploaded audio bytes
+        apply_noise_reduction: Whether noise reduction was requested
+        
+    Returns:
+        Hex digest identifying the upload and the processing parameters
+    """
+    params = (
+        f"ns={apply_noise_reduction and settings.NOISE_SUPPRESSION_ENABLED};"
+        f"stationary={settings.NOISE_SUPPRESSION_STATIONARY};"
+        f"streaming={settings.NOISE_SUPPRESSION_STREAMING and (settings.NOISE_SUPPRESSION_BLOCK_SEC, settings.NOISE_SUPPRESSION_OVERLAP_SEC, settings.NOISE_SUPPRESSION_CONTEXT_SEC)};"
+        f"vad={settings.VAD_ENABLED and (settings.VAD_THRESHOLD_DB, settings.VAD_MAX_SPECTRAL_FLATNESS, settings.VAD_MIN_SILENCE_MS, settings.VAD_PAD_MS)};"
+        f"sr={ASR_SAMPLE_RATE}"
+    )
+    digest = hashlib.blake2b(audio_content, digest_size=32)
+    digest.update(params.encode("utf-8"))
+    return digest.hexdigest()
+
 
 class AudioService:
     """Service for audio processing operations."""
@@ -39,18 +76,70 @@ class AudioService:
         if not is_valid:
             return False, error_msg, None
         
+        # Decode once and reuse the samples for every stage below
+        pipeline = AudioPipeline(audio_content, filename)
+        
         # Validate duration
-        is_valid, error_msg = validate_audio_duration(audio_content, filename)
+        is_valid, error_msg = pipeline.validate_duration()
         if not is_valid:
             return False, error_msg, None
         
         # Process audio if needed
         processed_audio = audio_content
         if apply_noise_reduction:
-            processed_audio = prepare_audio_for_asr(audio_content, filename)
+            try:
+                processed_audio = pipeline.process_for_asr()
+            except AudioTooLongError as e:
+                # Decoded audio is longer than its header claimed
+                return False, str(e), None
         
         return True, None, processed_audio
     
+    async def validate_and_process_audio_async(
+        self,
+        audio_content: bytes,
+        filename: str,
+        apply_noise_reduction: bool = True
+    ) -> Tuple[bool, Optional[str], Optional[bytes]]:
+        """
+        Validate and process audio file on the audio worker pool.
+        
+        Keeps decoding and noise suppression off the event loop. Results
+        are cached by content hash, so a repeated upload skips processing.
+        
+        Args:
+            audio_content: Audio file content as bytes
+            filename: Original filename
+            apply_noise_reduction: Whether to apply noise reduction
+            
+        Returns:
+            Tuple of (is_valid, error_message, processed_audio)
+            
+        Raises:
+            ServiceOverloadedError: If the worker pool queue is full
+            asyncio.TimeoutError: If processing exceeds the task timeout
+        """
+        cache_key = None
+        if settings.ASR_AUDIO_CACHE_ENABLED and apply_noise_reduction:
+            # hashlib releases the GIL, so large uploads are hashed off the loop
+            cache_key = await asyncio.to_thread(processed_audio_cache_key, audio_content, apply_noise_reduction)
+            cached_audio = processed_audio_cache.get(cache_key)
+            if cached_audio is not None:
+                logger.info(f"Processed audio cache hit: {len(cached_audio)} bytes")
+                return True, None, cached_audio
+        
+        is_valid, error_msg, processed_audio = await audio_worker_pool.run(
+            self.validate_and_process_audio,
+            audio_content,
+            filename,
+            apply_noise_reduction=apply_noise_reduction
+        )
+        
+        if cache_key is not None and is_valid and processed_audio is not None:
+            processed_audio_cache.set(cache_key, processed_audio)
+        
+        return is_valid, error_msg, processed_audio
+    
     @staticmethod
     def process_audio_for_tts(audio_content: bytes, filename: str) -> bytes:
         """
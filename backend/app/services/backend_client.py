@@ -0,0 +1,533 @@
+"""Load-balanced access to the LitServe model server replicas."""
+import time
+import random
+import asyncio
+import logging
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set
+import numpy as np
+import httpx
+from app.config import settings
+from app.core.concurrency import AdaptiveLimiter
+from app.core.exceptions import BackendUnavailableError
+from app.core.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+# Circuit breaker states
+CIRCUIT_CLOSED = "closed"        # in rotation
+CIRCUIT_OPEN = "open"            # failing fast, health probed in the background
+CIRCUIT_HALF_OPEN = "half_open"  # healthy again, one trial request decides
+
+# Responses that mean the replica itself is unavailable. Other 5xx are
+# application errors (e.g. undecodable audio) and do not trip the breaker.
+BREAKER_STATUS_CODES = (502, 503, 504)
+
+# Latency samples kept per operation for the hedge delay, and the minimum
+# number of samples before hedging starts
+HEDGE_WINDOW = 256
+HEDGE_MIN_SAMPLES = 20
+
+
+class Replica:
+    """Routing and circuit breaker state of one model server replica."""
+    
+    def __init__(self, url: str):
+        """
+        Initialize replica state.
+        
+        Args:
+            url: Base URL of the replica (same form as MODEL_BASE_URL)
+        """
+        self.url = url.rstrip("/")
+        self.in_flight = 0
+        self.ewma_latency = 0.0
+        self.consecutive_failures = 0
+        self.failed_probes = 0
+        self.state = CIRCUIT_CLOSED
+        self.trial_in_flight = False
+        self.ejections = 0
+        self.requests = 0
+        self.errors = 0
+    
+    @property
+    def cost(self) -> float:
+        """Expected wait for one more request: outstanding requests weighted by latency."""
+        # Floor so replicas without latency samples still spread by in-flight count
+        return (self.in_flight + 1) * max(self.ewma_latency, 0.001)
+    
+    @property
+    def routable(self) -> bool:
+        """Whether the replica may receive a request now."""
+        if self.state == CIRCUIT_HALF_OPEN:
+            return not self.trial_in_flight
+        return self.state == CIRCUIT_CLOSED
+    
+    def stats(self) -> dict:
+        """Return replica statistics for the metrics endpoint."""
+        return {
+            "in_flight": self.in_flight,
+            "ewma_latency_ms": round(self.ewma_latency * 1000, 1),
+            "circuit": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failed_probes": self.failed_probes,
+            "ejections": self.ejections,
+            "requests": self.requests,
+            "errors": self.errors,
+        }
+
+
+class BackendClient:
+    """
+    Routes model server calls to the least-loaded healthy replica.
+    
+    Each replica tracks its outstanding requests and an exponentially
+    weighted moving average (EWMA) of its latency; a call goes to the
+    replica with the lowest (in_flight + 1) * latency, with ties broken
+    at random.
+    
+    Each replica has a circuit breaker. Connection errors, timeouts and
+    502/503/504 responses count as failures (other 5xx are application
+    errors caused by the request and do not); after failure_threshold
+    consecutive failures the circuit opens and the replica gets no
+    traffic. Its /health endpoint is probed every eject_sec seconds; once
+    healthy, the circuit is half-open and the next request is a trial that
+    closes it again or reopens it. When every circuit is open, calls fail
+    fast with BackendUnavailableError instead of waiting for a timeout.
+    
+    With hedging enabled, a call that has not returned within the
+    hedge_percentile latency of recent calls of the same operation (e.g.
+    TTS or ASR, which share '/predict') is duplicated to another replica;
+    the first good response wins and the other request is cancelled. At
+    most hedge_max_ratio of calls are hedged, so a slow fleet is not
+    flooded with duplicates.
+    
+    A background health prober can feed report_health: failing probes open
+    a circuit without waiting for requests to fail, and open circuits wait
+    for the prober to see the replica healthy instead of probing it
+    themselves.
+    
+    With a limiter, every call first takes a slot from it (admission
+    control) and holds it until the call, including any hedge, is done;
+    the call's latency and outcome adapt the limit.
+    
+    The HTTP client is passed in by the caller, so services keep their own
+    timeouts and connection pools while sharing routing state.
+    """
+    
+    def __init__(
+        self,
+        urls: List[str],
+        ewma_alpha: float = 0.3,
+        failure_threshold: int = 3,
+        eject_sec: float = 10.0,
+        hedge_enabled: bool = False,
+        hedge_percentile: float = 95.0,
+        hedge_min_delay_sec: float = 0.05,
+        hedge_max_ratio: float = 0.1,
+        limiter: Optional[AdaptiveLimiter] = None
+    ):
+        """
+        Initialize backend client.
+        
+        Args:
+            urls: Base URLs of the replicas
+            ewma_alpha: Weight of the newest latency sample in the EWMA
+            failure_threshold: Consecutive failures before a circuit opens
+            eject_sec: Seconds between health probes of a replica with an open circuit
+            hedge_enabled: Whether slow calls are duplicated to another replica
+            hedge_percentile: Latency percentile after which a call is hedged
+            hedge_min_delay_sec: Lower bound for the hedge delay
+            hedge_max_ratio: Maximum fraction of calls that may be hedged
+            limiter: Concurrency limiter shared by all calls (None = unlimited)
+        """
+        if not urls:
+            raise ValueError("At least one model server replica URL is required")
+        self.replicas = [Replica(url) for url in urls]
+        self.ewma_alpha = ewma_alpha
+        self.failure_threshold = max(1, failure_threshold)
+        self.eject_sec = eject_sec
+        self.hedge_enabled = hedge_enabled
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay_sec = hedge_min_delay_sec
+        self.hedge_max_ratio = hedge_max_ratio
+        self.limiter = limiter
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._calls = 0
+        self._hedges = 0
+        self._hedge_wins = 0
+        self._fast_failures = 0
+        self._probe_tasks: Set[asyncio.Task] = set()
+        # Set while a background health prober feeds report_health
+        self.health_checked = False
+    
+    def pick(self, exclude: Optional[Set[Replica]] = None) -> Optional[Replica]:
+        """
+        Choose the replica for the next call.
+        
+        Args:
+            exclude: Replicas not to choose (e.g. already tried for this call)
+        
+        Returns:
+            The least-loaded routable replica, or None if every circuit is
+            open (or every routable replica is excluded)
+        """
+        candidates = [replica for replica in self.replicas if replica.routable and replica not in (exclude or ())]
+        if not candidates:
+            return None
+        lowest = min(replica.cost for replica in candidates)
+        return random.choice([replica for replica in candidates if replica.cost == lowest])
+    
+    def hedge_delay(self, operation: str) -> Optional[float]:
+        """
+        Get the delay after which a call is hedged.
+        
+        Args:
+            operation: Operation the latency samples are kept for (the
+                caller's operation name, or the request path if it gave none)
+        
+        Returns:
+            Delay in seconds, or None until enough latency samples exist
+        """
+        samples = self._latencies.get(operation)
+        if samples is None or len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return max(float(np.percentile(samples, self.hedge_percentile)), self.hedge_min_delay_sec)
+    
+    async def post(
+        self,
+        client: httpx.AsyncClient,
+        path: str,
+        update_latency: bool = True,
+        hedge: bool = True,
+        admit: bool = True,
+        operation: Optional[str] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        POST to the least-loaded healthy replica.
+        
+        Calls that fail to connect are retried on another replica; other
+        errors are raised to the caller, as the request may have been
+        processed.
+        
+        Args:
+            client: HTTP client to send the request with
+            path: Path appended to the replica URL (e.g. '/predict')
+            update_latency: Whether the call's duration feeds the latency statistics
+            hedge: Whether the call may be hedged (it must be idempotent)
+            admit: Whether the call goes through the concurrency limiter
+            operation: Name the call's latency statistics are kept under
+                (e.g. 'tts'; defaults to the path)
+            **kwargs: Arguments for httpx.AsyncClient.post
+        
+        Returns:
+            The replica's response
+        
+        Raises:
+            ServiceOverloadedError: If the concurrency limiter sheds the call
+            BackendUnavailableError: If every replica's circuit is open
+            httpx.RequestError: If the request fails
+        """
+        latency_key = operation or path
+        if self.limiter is None or not admit:
+            return await self._route(client, path, latency_key, update_latency, hedge, **kwargs)
+        
+        await self.limiter.acquire()
+        start = time.perf_counter()
+        latency = None
+        dropped = False
+        try:
+            response = await self._route(client, path, latency_key, update_latency, hedge, **kwargs)
+            if response.status_code >= 500:
+                dropped = True
+            else:
+                latency = time.perf_counter() - start
+            return response
+        except httpx.RequestError:
+            dropped = True
+            raise
+        finally:
+            self.limiter.release(latency, dropped)
+    
+    async def _route(
+        self,
+        client: httpx.AsyncClient,
+        path: str,
+        latency_key: str,
+        update_latency: bool,
+        hedge: bool,
+        **kwargs
+    ) -> httpx.Response:
+        """Send a call to the best replica, moving on to another one if it cannot connect."""
+        self._calls += 1
+        tried: Set[Replica] = set()
+        while True:
+            replica = self.pick(exclude=tried)
+            if replica is None:
+                self._fast_failures += 1
+                metrics.increment("backend.circuit_fast_failures")
+                raise BackendUnavailableError(
+                    "All model server replicas are unavailable",
+                    retry_after=max(1, int(round(self.eject_sec)))
+                )
+            tried.add(replica)
+            try:
+                if hedge and self.hedge_enabled:
+                    return await self._post_hedged(replica, tried, client, path, latency_key, update_latency, **kwargs)
+                return await self._post_to(replica, client, path, latency_key, update_latency, **kwargs)
+            except httpx.ConnectError:
+                if self.pick(exclude=tried) is None:
+                    raise
+                logger.warning(f"Could not connect to model server replica {replica.url}, trying another")
+    
+    async def _post_hedged(
+        self,
+        replica: Replica,
+        tried: Set[Replica],
+        client: httpx.AsyncClient,
+        path: str,
+        latency_key: str,
+        update_latency: bool,
+        **kwargs
+    ) -> httpx.Response:
+        """Send a request and duplicate it to another replica if it is slow."""
+        delay = self.hedge_delay(latency_key)
+        primary = asyncio.ensure_future(self._post_to(replica, client, path, latency_key, update_latency, **kwargs))
+        tasks = [primary]
+        try:
+            if delay is None:
+                return await primary
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                return primary.result()
+            
+            backup_replica = self.pick(exclude=tried)
+            if backup_replica is None or self._hedges >= self.hedge_max_ratio * self._calls:
+                return await primary
+            tried.add(backup_replica)
+            self._hedges += 1
+            metrics.increment("backend.hedges")
+            logger.debug(f"Hedging {latency_key} call to {backup_replica.url} after {delay:.3f}s")
+            backup = asyncio.ensure_future(self._post_to(backup_replica, client, path, latency_key, update_latency, **kwargs))
+            tasks.append(backup)
+            
+            # First good response wins; a failure only counts once both are done
+            pending = set(tasks)
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None and task.result().status_code < 500:
+                        if task is backup:
+                            self._hedge_wins += 1
+                            metrics.increment("backend.hedge_wins")
+                        return task.result()
+                if not pending:
+                    # Both failed: prefer an error response over an exception
+                    responses = [task for task in tasks if task.exception() is None]
+                    return (responses[0] if responses else primary).result()
+        finally:
+            # Cancel the losing request (or both, if our caller was cancelled)
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    async def _post_to(
+        self,
+        replica: Replica,
+        client: httpx.AsyncClient,
+        path: str,
+        latency_key: str,
+        update_latency: bool,
+        **kwargs
+    ) -> httpx.Response:
+        """Send one request to a replica and record the outcome."""
+        trial = replica.state == CIRCUIT_HALF_OPEN
+        if trial:
+            replica.trial_in_flight = True
+        replica.in_flight += 1
+        replica.requests += 1
+        start = time.perf_counter()
+        try:
+            response = await client.post(f"{replica.url}{path}", **kwargs)
+        except httpx.RequestError:
+            self._record_failure(replica, client)
+            raise
+        except asyncio.CancelledError:
+            # Lost a hedge race: the time spent so far is a lower bound of
+            # the latency, so a stalled replica still looks slow
+            if update_latency:
+                self._record_latency(replica, time.perf_counter() - start)
+            raise
+        finally:
+            replica.in_flight -= 1
+            if trial:
+                replica.trial_in_flight = False
+        
+        if response.status_code in BREAKER_STATUS_CODES:
+            self._record_failure(replica, client)
+            return response
+        # The replica answered: an application error still proves it is up
+        self._record_success(replica)
+        if update_latency and response.status_code < 500:
+            elapsed = time.perf_counter() - start
+            self._record_latency(replica, elapsed)
+            self._latencies.setdefault(latency_key, deque(maxlen=HEDGE_WINDOW)).append(elapsed)
+        return response
+    
+    def _record_latency(self, replica: Replica, seconds: float):
+        """Fold a latency sample into the replica's EWMA."""
+        if replica.ewma_latency == 0.0:
+            replica.ewma_latency = seconds
+        else:
+            replica.ewma_latency += self.ewma_alpha * (seconds - replica.ewma_latency)
+    
+    def _record_success(self, replica: Replica):
+        """Reset the failure count and close a half-open circuit."""
+        replica.consecutive_failures = 0
+        if replica.state == CIRCUIT_HALF_OPEN:
+            self._set_state(replica, CIRCUIT_CLOSED)
+            logger.info(f"Model server replica {replica.url} is back in rotation")
+    
+    def _record_failure(self, replica: Replica, client: httpx.AsyncClient):
+        """Count a failure and open the circuit once the replica fails repeatedly."""
+        replica.errors += 1
+        replica.consecutive_failures += 1
+        metrics.increment("backend.replica_errors")
+        if replica.state == CIRCUIT_OPEN:
+            return
+        if replica.state == CIRCUIT_CLOSED and replica.consecutive_failures < self.failure_threshold:
+            return
+        
+        # Threshold reached, or the trial request of a half-open circuit failed
+        self._open_circuit(replica, client, f"{replica.consecutive_failures} consecutive failures")
+    
+    def _open_circuit(self, replica: Replica, client: httpx.AsyncClient, reason: str):
+        """Take a replica out of rotation until it is healthy again."""
+        self._set_state(replica, CIRCUIT_OPEN)
+        replica.ejections += 1
+        metrics.increment("backend.replica_ejections")
+        logger.warning(f"Opened circuit for model server replica {replica.url} after {reason}")
+        if self.health_checked:
+            # The background health prober half-opens it once healthy
+            return
+        task = asyncio.get_running_loop().create_task(self._reprobe(replica, client))
+        self._probe_tasks.add(task)
+        task.add_done_callback(self._probe_tasks.discard)
+    
+    def _set_state(self, replica: Replica, state: str):
+        """Change a replica's circuit state and update the open-circuit gauge."""
+        replica.state = state
+        metrics.set_gauge(
+            "backend.open_circuits",
+            sum(1 for other in self.replicas if other.state == CIRCUIT_OPEN)
+        )
+    
+    async def probe(self, replica: Replica, client: httpx.AsyncClient, timeout: float = 5.0) -> bool:
+        """
+        Check a replica's LitServe health endpoint.
+        
+        Args:
+            replica: Replica to check
+            client: HTTP client to send the request with
+            timeout: Request timeout in seconds
+        
+        Returns:
+            True if the replica reports healthy
+        """
+        try:
+            response = await client.post(
+                f"{replica.url}/health",
+                json={"endpoint": "health"},
+                headers={"Content-Type": "application/json"},
+                timeout=timeout
+            )
+            return response.status_code == 200 and response.json().get("status") == "healthy"
+        except Exception as e:
+            logger.debug(f"Health probe of {replica.url} failed: {e}")
+            return False
+    
+    async def _reprobe(self, replica: Replica, client: httpx.AsyncClient):
+        """Probe a replica with an open circuit until it is healthy, then half-open it."""
+        while replica.state == CIRCUIT_OPEN and not self.health_checked:
+            await asyncio.sleep(self.eject_sec)
+            if replica.state == CIRCUIT_OPEN and await self.probe(replica, client):
+                self._half_open(replica)
+    
+    def _half_open(self, replica: Replica):
+        """Let a trial request decide whether a healthy replica rejoins the rotation."""
+        self._set_state(replica, CIRCUIT_HALF_OPEN)
+        logger.info(f"Model server replica {replica.url} is healthy, sending a trial request")
+    
+    def report_health(self, replica: Replica, healthy: bool, client: httpx.AsyncClient):
+        """
+        Apply the result of a background health probe to a replica's circuit.
+        
+        A healthy replica with an open circuit is half-opened. A replica
+        whose probes fail failure_threshold times in a row is taken out of
+        rotation.
+        
+        Args:
+            replica: Probed replica
+            healthy: Whether the replica reported healthy
+            client: HTTP client used for follow-up probes
+        """
+        if healthy:
+            replica.failed_probes = 0
+            if replica.state == CIRCUIT_OPEN:
+                self._half_open(replica)
+            return
+        replica.failed_probes += 1
+        if replica.state != CIRCUIT_OPEN and replica.failed_probes >= self.failure_threshold:
+            self._open_circuit(replica, client, f"{replica.failed_probes} failed health probes")
+    
+    def stats(self) -> dict:
+        """
+        Get routing, circuit breaker and hedging statistics.
+        
+        Returns:
+            Dictionary with per-replica statistics keyed by URL, hedging
+            counters and concurrency limiter state
+        """
+        return {
+            "replicas": {replica.url: replica.stats() for replica in self.replicas},
+            "calls": self._calls,
+            "fast_failures": self._fast_failures,
+            "hedging": {
+                "enabled": self.hedge_enabled,
+                "hedges": self._hedges,
+                "hedge_wins": self._hedge_wins,
+                "hedge_rate": round(self._hedges / self._calls, 4) if self._calls else 0.0,
+                "delay_sec": {operation: self.hedge_delay(operation) for operation in self._latencies},
+            },
+            "concurrency": self.limiter.stats() if self.limiter is not None else None,
+        }
+    
+    async def close(self):
+        """Stop background health probes."""
+        for task in list(self._probe_tasks):
+            task.cancel()
+        self._probe_tasks.clear()
+
+
+# Global backend client shared by the TTS and ASR services
+backend_limiter = AdaptiveLimiter(
+    "backend",
+    initial_limit=settings.BACKEND_CONCURRENCY_INITIAL,
+    min_limit=settings.BACKEND_CONCURRENCY_MIN,
+    max_limit=settings.BACKEND_CONCURRENCY_MAX,
+    max_queue=settings.BACKEND_QUEUE_DEPTH,
+    max_queue_sec=settings.BACKEND_QUEUE_TIMEOUT_SEC
+) if settings.BACKEND_CONCURRENCY_ENABLED else None
+model_backend = BackendClient(
+    settings.MODEL_REPLICA_URLS,
+    failure_threshold=settings.BACKEND_EJECT_FAILURES,
+    eject_sec=settings.BACKEND_EJECT_SEC,
+    hedge_enabled=settings.BACKEND_HEDGE_ENABLED,
+    hedge_percentile=settings.BACKEND_HEDGE_PERCENTILE,
+    hedge_min_delay_sec=settings.BACKEND_HEDGE_MIN_DELAY_SEC,
+    hedge_max_ratio=settings.BACKEND_HEDGE_MAX_RATIO,
+    limiter=backend_limiter
+)
+metrics.register_collector("backend", model_backend.stats)
@@ -0,0 +1,201 @@
+"""Background pre-rendering of the demo catalog into the TTS cache."""
+import time
+import asyncio
+import logging
+from typing import Dict, List, Optional
+from app.config import settings
+from app.core.exceptions import ServiceOverloadedError
+from app.core.metrics import metrics
+from app.services.tts_service import TTSService, tts_cache_key, tts_service
+from app.services.voice_service import voice_service
+
+
+logger = logging.getLogger(__name__)
+
+# Example texts still use the legacy "ma" code for Marathi; voices use "mr"
+_EXAMPLE_LANGUAGE_ALIASES = {"ma": "mr"}
+
+
+def build_demo_catalog() -> List[Dict[str, str]]:
+    """
+    List every example text paired with each voice of its language.
+    
+    Entries carry the voice's language code, which is what the frontend
+    sends with its TTS requests, so they map to the same cache keys.
+    
+    Returns:
+        List of dictionaries with text, voice and language
+    """
+    voices_by_language: Dict[str, List[str]] = {}
+    for voice in voice_service.get_reference_voices():
+        if voice["available"]:
+            voices_by_language.setdefault(voice["language"], []).append(voice["voice_name"])
+    
+    catalog = []
+    for example in voice_service.get_example_texts():
+        language = _EXAMPLE_LANGUAGE_ALIASES.get(example["language"], example["language"])
+        for voice_name in voices_by_language.get(language, []):
+            catalog.append({"text": example["text"], "voice": voice_name, "language": language})
+    return catalog
+
+
+class DemoPrerenderer:
+    """
+    Keeps the demo catalog synthesized in the TTS cache.
+    
+    Each run renders entries that are missing from the cache (never
+    rendered, evicted or purged) or older than the refresh interval.
+    Refreshed entries replace the cached audio in place, so demo traffic
+    keeps being served from the cache while a refresh runs.
+    """
+    
+    def __init__(self, service: TTSService, refresh_interval_sec: float, concurrency: int = 2, enabled: bool = True):
+        """
+        Initialize pre-renderer.
+        
+        Args:
+            service: TTS service whose cache is filled
+            refresh_interval_sec: Seconds between runs and maximum entry age (0 = run once)
+            concurrency: Maximum concurrent synthesis requests
+            enabled: Whether the background job runs
+        """
+        self.service = service
+        self.refresh_interval_sec = refresh_interval_sec
+        self.concurrency = max(1, concurrency)
+        self.enabled = enabled and service.cache is not None
+        self.status = "pending" if self.enabled else "disabled"
+        self._rendered_at: Dict[str, float] = {}
+        self.last_run: Optional[Dict[str, float]] = None
+        self.next_run_at: Optional[float] = None
+    
+    @staticmethod
+    def _key(entry: Dict[str, str]) -> str:
+        """Cache key the frontend's request for an entry maps to."""
+        return tts_cache_key(entry["text"], entry["voice"], entry["language"], "wav")
+    
+    def _needs_render(self, key: str, now: float) -> bool:
+        """Whether an entry is missing from the cache or older than the refresh interval."""
+        if key not in self.service.cache:
+            return True
+        rendered_at = self._rendered_at.get(key)
+        if rendered_at is None:
+            return True
+        return self.refresh_interval_sec > 0 and now - rendered_at >= self.refresh_interval_sec
+    
+    async def render_once(self) -> Dict[str, float]:
+        """
+        Render all catalog entries that are missing or stale.
+        
+        Returns:
+            Summary of the run
+        """
+        if self.service.cache is None:
+            return {}
+        
+        started_at = time.time()
+        pending = [entry for entry in build_demo_catalog() if self._needs_render(self._key(entry), started_at)]
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def render(entry: Dict[str, str]) -> bool:
+            async with semaphore:
+                try:
+                    audio_bytes = await self.service.synthesize(
+                        text=entry["text"],
+                        voice=entry["voice"],
+                        language=entry["language"],
+                        refresh=True
+                    )
+                except ServiceOverloadedError:
+                    # Shed by admission control; the next run picks it up
+                    audio_bytes = None
+            if audio_bytes is None:
+                logger.warning(f"Demo pre-render failed: voice={entry['voice']}, language={entry['language']}")
+                return False
+            self._rendered_at[self._key(entry)] = time.time()
+            return True
+        
+        results = await asyncio.gather(*[render(entry) for entry in pending])
+        rendered = sum(results)
+        metrics.increment("tts.demo_prerender.rendered", rendered)
+        metrics.increment("tts.demo_prerender.failed", len(results) - rendered)
+        
+        self.last_run = {
+            "started_at": started_at,
+            "finished_at": time.time(),
+            "rendered": rendered,
+            "failed": len(results) - rendered,
+        }
+        logger.info(f"Demo pre-render finished: {rendered} rendered, {len(results) - rendered} failed in {self.last_run['finished_at'] - started_at:.1f}s")
+        return self.last_run
+    
+    async def run(self, after: Optional[asyncio.Future] = None):
+        """
+        Render the catalog now and then every refresh interval.
+        
+        Args:
+            after: Task to wait for before the first run (e.g. the warm-up)
+        """
+        if not self.enabled:
+            if self.service.cache is None:
+                logger.warning("Demo pre-render needs the TTS cache (TTS_CACHE_ENABLED); not running")
+            return
+        if after is not None:
+            await asyncio.wait([after])
+        
+        while True:
+            self.status = "running"
+            try:
+                await self.render_once()
+            except Exception as e:
+                logger.error(f"Demo pre-render run failed: {e}")
+            
+            self.status = "idle"
+            if self.refresh_interval_sec <= 0:
+                return
+            self.next_run_at = time.time() + self.refresh_interval_sec
+            await asyncio.sleep(self.refresh_interval_sec)
+    
+    def snapshot(self) -> dict:
+        """
+        Get coverage and staleness of the demo catalog.
+        
+        Returns:
+            Dictionary with catalog size, cached entries, coverage, stale
+            entries, age of the oldest rendering and the last run summary
+        """
+        catalog = build_demo_catalog()
+        now = time.time()
+        cached = 0
+        stale = 0
+        oldest = None
+        for entry in catalog:
+            key = self._key(entry)
+            if self.service.cache is not None and key in self.service.cache:
+                cached += 1
+            if self.service.cache is None or self._needs_render(key, now):
+                stale += 1
+            rendered_at = self._rendered_at.get(key)
+            if rendered_at is not None and (oldest is None or rendered_at < oldest):
+                oldest = rendered_at
+        
+        return {
+            "status": self.status,
+            "entries": len(catalog),
+            "cached": cached,
+            "coverage": round(cached / len(catalog), 4) if catalog else 0.0,
+            "stale": stale,
+            "oldest_age_sec": round(now - oldest, 1) if oldest is not None else None,
+            "refresh_interval_sec": self.refresh_interval_sec,
+            "next_run_at": self.next_run_at,
+            "last_run": self.last_run,
+        }
+
+
+# Global demo pre-renderer instance
+demo_prerenderer = DemoPrerenderer(
+    tts_service,
+    refresh_interval_sec=settings.DEMO_PRERENDER_REFRESH_SEC,
+    concurrency=settings.DEMO_PRERENDER_CONCURRENCY,
+    enabled=settings.DEMO_PRERENDER_ENABLED
+)
+metrics.register_collector("demo_prerender", demo_prerenderer.snapshot)
@@ -0,0 +1,154 @@
+"""Background health probing of the model server replicas."""
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+import httpx
+from app.config import settings
+from app.core.http_client import model_http_client
+from app.core.metrics import metrics
+from app.services.backend_client import BackendClient, Replica, model_backend
+
+
+logger = logging.getLogger(__name__)
+
+
+class HealthProber:
+    """
+    Probes every replica's health endpoint on an interval and caches the result.
+    
+    Replicas are probed concurrently, so one slow replica delays a round by
+    at most the probe timeout. Each result is recorded in a bounded history
+    with its latency and handed to the backend client, whose router opens
+    and half-opens circuits from it. /health answers from the cached state
+    instead of calling the model server on every request.
+    """
+    
+    def __init__(
+        self,
+        backend: BackendClient,
+        interval_sec: float = 5.0,
+        timeout_sec: float = 2.0,
+        history_size: int = 60,
+        enabled: bool = True
+    ):
+        """
+        Initialize health prober.
+        
+        Args:
+            backend: Backend client whose replicas are probed
+            interval_sec: Seconds between probe rounds
+            timeout_sec: Timeout of each health request
+            history_size: Probe results kept per replica
+            enabled: Whether the background job runs
+        """
+        self.backend = backend
+        self.interval_sec = interval_sec
+        self.timeout_sec = timeout_sec
+        self.enabled = enabled
+        self.status = "pending" if enabled else "disabled"
+        # Per replica URL: (checked_at, healthy, latency_sec)
+        self._history: Dict[str, Deque[Tuple[float, bool, float]]] = {
+            replica.url: deque(maxlen=history_size) for replica in backend.replicas
+        }
+        self.last_probe_at: Optional[float] = None
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared model server HTTP client."""
+        return model_http_client.get()
+    
+    async def _probe_replica(self, replica: Replica) -> bool:
+        """Probe one replica, record the result and report it to the router."""
+        client = await self._get_client()
+        start = time.perf_counter()
+        healthy = await self.backend.probe(replica, client, timeout=self.timeout_sec)
+        latency = time.perf_counter() - start
+        self._history[replica.url].append((time.time(), healthy, latency))
+        metrics.observe("health.probe_seconds", latency)
+        self.backend.report_health(replica, healthy, client)
+        return healthy
+    
+    async def probe_once(self) -> bool:
+        """
+        Probe all replicas concurrently.
+        
+        Returns:
+            True if at least one replica is healthy
+        """
+        results = await asyncio.gather(*[self._probe_replica(replica) for replica in self.backend.replicas])
+        self.last_probe_at = time.time()
+        healthy = sum(results)
+        metrics.set_gauge("health.healthy_replicas", healthy)
+        return healthy > 0
+    
+    async def run(self):
+        """Probe all replicas now and then every interval until cancelled."""
+        if not self.enabled:
+            return
+        self.status = "running"
+        # Open circuits now wait for this loop instead of probing on their own
+        self.backend.health_checked = True
+        try:
+            while True:
+                try:
+                    await self.probe_once()
+                except Exception as e:
+                    logger.error(f"Health probe round failed: {e}")
+                await asyncio.sleep(self.interval_sec)
+        finally:
+            self.backend.health_checked = False
+            self.status = "stopped"
+    
+    def cached_health(self) -> Optional[bool]:
+        """
+        Get the model server health from the last probe round.
+        
+        Returns:
+            True if a replica was healthy in the last round, False if none
+            was, or None if there is no recent round (prober not running, or
+            the last round is older than three intervals)
+        """
+        if self.last_probe_at is None or time.time() - self.last_probe_at > 3 * self.interval_sec:
+            return None
+        return any(history[-1][1] for history in self._history.values() if history)
+    
+    def snapshot(self) -> dict:
+        """
+        Get the health history of every replica.
+        
+        Returns:
+            Dictionary with prober status, last round time and per-replica
+            health, availability over the history and probe latency
+        """
+        replicas = {}
+        for url, history in self._history.items():
+            if not history:
+                replicas[url] = {"healthy": None, "checks": 0}
+                continue
+            checked_at, healthy, latency = history[-1]
+            replicas[url] = {
+                "healthy": healthy,
+                "checked_at": checked_at,
+                "latency_ms": round(latency * 1000, 1),
+                "checks": len(history),
+                "availability": round(sum(1 for _, ok, _ in history if ok) / len(history), 4),
+                "avg_latency_ms": round(sum(entry[2] for entry in history) / len(history) * 1000, 1),
+            }
+        return {
+            "status": self.status,
+            "interval_sec": self.interval_sec,
+            "last_probe_at": self.last_probe_at,
+            "replicas": replicas,
+        }
+
+
+# Global health prober instance
+health_prober = HealthProber(
+    model_backend,
+    interval_sec=settings.HEALTH_PROBE_INTERVAL_SEC,
+    timeout_sec=settings.HEALTH_PROBE_TIMEOUT_SEC,
+    history_size=settings.HEALTH_PROBE_HISTORY,
+    enabled=settings.HEALTH_PROBE_ENABLED
+)
+metrics.register_collector("health", health_prober.snapshot)
@@ -0,0 +1,185 @@
+"""Reference speaker registry for voice cloning."""
+import os
+import re
+import io
+import wave
+import base64
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from typing import Optional, Tuple
+from app.config import settings
+from app.core.metrics import metrics
+from app.utils.audio_utils import ASR_SAMPLE_RATE, AudioPipeline, AudioTooLongError, encode_wav_pcm16, validate_audio_file
+from app.utils.cache import LRUCache
+
+
+logger = logging.getLogger(__name__)
+
+# ref_id format: 128-bit content hash as lowercase hex
+REF_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+class ReferenceSpeakerRegistry:
+    """
+    Store reference clips for voice cloning once and refer to them by id.
+    
+    Uploaded clips are converted to a compact canonical form (16 kHz mono
+    16-bit PCM, silence trimmed, length capped) and written to disk under
+    their ref_id, which is the hash of the uploaded bytes, so re-uploading
+    the same clip returns the existing id without reprocessing. The base64
+    form forwarded to the model server is kept in a byte-budgeted cache.
+    """
+    
+    def __init__(self, storage_dir: str, max_sec: float = 30.0, min_sec: float = 1.0, cache_mb: int = 64):
+        """
+        Initialize registry.
+        
+        Args:
+            storage_dir: Directory holding the processed clips
+            max_sec: Clips are cut to this many seconds of speech
+            min_sec: Clips with less speech than this are rejected
+            cache_mb: Budget for cached base64 clips in megabytes
+        """
+        self.storage_dir = Path(storage_dir)
+        self.max_sec = max_sec
+        self.min_sec = min_sec
+        self._cache = LRUCache(max_bytes=cache_mb * 1024 * 1024, name="ref_speakers")
+    
+    @staticmethod
+    def compute_ref_id(audio_content: bytes) -> str:
+        """
+        Compute the ref_id for an uploaded clip.
+        
+        Args:
+            audio_content: Uploaded audio bytes
+        
+        Returns:
+            Hex content hash
+        """
+        return hashlib.blake2b(audio_content, digest_size=16).hexdigest()
+    
+    def _path(self, ref_id: str) -> Path:
+        """Path of the stored clip for a ref_id."""
+        return self.storage_dir / f"{ref_id}.wav"
+    
+    def exists(self, ref_id: str) -> bool:
+        """
+        Check whether a ref_id is registered.
+        
+        Args:
+            ref_id: Reference speaker id
+        
+        Returns:
+            True if the clip is stored
+        """
+        return bool(REF_ID_PATTERN.match(ref_id)) and self._path(ref_id).is_file()
+    
+    @staticmethod
+    def _describe(wav_bytes: bytes) -> dict:
+        """Read duration and sample rate from a stored clip's header."""
+        with wave.open(io.BytesIO(wav_bytes), 'rb') as wav_file:
+            return {
+                "duration_sec": wav_file.getnframes() / float(wav_file.getframerate()),
+                "sample_rate": wav_file.getframerate(),
+            }
+    
+    def register(self, audio_content: bytes, filename: str) -> Tuple[Optional[str], Optional[str], dict]:
+        """
+        Preprocess and store a reference clip.
+        
+        Args:
+            audio_content: Uploaded audio bytes
+            filename: Original filename
+        
+        Returns:
+            Tuple of (ref_id, error_message, info). ref_id is None on error;
+            info has duration_sec, sample_rate and deduplicated.
+        """
+        ref_id = self.compute_ref_id(audio_content)
+        path = self._path(ref_id)
+        if path.is_file():
+            metrics.increment("tts.ref_speakers.deduplicated")
+            return ref_id, None, {**self._describe(path.read_bytes()), "deduplicated": True}
+        
+        is_valid, error_msg = validate_audio_file(audio_content, filename)
+        if not is_valid:
+            return None, error_msg, {}
+        
+        pipeline = AudioPipeline(audio_content, filename)
+        # Reject over-long uploads from the header before paying for a decode
+        is_valid, error_msg = pipeline.validate_duration()
+        if not is_valid:
+            return None, error_msg, {}
+        if not pipeline.decode():
+            return None, "Could not decode the reference audio", {}
+        try:
+            pipeline.check_decoded_duration()
+        except AudioTooLongError as e:
+            return None, str(e), {}
+        pipeline.resample(ASR_SAMPLE_RATE).trim_silence().truncate(self.max_sec)
+        if pipeline.duration < self.min_sec:
+            return None, f"Reference audio must contain at least {self.min_sec:g} seconds of speech", {}
+        
+        wav_bytes = encode_wav_pcm16(pipeline.samples, pipeline.sample_rate)
+        self.storage_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a uniquely named file, then rename, so concurrent readers
+        # never see a partial file and concurrent writers never share one
+        with tempfile.NamedTemporaryFile(dir=self.storage_dir, suffix=".tmp", delete=False) as tmp_file:
+            tmp_file.write(wav_bytes)
+        os.replace(tmp_file.name, path)
+        
+        metrics.increment("tts.ref_speakers.registered")
+        logger.info(f"Registered reference speaker {ref_id}: {len(audio_content)} bytes uploaded, {len(wav_bytes)} bytes stored")
+        return ref_id, None, {**self._describe(wav_bytes), "deduplicated": False}
+    
+    def get_base64(self, ref_id: str) -> Optional[str]:
+        """
+        Get the stored clip as base64 for forwarding to the model server.
+        
+        Args:
+            ref_id: Reference speaker id
+        
+        Returns:
+            Base64 encoded WAV, or None if the ref_id is unknown
+        """
+        cached = self._cache.get(ref_id)
+        if cached is not None:
+            return cached.decode("ascii")
+        if not self.exists(ref_id):
+            return None
+        
+        encoded = base64.b64encode(self._path(ref_id).read_bytes())
+        self._cache.set(ref_id, encoded)
+        return encoded.decode("ascii")
+    
+    def stats(self) -> dict:
+        """Return cache statistics for the metrics endpoint."""
+        return self._cache.stats()
+
+
+# Global reference speaker registry instance
+reference_speaker_registry = ReferenceSpeakerRegistry(
+    storage_dir=settings.REF_SPEAKER_DIR,
+    max_sec=settings.REF_SPEAKER_MAX_SEC,
+    min_sec=settings.REF_SPEAKER_MIN_SEC,
+    cache_mb=settings.REF_SPEAKER_CACHE_MB
+)
+metrics.register_collector("ref_speaker_cache", reference_speaker_registry.stats)
+
+
+def register_reference_speaker(audio_content: bytes, filename: str) -> Tuple[Optional[str], Optional[str], dict]:
+    """
+    Register a reference clip with the global registry.
+    
+    Module-level so it can run on the audio worker pool in process mode.
+    
+    Args:
+        audio_content: Uploaded audio bytes
+        filename: Original filename
+    
+    Returns:
+        Tuple of (ref_id, error_message, info)
+    """
+    return reference_speaker_registry.register(audio_content, filename)
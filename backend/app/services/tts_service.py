@@ -1,32 +1,91 @@
 """Text-to-Speech service."""
+import time
+import asyncio
+import hashlib
 import logging
 import base64
+import unicodedata
 import httpx
-from typing import Optional
+from typing import AsyncIterator, List, Optional
 from app.config import settings
+from app.core.exceptions import BackendUnavailableError, ServiceOverloadedError
+from app.core.http_client import model_http_client
+from app.core.metrics import metrics
+from app.core.singleflight import SingleFlight
+from app.services.backend_client import model_backend
+from app.services.speaker_registry import reference_speaker_registry
+from app.utils.audio_codec import concatenate_wav, decode_transport_audio, read_wav_pcm16, wav_stream_header
+from app.utils.cache import LRUCache
+from app.utils.output_codec import encode_output_audio
+from app.utils.text_utils import split_text_for_tts
+from app.utils.transport_frames import FRAME_CONTENT_TYPE, decode_frame, is_frame_content_type
 
 
 logger = logging.getLogger(__name__)
 
 
+def normalize_tts_text(text: str) -> str:
+    """
+    Normalize text for cache lookups.
+    
+    Applies Unicode NFC normalization and collapses whitespace, which do
+    not change the synthesized speech.
+    
+    Args:
+        text: Input text
+        
+    Returns:
+        Normalized text
+    """
+    return unicodedata.normalize("NFC", " ".join(text.split()))
+
+
+def tts_cache_key(
+    text: str,
+    voice: str,
+    language: Optional[str],
+    output_format: str,
+    ref_id: Optional[str] = None
+) -> str:
+    """
+    Build the cache key for a synthesized TTS response.
+    
+    Args:
+        text: Text to synthesize
+        voice: Voice name
+        language: Language code
+        output_format: Audio format returned to the client, with the
+            sample rate appended when resampled (e.g. 'opus@16000')
+        ref_id: Stable reference speaker id for cloned voices
+        
+    Returns:
+        Hex digest identifying the request
+    """
+    fields = (normalize_tts_text(text), voice, language or "", output_format, ref_id or "")
+    return hashlib.blake2b("\x1f".join(fields).encode("utf-8"), digest_size=32).hexdigest()
+
+
 class TTSService:
     """Service for Text-to-Speech operations."""
     
     def __init__(self):
         """Initialize TTS service."""
         self.model_url = settings.MODEL_BASE_URL
-        self.timeout = 300.0  # 300 seconds timeout for long texts
-        # Create a persistent async client for connection pooling
-        self._client: Optional[httpx.AsyncClient] = None
+        # Replica routing state and the connection pool are shared with the
+        # other model server clients
+        self.backend = model_backend
+        self.http = model_http_client
+        self.audio_codec = settings.BACKEND_AUDIO_CODEC
+        self.transport = settings.BACKEND_TRANSPORT
+        # Byte-budgeted cache of synthesized audio for repeated prompts
+        self.cache: Optional[LRUCache] = None
+        if settings.TTS_CACHE_ENABLED:
+            self.cache = LRUCache(max_bytes=settings.TTS_CACHE_MB * 1024 * 1024, name="tts")
+        self._inflight: Optional[SingleFlight] = SingleFlight("tts") if settings.SINGLE_FLIGHT_ENABLED else None
     
     async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create async HTTP client with connection pooling."""
-        if self._client is None:
-            self._client = httpx.AsyncClient(
-                timeout=self.timeout,
-                limits=httpx.Limits(max_keepalive_connections=10, max_connections=20)
-            )
-        return self._client
+        """Get the shared model server HTTP client."""
+        return self.http.get()
     
     async def synthesize(
         self,
@@ -35,10 +94,25 @@ class TTSService:
         language: Optional[str] = None,
         cloneing: bool = False,
         ref_speker_base64: Optional[str] = None,
-        ref_speker_name: Optional[str] = None
+        ref_speker_name: Optional[str] = None,
+        ref_id: Optional[str] = None,
+        output_format: str = "wav",
+        sample_rate: Optional[int] = None,
+        refresh: bool = False
     ) -> Optional[bytes]:
         """
-        Synthesize speech from text using LitServe server.
+        Synthesize speech from text, serving repeated requests from the cache.
+        
+        Voice-cloning requests with inline reference audio bypass the cache;
+        clones of a registered reference speaker (ref_id) are cached under
+        that id, and the stored clip is forwarded to the backend. Identical
+        requests that arrive while one is in flight share its backend call.
+        With TTS_LONG_FORM_ENABLED, long texts are split into sentences that
+        are synthesized concurrently (long-form mode).
+        
+        Other output formats are encoded from the (cached) WAV off the event
+        loop and cached as separate entries, so a popular phrase is
+        synthesized once and encoded once per format.
         
         Args:
             text: Text to synthesize
@@ -46,6 +120,239 @@ class TTSService:
             cloneing: Whether to enable voice cloning
             ref_speker_base64: Base64 encoded reference audio for cloning (optional)
             ref_speker_name: Name for the cloned voice (optional)
+            ref_id: Registered reference speaker to clone (replaces ref_speker_base64)
+            output_format: Output format (key of OUTPUT_FORMATS)
+            sample_rate: Output sample rate (None keeps the synthesized rate)
+            refresh: Skip the cache lookup and replace the cached entry
+            
+        Returns:
+            Audio content as bytes, or None if synthesis fails
+            (including an unknown ref_id)
+            
+        Raises:
+            ServiceOverloadedError: If the model server call is shed by admission control
+        """
+        ref_key = None
+        if ref_id:
+            cloneing = True
+            ref_key = ref_id
+        elif cloneing:
+            # Identifies the reference audio so identical concurrent clone
+            # requests can still be coalesced
+            ref_material = f"{ref_speker_name or ''}\x1f{ref_speker_base64 or ''}".encode("utf-8")
+            ref_key = hashlib.blake2b(ref_material, digest_size=16).hexdigest()
+        output_variant = f"{output_format}@{sample_rate}" if sample_rate else output_format
+        request_key = tts_cache_key(text, voice, language, output_variant, ref_key)
+        use_cache = self.cache is not None and (not cloneing or bool(ref_id))
+        
+        if use_cache and not refresh:
+            cached = self.cache.get(request_key)
+            if cached is not None:
+                logger.info(f"TTS cache hit: voice={voice}, text_length={len(text)}")
+                return cached
+        
+        async def call_backend() -> Optional[bytes]:
+            if output_variant != "wav":
+                wav_bytes = await self.synthesize(
+                    text, voice, language, cloneing, ref_speker_base64, ref_speker_name, ref_id
+                )
+                if wav_bytes is None:
+                    return None
+                try:
+                    audio_bytes = await asyncio.to_thread(encode_output_audio, wav_bytes, output_format, sample_rate)
+                except Exception as e:
+                    logger.error(f"Error encoding TTS audio as {output_variant}: {e}")
+                    return None
+                metrics.increment(f"tts.output.{output_format}.encoded")
+                if use_cache:
+                    self.cache.set(request_key, audio_bytes)
+                return audio_bytes
+            
+            reference_audio = ref_speker_base64
+            if ref_id:
+                reference_audio = await asyncio.to_thread(reference_speaker_registry.get_base64, ref_id)
+                if reference_audio is None:
+                    logger.warning(f"Unknown reference speaker: {ref_id}")
+                    return None
+            chunks = self._split_long_form(text, language)
+            if len(chunks) > 1:
+                audio_bytes = await self._synthesize_chunks(
+                    chunks, voice, language, cloneing, reference_audio, ref_speker_name
+                )
+            else:
+                audio_bytes = await self._synthesize_backend(
+                    text, voice, language, cloneing, reference_audio, ref_speker_name
+                )
+            if audio_bytes is not None and use_cache:
+                self.cache.set(request_key, audio_bytes)
+            return audio_bytes
+        
+        if self._inflight is None:
+            return await call_backend()
+        # Concurrent identical requests share one backend call
+        return await self._inflight.do(request_key, call_backend)
+    
+    async def synthesize_stream(
+        self,
+        text: str,
+        voice: str,
+        language: Optional[str] = None,
+        cloneing: bool = False,
+        ref_speker_base64: Optional[str] = None,
+        ref_speker_name: Optional[str] = None,
+        ref_id: Optional[str] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Synthesize speech as a WAV byte stream, one sentence at a time.
+        
+        All sentences are scheduled up front (bounded by TTS_FANOUT_LIMIT)
+        and their audio is yielded in reading order as soon as each one and
+        its predecessors are ready. The first piece carries a WAV header
+        with an open-ended length. If a sentence fails after audio has been
+        sent, the stream ends early; if the first one is shed by admission
+        control, ServiceOverloadedError is raised.
+        
+        Args:
+            text: Text to synthesize
+            voice: Voice name
+            language: Language code
+            cloneing: Whether to enable voice cloning
+            ref_speker_base64: Base64 encoded reference audio for cloning
+            ref_speker_name: Name for the cloned voice
+            ref_id: Registered reference speaker to clone
+            
+        Yields:
+            WAV header followed by 16-bit PCM frames
+        """
+        start = time.perf_counter()
+        chunks = split_text_for_tts(text, language, max_chars=settings.TTS_CHUNK_MAX_CHARS) or [text]
+        semaphore = asyncio.Semaphore(max(1, settings.TTS_FANOUT_LIMIT))
+        
+        async def synthesize_chunk(chunk: str) -> Optional[bytes]:
+            async with semaphore:
+                # Per-sentence cache and coalescing: repeated sentences are free
+                return await self.synthesize(
+                    chunk, voice, language, cloneing, ref_speker_base64, ref_speker_name, ref_id
+                )
+        
+        tasks = [asyncio.ensure_future(synthesize_chunk(chunk)) for chunk in chunks]
+        metrics.increment("tts.stream.requests")
+        stream_format = None
+        try:
+            for index, task in enumerate(tasks):
+                try:
+                    audio_bytes = await task
+                except ServiceOverloadedError:
+                    if stream_format is None:
+                        raise
+                    # Audio has been sent already: end the stream like any failure
+                    audio_bytes = None
+                if audio_bytes is None:
+                    logger.error(f"Streaming TTS failed at chunk {index + 1} of {len(tasks)}")
+                    metrics.increment("tts.stream.failures")
+                    return
+                frames, sample_rate, channels = await asyncio.to_thread(read_wav_pcm16, audio_bytes)
+                
+                if stream_format is None:
+                    stream_format = (sample_rate, channels)
+                    metrics.observe("tts.stream.time_to_first_byte_seconds", time.perf_counter() - start)
+                    yield wav_stream_header(sample_rate, channels) + frames
+                    continue
+                
+                if (sample_rate, channels) != stream_format:
+                    logger.error(f"Streaming TTS chunk format {(sample_rate, channels)} differs from {stream_format}")
+                    metrics.increment("tts.stream.failures")
+                    return
+                pause_frames = int(round(sample_rate * settings.TTS_SENTENCE_PAUSE_MS / 1000.0))
+                yield b"\x00" * (pause_frames * channels * 2) + frames
+            
+            metrics.observe("tts.stream.total_seconds", time.perf_counter() - start)
+        finally:
+            # Client went away or a chunk failed: stop the remaining work
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    @staticmethod
+    def _split_long_form(text: str, language: Optional[str]) -> List[str]:
+        """
+        Split text for long-form synthesis.
+        
+        Args:
+            text: Text to synthesize
+            language: Language code
+            
+        Returns:
+            Text chunks; a single chunk means the text is sent as one request
+        """
+        if not settings.TTS_LONG_FORM_ENABLED or len(text) < settings.TTS_LONG_FORM_MIN_CHARS:
+            return [text]
+        return split_text_for_tts(text, language, max_chars=settings.TTS_CHUNK_MAX_CHARS) or [text]
+    
+    async def _synthesize_chunks(
+        self,
+        chunks: List[str],
+        voice: str,
+        language: Optional[str],
+        cloneing: bool,
+        ref_speker_base64: Optional[str],
+        ref_speker_name: Optional[str]
+    ) -> Optional[bytes]:
+        """
+        Synthesize text chunks concurrently and concatenate the audio in order.
+        
+        Args:
+            chunks: Text chunks in reading order
+            voice: Voice name
+            language: Language code
+            cloneing: Whether to enable voice cloning
+            ref_speker_base64: Base64 encoded reference audio for cloning
+            ref_speker_name: Name for the cloned voice
+            
+        Returns:
+            Concatenated WAV audio, or None if any chunk fails
+        """
+        semaphore = asyncio.Semaphore(max(1, settings.TTS_FANOUT_LIMIT))
+        
+        async def synthesize_chunk(chunk: str) -> Optional[bytes]:
+            async with semaphore:
+                return await self._synthesize_backend(
+                    chunk, voice, language, cloneing, ref_speker_base64, ref_speker_name
+                )
+        
+        logger.info(f"Long-form TTS: {len(chunks)} chunks, fan-out limit {settings.TTS_FANOUT_LIMIT}")
+        metrics.increment("tts.long_form.requests")
+        metrics.increment("tts.long_form.chunks", len(chunks))
+        results = await asyncio.gather(*(synthesize_chunk(chunk) for chunk in chunks))
+        
+        if any(audio is None for audio in results):
+            logger.error(f"Long-form TTS failed for {sum(audio is None for audio in results)} of {len(chunks)} chunks")
+            return None
+        try:
+            return await asyncio.to_thread(concatenate_wav, results, settings.TTS_SENTENCE_PAUSE_MS)
+        except Exception as e:
+            logger.error(f"Failed to concatenate long-form TTS audio: {e}")
+            return None
+    
+    async def _synthesize_backend(
+        self,
+        text: str,
+        voice: str,
+        language: Optional[str],
+        cloneing: bool,
+        ref_speker_base64: Optional[str],
+        ref_speker_name: Optional[str]
+    ) -> Optional[bytes]:
+        """
+        Synthesize speech from text using LitServe server.
+        
+        Args:
+            text: Text to synthesize
+            voice: Voice name
+            language: Language code
+            cloneing: Whether to enable voice cloning
+            ref_speker_base64: Base64 encoded reference audio for cloning
+            ref_speker_name: Name for the cloned voice
             
         Returns:
             Audio content as bytes, or None if synthesis fails
@@ -60,6 +367,10 @@ class TTSService:
                 "return_base64": True
             }
             
+            # Ask for compressed audio; backends that ignore this return WAV
+            if self.audio_codec != "wav":
+                payload["response_codec"] = self.audio_codec
+            
             # Add cloning parameters if enabled
             if cloneing:
                 payload["cloneing"] = True
@@ -70,25 +381,43 @@ class TTSService:
             
             logger.info(f"Sending TTS request: voice={voice}, cloneing={cloneing}, text_length={len(text)}")
             
+            headers = {"Content-Type": "application/json"}
+            if self.transport == "binary":
+                # Ask for raw audio in a binary frame; backends that ignore
+                # this keep answering with base64 JSON
+                payload["response_format"] = "binary"
+                headers["Accept"] = f"{FRAME_CONTENT_TYPE}, application/json"
+            
             # Make request to LitServe server
             client = await self._get_client()
-            response = await client.post(
-                f"{self.model_url}/predict",
+            response = await self.backend.post(
+                client,
+                "/predict",
+                operation="tts",
                 json=payload,
-                headers={"Content-Type": "application/json"}
+                headers=headers
             )
             
             if response.status_code == 200:
-                # Parse LitServe response
-                result = response.json()
+                # Parse LitServe response (binary frame or base64 JSON)
+                audio_payload = None
+                if is_frame_content_type(response.headers.get("content-type", "")):
+                    result, audio_payload = decode_frame(response.content)
+                else:
+                    result = response.json()
                 
                 if result.get("success", False):
-                    # Extract base64 audio and decode
+                    # Extract audio, decoding base64 for JSON responses
                     audio_base64 = result.get("audio_base64")
-                    if audio_base64:
+                    if audio_payload or audio_base64:
                         try:
-                            audio_bytes = base64.b64decode(audio_base64)
-                            logger.info(f"TTS synthesis successful: {len(audio_bytes)} bytes")
+                            audio_bytes = audio_payload if audio_payload else base64.b64decode(audio_base64)
+                            codec = result.get("audio_codec", "wav")
+                            metrics.increment("tts.transport.received_bytes", len(audio_bytes))
+                            if codec != "wav":
+                                audio_bytes = await asyncio.to_thread(decode_transport_audio, audio_bytes, codec)
+                            metrics.increment("tts.transport.audio_bytes", len(audio_bytes))
+                            logger.info(f"TTS synthesis successful: {len(audio_bytes)} bytes (codec={codec})")
                             return audio_bytes
                         except Exception as e:
                             logger.error(f"Failed to decode base64 audio: {e}")
@@ -105,6 +434,12 @@ class TTSService:
                 logger.error(f"LitServe server returned status {response.status_code}: {response.text}")
                 return None
                     
+        except ServiceOverloadedError:
+            # Shed by admission control: the caller answers 429/503 with Retry-After
+            raise
+        except BackendUnavailableError as e:
+            logger.error(f"TTS request not sent: {e}")
+            return None
         except httpx.TimeoutException:
             logger.error("TTS model request timed out")
             return None
@@ -126,8 +461,12 @@ class TTSService:
             client = await self._get_client()
             # Call LitServe health endpoint
             payload = {"endpoint": "health"}
-            response = await client.post(
-                f"{self.model_url}/health",
+            response = await self.backend.post(
+                client,
+                "/health",
+                update_latency=False,
+                hedge=False,
+                admit=False,
                 json=payload,
                 headers={"Content-Type": "application/json"},
                 timeout=5.0
@@ -141,29 +480,12 @@ class TTSService:
         except Exception as e:
             logger.debug(f"LitServe health check failed: {e}")
             return False
-    
-    async def close(self):
-        """
-        Close the HTTP client and clean up resources.
-        
-        Should be called when the service is no longer needed,
-        e.g., during application shutdown.
-        """
-        if self._client is not None:
-            try:
-                await self._client.aclose()
-                logger.debug("TTS service HTTP client closed")
-            except Exception as e:
-                logger.warning(f"Error closing TTS service HTTP client: {e}")
-            finally:
-                self._client = None
 
 
 # Global TTS service instance
 tts_service = TTSService()
-
-
-async def cleanup_tts_service():
-    """Cleanup function for TTS service - call during application shutdown."""
-    await tts_service.close()
+if tts_service.cache is not None:
+    metrics.register_collector("tts_cache", tts_service.cache.stats)
+if tts_service._inflight is not None:
+    metrics.register_collector("tts_singleflight", tts_service._inflight.stats)
 
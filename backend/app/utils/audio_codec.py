@@ -0,0 +1,193 @@
+"""Audio codecs for transport between the gateway and the model server."""
+import io
+import struct
+import wave
+import logging
+from typing import List, Tuple
+import numpy as np
+from app.utils.lazy_import import LazyModule, is_available
+
+
+logger = logging.getLogger(__name__)
+
+# Imported on first use to keep application startup fast
+sf = LazyModule("soundfile")
+
+# Supported transport codecs
+# - wav:   WAV container, sent unchanged (legacy behaviour)
+# - flac:  lossless FLAC, 16-bit
+# - pcm16: raw little-endian int16 PCM behind a 12-byte header
+TRANSPORT_CODECS = ("wav", "flac", "pcm16")
+
+# pcm16 header: magic, sample rate, channels, bits per sample
+PCM16_MAGIC = b"PCM1"
+PCM16_HEADER = struct.Struct("<4sIHH")
+
+
+def read_wav_pcm16(wav_bytes: bytes) -> Tuple[bytes, int, int]:
+    """
+    Read interleaved int16 PCM frames from a WAV file.
+
+    Args:
+        wav_bytes: WAV content
+
+    Returns:
+        Tuple of (frames, sample_rate, channels)
+    """
+    try:
+        with wave.open(io.BytesIO(wav_bytes), 'rb') as wav_file:
+            if wav_file.getsampwidth() == 2 and wav_file.getcomptype() == 'NONE':
+                return wav_file.readframes(wav_file.getnframes()), wav_file.getframerate(), wav_file.getnchannels()
+    except (wave.Error, EOFError):
+        pass
+
+    # Other sample formats (float, 24-bit, ...) go through libsndfile
+    if not is_available(sf):
+        raise ValueError("Cannot convert non-16-bit WAV without soundfile")
+    data, sample_rate = sf.read(io.BytesIO(wav_bytes), dtype='int16', always_2d=True)
+    return data.tobytes(), sample_rate, data.shape[1]
+
+
+def _write_wav_pcm16(frames: bytes, sample_rate: int, channels: int) -> bytes:
+    """
+    Wrap interleaved int16 PCM frames in a WAV container.
+
+    Args:
+        frames: PCM frames
+        sample_rate: Sample rate
+        channels: Number of channels
+
+    Returns:
+        WAV content
+    """
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(frames)
+    return buffer.getvalue()
+
+
+def wav_stream_header(sample_rate: int, channels: int) -> bytes:
+    """
+    Build a 16-bit PCM WAV header for a stream of unknown length.
+
+    The RIFF and data chunk sizes are set to 0xFFFFFFFF, which players and
+    decoders treat as "read until end of stream".
+
+    Args:
+        sample_rate: Sample rate
+        channels: Number of channels
+
+    Returns:
+        44-byte WAV header
+    """
+    block_align = channels * 2
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 0xFFFFFFFF, b"WAVE",
+        b"fmt ", 16, 1, channels, sample_rate, sample_rate * block_align, block_align, 16,
+        b"data", 0xFFFFFFFF
+    )
+
+
+def concatenate_wav(chunks: List[bytes], pause_ms: float = 0.0) -> bytes:
+    """
+    Concatenate WAV files sample-exactly, with optional silence between them.
+
+    PCM frames are copied unchanged; non-16-bit input is converted to 16-bit.
+
+    Args:
+        chunks: WAV contents in playback order
+        pause_ms: Silence inserted between consecutive chunks, in milliseconds
+
+    Returns:
+        Single WAV file
+
+    Raises:
+        ValueError: If the chunks differ in sample rate or channel count
+    """
+    frames = []
+    params = None
+    for chunk in chunks:
+        chunk_frames, sample_rate, channels = read_wav_pcm16(chunk)
+        if params is None:
+            params = (sample_rate, channels)
+        elif params != (sample_rate, channels):
+            raise ValueError(f"Cannot concatenate WAV with format {(sample_rate, channels)} after {params}")
+        frames.append(chunk_frames)
+
+    if params is None:
+        raise ValueError("No audio to concatenate")
+    sample_rate, channels = params
+    silence = b"\x00" * (int(round(sample_rate * pause_ms / 1000.0)) * channels * 2)
+    return _write_wav_pcm16(silence.join(frames), sample_rate, channels)
+
+
+def encode_transport_audio(wav_bytes: bytes, codec: str) -> Tuple[bytes, str]:
+    """
+    Encode WAV audio for transport.
+
+    Falls back to sending the input unchanged ("wav") if it cannot be
+    parsed as WAV, e.g. when upstream processing passed the upload through.
+
+    Args:
+        wav_bytes: WAV content
+        codec: Requested transport codec
+
+    Returns:
+        Tuple of (payload bytes, codec actually used)
+    """
+    if codec == "wav":
+        return wav_bytes, "wav"
+
+    try:
+        if codec == "pcm16":
+            frames, sample_rate, channels = read_wav_pcm16(wav_bytes)
+            return PCM16_HEADER.pack(PCM16_MAGIC, sample_rate, channels, 16) + frames, "pcm16"
+        if codec == "flac" and is_available(sf):
+            data, sample_rate = sf.read(io.BytesIO(wav_bytes), dtype='int16', always_2d=True)
+            buffer = io.BytesIO()
+            sf.write(buffer, data, sample_rate, format='FLAC', subtype='PCM_16')
+            return buffer.getvalue(), "flac"
+    except Exception as e:
+        logger.warning(f"Could not encode audio as {codec}, sending WAV: {e}")
+        return wav_bytes, "wav"
+
+    logger.warning(f"Transport codec {codec} not available, sending WAV")
+    return wav_bytes, "wav"
+
+
+def decode_transport_audio(payload: bytes, codec: str) -> bytes:
+    """
+    Decode transport audio back to 16-bit PCM WAV.
+
+    Args:
+        payload: Encoded audio bytes
+        codec: Codec the payload is encoded with
+
+    Returns:
+        WAV content
+
+    Raises:
+        ValueError: If the codec is unknown or the payload is malformed
+    """
+    if codec == "wav":
+        return payload
+
+    if codec == "pcm16":
+        if len(payload) < PCM16_HEADER.size:
+            raise ValueError("pcm16 payload shorter than its header")
+        magic, sample_rate, channels, bits = PCM16_HEADER.unpack_from(payload)
+        if magic != PCM16_MAGIC or bits != 16:
+            raise ValueError("Invalid pcm16 payload header")
+        return _write_wav_pcm16(payload[PCM16_HEADER.size:], sample_rate, channels)
+
+    if codec == "flac":
+        if not is_available(sf):
+            raise ValueError("Cannot decode FLAC without soundfile")
+        data, sample_rate = sf.read(io.BytesIO(payload), dtype='int16', always_2d=True)
+        return _write_wav_pcm16(np.ascontiguousarray(data).tobytes(), sample_rate, data.shape[1])
+
+    raise ValueError(f"Unsupported transport codec: {codec}")
@@ -0,0 +1,337 @@
+"""Header-only audio format and duration probing."""
+import io
+import struct
+import logging
+from typing import NamedTuple, Optional
+from app.utils.lazy_import import LazyModule, is_available
+
+
+logger = logging.getLogger(__name__)
+
+# Imported on first use to keep application startup fast
+sf = LazyModule("soundfile")
+
+
+class AudioProbe(NamedTuple):
+    """Container metadata read from an audio file header."""
+    format: Optional[str]
+    duration: Optional[float] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+
+
+# MPEG audio frame header tables, indexed by [version][layer][bitrate_index]
+_MP3_BITRATES_KBPS = {
+    "1": {
+        1: [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+        2: [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+        3: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    },
+    "2": {
+        1: [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+        2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+        3: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    },
+}
+_MP3_SAMPLE_RATES = {
+    "1": [44100, 48000, 32000],
+    "2": [22050, 24000, 16000],
+    "2.5": [11025, 12000, 8000],
+}
+# Streams often carry leading junk or padding before the first MPEG frame
+_MP3_SNIFF_SCAN_BYTES = 4096
+
+
+def sniff_audio_format(content: bytes) -> Optional[str]:
+    """
+    Detect the audio container format from magic bytes.
+    
+    Args:
+        content: Audio file content as bytes
+    
+    Returns:
+        Format name ('wav', 'flac', 'ogg', 'mp3', 'm4a', 'webm'), or None if unknown
+    """
+    head = content[:12]
+    if head[:4] in (b"RIFF", b"RIFX", b"RF64") and head[8:12] == b"WAVE":
+        return "wav"
+    if head[:4] == b"fLaC":
+        return "flac"
+    if head[:4] == b"OggS":
+        return "ogg"
+    if head[:4] == b"\x1a\x45\xdf\xa3":
+        return "webm"
+    if head[4:8] == b"ftyp":
+        return "m4a"
+    if head[:3] == b"ID3" or _find_mp3_frame_sync(content, 0, _MP3_SNIFF_SCAN_BYTES) is not None:
+        return "mp3"
+    return None
+
+
+def probe_audio(content: bytes) -> AudioProbe:
+    """
+    Read format, duration and stream parameters from the container header.
+    
+    Only header structures are parsed, so the cost does not grow with the
+    length of the recording. Fields the container does not store are None.
+    
+    Args:
+        content: Audio file content as bytes
+    
+    Returns:
+        AudioProbe with the detected metadata
+    """
+    audio_format = sniff_audio_format(content)
+    try:
+        if audio_format in ("wav", "flac", "ogg"):
+            return _probe_soundfile(content, audio_format)
+        if audio_format == "mp3":
+            return _probe_mp3(content)
+        if audio_format == "m4a":
+            return _probe_mp4(content)
+        if audio_format == "webm":
+            return _probe_webm(content)
+    except Exception as e:
+        logger.debug(f"Audio header probe failed for format {audio_format}: {e}")
+    return AudioProbe(format=audio_format)
+
+
+def _probe_soundfile(content: bytes, audio_format: str) -> AudioProbe:
+    """Probe WAV/FLAC/OGG headers via libsndfile."""
+    if not is_available(sf):
+        return AudioProbe(format=audio_format)
+    info = sf.info(io.BytesIO(content))
+    duration = info.frames / float(info.samplerate) if info.frames > 0 and info.samplerate else None
+    return AudioProbe(
+        format=audio_format,
+        duration=duration,
+        sample_rate=info.samplerate,
+        channels=info.channels
+    )
+
+
+def _parse_mp3_frame_header(content: bytes, offset: int) -> Optional[dict]:
+    """Parse an MPEG audio frame header at offset, or return None if invalid."""
+    if offset + 4 > len(content):
+        return None
+    b0, b1, b2, b3 = content[offset:offset + 4]
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+    
+    version = {0: "2.5", 2: "2", 3: "1"}.get((b1 >> 3) & 0x03)
+    layer = {1: 3, 2: 2, 3: 1}.get((b1 >> 1) & 0x03)
+    bitrate_index = b2 >> 4
+    sample_rate_index = (b2 >> 2) & 0x03
+    if version is None or layer is None or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+    
+    table_version = "1" if version == "1" else "2"
+    if layer == 1:
+        samples_per_frame = 384
+    elif layer == 2 or version == "1":
+        samples_per_frame = 1152
+    else:
+        samples_per_frame = 576
+    
+    return {
+        "version": version,
+        "layer": layer,
+        "bitrate": _MP3_BITRATES_KBPS[table_version][layer][bitrate_index] * 1000,
+        "sample_rate": _MP3_SAMPLE_RATES[version][sample_rate_index],
+        "channels": 1 if (b3 >> 6) == 3 else 2,
+        "samples_per_frame": samples_per_frame,
+    }
+
+
+def _mp3_frame_length(content: bytes, offset: int, header: dict) -> int:
+    """Length in bytes of the MPEG frame whose header starts at offset."""
+    padding = (content[offset + 2] >> 1) & 0x01
+    if header["layer"] == 1:
+        return (12 * header["bitrate"] // header["sample_rate"] + padding) * 4
+    return header["samples_per_frame"] // 8 * header["bitrate"] // header["sample_rate"] + padding
+
+
+def _find_mp3_frame_sync(content: bytes, start: int, max_scan: int) -> Optional[int]:
+    """
+    Find the first MPEG frame within max_scan bytes of start.
+    
+    A candidate header only counts if the next frame header follows where
+    its length says it should (or the data ends there), so stray 0xFF bytes
+    in leading junk are not mistaken for a frame sync.
+    
+    Args:
+        content: Audio file content as bytes
+        start: Offset to start scanning at
+        max_scan: Maximum number of bytes to scan
+    
+    Returns:
+        Offset of the first frame header, or None if none was found
+    """
+    end = min(len(content) - 4, start + max_scan)
+    for offset in range(start, end + 1):
+        header = _parse_mp3_frame_header(content, offset)
+        if header is None:
+            continue
+        next_offset = offset + _mp3_frame_length(content, offset, header)
+        if next_offset >= len(content) or _parse_mp3_frame_header(content, next_offset) is not None:
+            return offset
+    return None
+
+
+def _probe_mp3(content: bytes) -> AudioProbe:
+    """Probe MP3 duration from the first frame header and Xing/Info/VBRI tags."""
+    audio_start = 0
+    if content[:3] == b"ID3" and len(content) >= 10:
+        tag_size = (content[6] << 21) | (content[7] << 14) | (content[8] << 7) | content[9]
+        audio_start = 10 + tag_size + (10 if content[5] & 0x10 else 0)
+    
+    # Resync to the first valid frame (bounded scan)
+    audio_start = _find_mp3_frame_sync(content, audio_start, 64 * 1024)
+    if audio_start is None:
+        return AudioProbe(format="mp3")
+    header = _parse_mp3_frame_header(content, audio_start)
+    
+    # VBR files carry the total frame count in a Xing/Info or VBRI header
+    if header["version"] == "1":
+        side_info = 17 if header["channels"] == 1 else 32
+    else:
+        side_info = 9 if header["channels"] == 1 else 17
+    xing_offset = audio_start + 4 + side_info
+    frame_count = None
+    if content[xing_offset:xing_offset + 4] in (b"Xing", b"Info"):
+        flags = struct.unpack(">I", content[xing_offset + 4:xing_offset + 8])[0]
+        if flags & 0x01:
+            frame_count = struct.unpack(">I", content[xing_offset + 8:xing_offset + 12])[0]
+    elif content[audio_start + 36:audio_start + 40] == b"VBRI":
+        frame_count = struct.unpack(">I", content[audio_start + 50:audio_start + 54])[0]
+    
+    if frame_count:
+        duration = frame_count * header["samples_per_frame"] / float(header["sample_rate"])
+    else:
+        # Constant bitrate: duration follows from the audio payload size
+        audio_end = len(content) - (128 if content[-128:-125] == b"TAG" else 0)
+        duration = (audio_end - audio_start) * 8 / float(header["bitrate"])
+    
+    return AudioProbe(
+        format="mp3",
+        duration=duration,
+        sample_rate=header["sample_rate"],
+        channels=header["channels"]
+    )
+
+
+def _probe_mp4(content: bytes) -> AudioProbe:
+    """Probe MP4/M4A duration from the moov/mvhd atom."""
+    moov = _find_mp4_atom(content, 0, len(content), b"moov")
+    if moov is None:
+        return AudioProbe(format="m4a")
+    mvhd = _find_mp4_atom(content, moov[0], moov[1], b"mvhd")
+    if mvhd is None:
+        return AudioProbe(format="m4a")
+    
+    start = mvhd[0]
+    version = content[start]
+    if version == 1:
+        timescale, duration = struct.unpack(">IQ", content[start + 20:start + 32])
+    else:
+        timescale, duration = struct.unpack(">II", content[start + 12:start + 20])
+    if not timescale:
+        return AudioProbe(format="m4a")
+    return AudioProbe(format="m4a", duration=duration / float(timescale))
+
+
+def mp4_moov_at_end(content: bytes) -> bool:
+    """
+    Check whether an MP4/M4A file stores its moov atom after the media data.
+    
+    Such files can only be demuxed from seekable input: the reader has to
+    jump to the end for the index before it can decode the samples.
+    
+    Args:
+        content: Audio file content as bytes
+    
+    Returns:
+        True if the top-level mdat atom comes before moov
+    """
+    if sniff_audio_format(content) != "m4a":
+        return False
+    mdat = _find_mp4_atom(content, 0, len(content), b"mdat")
+    moov = _find_mp4_atom(content, 0, len(content), b"moov")
+    return mdat is not None and moov is not None and moov[0] > mdat[0]
+
+
+def _find_mp4_atom(content: bytes, start: int, end: int, atom_type: bytes) -> Optional[tuple]:
+    """Find a child atom between start and end, returning its (payload_start, payload_end)."""
+    offset = start
+    while offset + 8 <= end:
+        size, kind = struct.unpack(">I4s", content[offset:offset + 8])
+        header_size = 8
+        if size == 1:
+            size = struct.unpack(">Q", content[offset + 8:offset + 16])[0]
+            header_size = 16
+        elif size == 0:
+            size = end - offset
+        if size < header_size:
+            return None
+        if kind == atom_type:
+            return offset + header_size, min(offset + size, end)
+        offset += size
+    return None
+
+
+# EBML element IDs used by the WebM duration probe
+_EBML_SEGMENT = 0x18538067
+_EBML_INFO = 0x1549A966
+_EBML_TIMECODE_SCALE = 0x2AD7B1
+_EBML_DURATION = 0x4489
+_EBML_CLUSTER = 0x1F43B675
+
+
+def _read_ebml_vint(content: bytes, offset: int, keep_marker: bool) -> tuple:
+    """Read an EBML variable-length integer, returning (value, length)."""
+    first = content[offset]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not (first & mask):
+        mask >>= 1
+        length += 1
+    if length > 8:
+        raise ValueError("Invalid EBML variable-length integer")
+    value = first if keep_marker else first & (mask - 1)
+    for byte in content[offset + 1:offset + length]:
+        value = (value << 8) | byte
+    return value, length
+
+
+def _probe_webm(content: bytes) -> AudioProbe:
+    """Probe WebM duration from the Segment/Info element, if present."""
+    offset = 0
+    end = len(content)
+    timecode_scale = 1000000
+    duration_ticks = None
+    
+    while offset < end:
+        element_id, id_len = _read_ebml_vint(content, offset, keep_marker=True)
+        size, size_len = _read_ebml_vint(content, offset + id_len, keep_marker=False)
+        payload = offset + id_len + size_len
+        unknown_size = size == (1 << (7 * size_len)) - 1
+        
+        if element_id in (_EBML_SEGMENT, _EBML_INFO):
+            # Descend into master elements
+            offset = payload
+            continue
+        if element_id == _EBML_CLUSTER:
+            # Media data starts here; Info always precedes it
+            break
+        if element_id == _EBML_TIMECODE_SCALE:
+            timecode_scale = int.from_bytes(content[payload:payload + size], "big")
+        elif element_id == _EBML_DURATION:
+            fmt = ">f" if size == 4 else ">d"
+            duration_ticks = struct.unpack(fmt, content[payload:payload + size])[0]
+        if unknown_size:
+            break
+        offset = payload + size
+    
+    if not duration_ticks:
+        return AudioProbe(format="webm")
+    return AudioProbe(format="webm", duration=duration_ticks * timecode_scale / 1e9)
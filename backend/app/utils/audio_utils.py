@@ -3,28 +3,53 @@ import os
 import io
 import wave
 import logging
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 import numpy as np
-try:
-    import librosa
-    import soundfile as sf
-    HAS_LIBROSA = True
-except ImportError:
-    HAS_LIBROSA = False
-    logging.warning("librosa not installed. Some audio processing features may be limited.")
-
-try:
-    import noisereduce as nr
-    HAS_NOISEREDUCE = True
-except ImportError:
-    HAS_NOISEREDUCE = False
-    logging.warning("noisereduce not installed. Noise suppression will be disabled.")
 
 from app.config import settings
+from app.core.metrics import metrics
+from app.utils.audio_probe import AudioProbe, probe_audio, sniff_audio_format
+from app.utils.ffmpeg_decoder import FFMPEG_FORMATS, ffmpeg_decoder_pool
+from app.utils.lazy_import import LazyModule, is_available
+
+# Heavy audio libraries are imported on first use so that importing the
+# application (and TTS-only workers) does not pay for librosa/scipy/numba.
+librosa = LazyModule("librosa", "librosa not installed. Some audio processing features may be limited.")
+sf = LazyModule("soundfile", "soundfile not installed. Some audio processing features may be limited.")
+nr = LazyModule("noisereduce", "noisereduce not installed. Noise suppression will be disabled.")
 
 
 logger = logging.getLogger(__name__)
 
+# Sample rate expected by the ASR backend
+ASR_SAMPLE_RATE = 16000
+
+
+def has_librosa() -> bool:
+    """Check whether librosa and soundfile are installed (imports them on first call)."""
+    return is_available(librosa) and is_available(sf)
+
+
+def has_noisereduce() -> bool:
+    """Check whether noisereduce is installed (imports it on first call)."""
+    return is_available(nr)
+
+
+def preload_audio_libraries() -> None:
+    """
+    Import the heavy audio libraries ahead of the first request.
+    
+    Called when warming up audio workers; safe to call repeatedly.
+    """
+    has_librosa()
+    has_noisereduce()
+
+
+def start_audio_decoders() -> None:
+    """Pre-spawn the ffmpeg decoder processes for this worker (non-blocking)."""
+    if settings.FFMPEG_DECODER_ENABLED:
+        ffmpeg_decoder_pool.start()
+
 
 def get_file_extension(filename: str) -> str:
     """
@@ -55,19 +80,641 @@ def validate_audio_file(file_content: bytes, filename: str) -> Tuple[bool, Optio
     if len(file_content) > max_size_bytes:
         return False, f"File size exceeds maximum allowed size of {settings.MAX_AUDIO_SIZE_MB}MB"
     
-    # Check file extension
-    allowed_extensions = ['.mp3', '.wav', '.m4a', '.webm', '.ogg', '.flac']
-    file_ext = os.path.splitext(filename.lower())[1]
-    if file_ext not in allowed_extensions:
-        return False, f"Unsupported file format. Allowed formats: {', '.join(allowed_extensions)}"
+    # Check the actual container format from magic bytes; the filename
+    # extension is client-controlled and not trusted
+    allowed_formats = ['mp3', 'wav', 'm4a', 'webm', 'ogg', 'flac']
+    audio_format = sniff_audio_format(file_content)
+    if audio_format not in allowed_formats:
+        return False, f"Unsupported file format. Allowed formats: {', '.join('.' + fmt for fmt in allowed_formats)}"
     
     return True, None
 
 
+def is_canonical_asr_wav(audio_content: bytes) -> bool:
+    """
+    Check from the header whether audio is already 16 kHz mono 16-bit PCM WAV.
+    
+    Args:
+        audio_content: Audio file content as bytes
+        
+    Returns:
+        True if the audio can be sent to the ASR backend as-is
+    """
+    if audio_content[:4] != b"RIFF" or audio_content[8:12] != b"WAVE":
+        return False
+    try:
+        with wave.open(io.BytesIO(audio_content), 'rb') as wav_file:
+            return (
+                wav_file.getnchannels() == 1
+                and wav_file.getsampwidth() == 2
+                and wav_file.getframerate() == ASR_SAMPLE_RATE
+                and wav_file.getcomptype() == 'NONE'
+            )
+    except (wave.Error, EOFError):
+        return False
+
+
+def _decode_canonical_wav(audio_content: bytes) -> np.ndarray:
+    """
+    Decode 16-bit mono PCM WAV samples without librosa.
+    
+    Args:
+        audio_content: WAV content for which is_canonical_asr_wav() is True
+        
+    Returns:
+        Float32 samples in [-1, 1)
+    """
+    with wave.open(io.BytesIO(audio_content), 'rb') as wav_file:
+        frames = wav_file.readframes(wav_file.getnframes())
+    return np.frombuffer(frames, dtype='<i2').astype(np.float32) / 32768.0
+
+
+def _estimate_noise_profile(y: np.ndarray, sr: int, frame_ms: int = 50, quantile: float = 0.1) -> np.ndarray:
+    """
+    Estimate a noise clip from the quietest frames of a signal.
+    
+    Args:
+        y: Mono audio samples
+        sr: Sample rate
+        frame_ms: Analysis frame length in milliseconds
+        quantile: Fraction of lowest-energy frames treated as noise
+        
+    Returns:
+        Concatenated low-energy frames
+    """
+    frame_len = max(1, int(sr * frame_ms / 1000))
+    n_frames = len(y) // frame_len
+    if n_frames < 2:
+        return y
+    frames = y[:n_frames * frame_len].reshape(n_frames, frame_len)
+    energy = np.mean(frames.astype(np.float64) ** 2, axis=1)
+    n_noise = max(1, int(n_frames * quantile))
+    quietest = np.sort(np.argsort(energy)[:n_noise])
+    return frames[quietest].reshape(-1)
+
+
+def reduce_noise(
+    y: np.ndarray,
+    sr: int,
+    streaming: Optional[bool] = None,
+    block_sec: Optional[float] = None,
+    overlap_sec: Optional[float] = None,
+    context_sec: Optional[float] = None
+) -> np.ndarray:
+    """
+    Apply spectral-gating noise suppression.
+    
+    Recordings longer than one block are processed in overlapping blocks
+    and stitched with complementary linear cross-fades (overlap-add), so
+    peak memory depends on the block size rather than on the recording
+    length. Each block is denoised with extra context on both sides, which
+    is discarded afterwards. Block-wise processing always uses stationary
+    gating with a single noise profile estimated from the quietest frames
+    of the whole signal, so every block is gated against the same noise
+    floor; NOISE_SUPPRESSION_STATIONARY only selects the mode of the
+    whole-signal path.
+    
+    Args:
+        y: Mono float32 audio samples
+        sr: Sample rate
+        streaming: Enable block processing (default: NOISE_SUPPRESSION_STREAMING)
+        block_sec: Block length in seconds (default: NOISE_SUPPRESSION_BLOCK_SEC)
+        overlap_sec: Cross-fade length in seconds (default: NOISE_SUPPRESSION_OVERLAP_SEC)
+        context_sec: Context on each side of a block in seconds (default: NOISE_SUPPRESSION_CONTEXT_SEC)
+        
+    Returns:
+        Denoised float32 samples of the same length
+    """
+    if streaming is None:
+        streaming = settings.NOISE_SUPPRESSION_STREAMING
+    if block_sec is None:
+        block_sec = settings.NOISE_SUPPRESSION_BLOCK_SEC
+    if overlap_sec is None:
+        overlap_sec = settings.NOISE_SUPPRESSION_OVERLAP_SEC
+    if context_sec is None:
+        context_sec = settings.NOISE_SUPPRESSION_CONTEXT_SEC
+    block = int(block_sec * sr)
+    overlap = int(overlap_sec * sr)
+    context = int(context_sec * sr)
+    
+    blockwise = streaming and len(y) > block + overlap + 2 * context
+    # Non-stationary gating would estimate the noise floor per block
+    stationary = blockwise or settings.NOISE_SUPPRESSION_STATIONARY
+    kwargs = {"stationary": stationary}
+    if stationary:
+        kwargs["y_noise"] = _estimate_noise_profile(y, sr)
+    
+    def denoise_block(segment: np.ndarray) -> np.ndarray:
+        return np.asarray(nr.reduce_noise(y=segment, sr=sr, **kwargs), dtype=np.float32)
+    
+    if not blockwise:
+        return denoise_block(y)
+    
+    return _overlap_add(y, block, overlap, context, denoise_block)
+
+
+def _overlap_add(y: np.ndarray, block: int, overlap: int, context: int, process_block) -> np.ndarray:
+    """
+    Run process_block over overlapping blocks and cross-fade the results.
+    
+    Consecutive blocks share ``overlap`` samples; within that region the
+    earlier block fades out linearly while the later one fades in, so the
+    weights always sum to one. Each block is processed together with up to
+    ``context`` neighbouring samples on either side, which are then trimmed.
+    
+    Args:
+        y: Input samples
+        block: Hop between block starts, in samples
+        overlap: Cross-fade length between consecutive blocks, in samples
+        context: Extra samples processed on each side of a block, in samples
+        process_block: Function mapping a segment to an equally long segment
+        
+    Returns:
+        Stitched float32 output of the same length as y
+    """
+    n = len(y)
+    output = np.zeros(n, dtype=np.float32)
+    fade_in = np.linspace(0.0, 1.0, overlap, endpoint=False, dtype=np.float32)
+    
+    for start in range(0, n, block):
+        end = min(n, start + block + overlap)
+        context_start = max(0, start - context)
+        context_end = min(n, end + context)
+        processed = process_block(y[context_start:context_end])
+        processed = processed[start - context_start:end - context_start]
+        if start > 0 and overlap:
+            processed[:overlap] *= fade_in
+        if end < n and overlap:
+            processed[-overlap:] *= 1.0 - fade_in
+        output[start:end] += processed
+        if end == n:
+            break
+    
+    return output
+
+
+def detect_speech_segments(
+    y: np.ndarray,
+    sr: int,
+    frame_ms: Optional[int] = None,
+    threshold_db: Optional[float] = None,
+    max_flatness: Optional[float] = None,
+    min_silence_ms: Optional[int] = None,
+    pad_ms: Optional[int] = None
+) -> List[Tuple[int, int]]:
+    """
+    Detect speech regions with an energy and spectral-flatness VAD.
+    
+    A frame counts as speech when its energy is within threshold_db of the
+    loudest frame and its spectrum is not noise-like (spectral flatness at
+    most max_flatness). Regions separated by pauses shorter than
+    min_silence_ms are merged, and each region is padded by pad_ms.
+    
+    Args:
+        y: Mono audio samples
+        sr: Sample rate
+        frame_ms: Analysis frame length (default: VAD_FRAME_MS)
+        threshold_db: Energy threshold below the peak frame (default: VAD_THRESHOLD_DB)
+        max_flatness: Maximum spectral flatness of speech (default: VAD_MAX_SPECTRAL_FLATNESS)
+        min_silence_ms: Shortest pause that splits regions (default: VAD_MIN_SILENCE_MS)
+        pad_ms: Padding around each region (default: VAD_PAD_MS)
+        
+    Returns:
+        Sorted, non-overlapping (start, end) sample ranges; empty if no speech
+    """
+    frame_ms = frame_ms or settings.VAD_FRAME_MS
+    threshold_db = settings.VAD_THRESHOLD_DB if threshold_db is None else threshold_db
+    max_flatness = settings.VAD_MAX_SPECTRAL_FLATNESS if max_flatness is None else max_flatness
+    min_silence_ms = settings.VAD_MIN_SILENCE_MS if min_silence_ms is None else min_silence_ms
+    pad_ms = settings.VAD_PAD_MS if pad_ms is None else pad_ms
+    
+    frame_len = max(1, int(sr * frame_ms / 1000))
+    n_frames = len(y) // frame_len
+    if n_frames == 0:
+        return [(0, len(y))] if len(y) else []
+    
+    frames = y[:n_frames * frame_len].reshape(n_frames, frame_len)
+    power = np.abs(np.fft.rfft(frames, axis=1)) ** 2 + 1e-12
+    energy_db = 10 * np.log10(np.mean(frames.astype(np.float64) ** 2, axis=1) + 1e-12)
+    flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+    is_speech = (energy_db >= energy_db.max() - threshold_db) & (flatness <= max_flatness)
+    
+    # Collect runs of speech frames, bridging pauses shorter than min_silence_ms
+    min_gap = int(min_silence_ms / frame_ms)
+    segments: List[Tuple[int, int]] = []
+    for index in np.flatnonzero(is_speech):
+        if segments and index - segments[-1][1] <= min_gap:
+            segments[-1] = (segments[-1][0], index + 1)
+        else:
+            segments.append((index, index + 1))
+    
+    pad = int(sr * pad_ms / 1000)
+    padded: List[Tuple[int, int]] = []
+    for start_frame, end_frame in segments:
+        start = max(0, start_frame * frame_len - pad)
+        end = min(len(y), end_frame * frame_len + pad)
+        if padded and start <= padded[-1][1]:
+            padded[-1] = (padded[-1][0], end)
+        else:
+            padded.append((start, end))
+    return padded
+
+
+def trim_silence(y: np.ndarray, sr: int) -> Tuple[np.ndarray, float]:
+    """
+    Drop leading, trailing and long internal silences.
+    
+    Args:
+        y: Mono audio samples
+        sr: Sample rate
+        
+    Returns:
+        Tuple of (trimmed samples, fraction of samples removed). Audio in
+        which no speech is detected is returned unchanged.
+    """
+    if len(y) == 0:
+        return y, 0.0
+    segments = detect_speech_segments(y, sr)
+    if not segments:
+        return y, 0.0
+    if len(segments) == 1 and segments[0] == (0, len(y)):
+        return y, 0.0
+    trimmed = np.concatenate([y[start:end] for start, end in segments])
+    return trimmed, 1.0 - len(trimmed) / float(len(y))
+
+
+def encode_wav_pcm16(samples: np.ndarray, sr: int) -> bytes:
+    """
+    Encode mono float samples as 16-bit PCM WAV without libsndfile.
+    
+    Args:
+        samples: Mono float samples in [-1, 1]
+        sr: Sample rate
+        
+    Returns:
+        WAV content as bytes
+    """
+    pcm = np.clip(np.round(samples * 32768.0), -32768, 32767).astype('<i2')
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sr)
+        wav_file.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+def find_split_points(y: np.ndarray, sr: int, max_segment_sec: float, min_pause_ms: int) -> List[int]:
+    """
+    Choose cut points so that no segment exceeds max_segment_sec.
+    
+    Cuts are placed in the middle of VAD-detected pauses, taking the latest
+    pause that keeps the segment within bounds. If a stretch has no usable
+    pause, it is cut at the quietest frame in its last quarter.
+    
+    Args:
+        y: Mono audio samples
+        sr: Sample rate
+        max_segment_sec: Maximum segment length in seconds
+        min_pause_ms: Shortest pause that may be used as a cut point
+        
+    Returns:
+        Sorted sample indices at which to cut (excluding 0 and len(y))
+    """
+    max_len = int(max_segment_sec * sr)
+    if len(y) <= max_len:
+        return []
+    
+    segments = detect_speech_segments(y, sr, min_silence_ms=min_pause_ms, pad_ms=0)
+    pauses = [(end + start) // 2 for (_, end), (start, _) in zip(segments, segments[1:])]
+    
+    frame_len = max(1, int(sr * settings.VAD_FRAME_MS / 1000))
+    cuts: List[int] = []
+    position = 0
+    while len(y) - position > max_len:
+        limit = position + max_len
+        candidates = [p for p in pauses if position < p <= limit]
+        if candidates:
+            cut = candidates[-1]
+        else:
+            window_start = limit - max_len // 4
+            window = y[window_start:limit]
+            n_frames = max(1, len(window) // frame_len)
+            energy = np.mean(window[:n_frames * frame_len].reshape(n_frames, -1) ** 2, axis=1)
+            cut = window_start + int(np.argmin(energy)) * frame_len
+        cuts.append(cut)
+        position = cut
+    return cuts
+
+
+# Formats whose header duration matches what the decoder produces (the
+# decoder reads exactly the frame count stored in the header)
+HEADER_TRUSTED_FORMATS = ("wav", "flac")
+
+
+class AudioTooLongError(ValueError):
+    """Raised when decoded audio exceeds MAX_AUDIO_DURATION_SEC."""
+
+
+def _duration_error() -> str:
+    """Error message for audio longer than MAX_AUDIO_DURATION_SEC."""
+    return f"Audio duration exceeds maximum allowed duration of {settings.MAX_AUDIO_DURATION_SEC} seconds"
+
+
+def split_audio_for_asr(audio_content: bytes, max_segment_sec: float, min_pause_ms: int) -> List[bytes]:
+    """
+    Split audio at pauses into WAV segments of bounded length.
+    
+    Args:
+        audio_content: Audio content (normally the 16 kHz WAV from the pipeline)
+        max_segment_sec: Maximum segment length in seconds
+        min_pause_ms: Shortest pause that may be used as a cut point
+        
+    Returns:
+        List of WAV segments in order; [audio_content] if no split is needed
+        or the audio cannot be decoded
+        
+    Raises:
+        AudioTooLongError: If the decoded audio exceeds MAX_AUDIO_DURATION_SEC
+    """
+    pipeline = AudioPipeline(audio_content)
+    header_duration = pipeline.probe.duration
+    if header_duration is not None and header_duration <= max_segment_sec:
+        return [audio_content]
+    if not pipeline.decode():
+        return [audio_content]
+    pipeline.check_decoded_duration()
+    if pipeline.duration <= max_segment_sec:
+        return [audio_content]
+    
+    y, sr = pipeline.samples, pipeline.sample_rate
+    bounds = [0] + find_split_points(y, sr, max_segment_sec, min_pause_ms) + [len(y)]
+    return [encode_wav_pcm16(y[start:end], sr) for start, end in zip(bounds, bounds[1:])]
+
+
+class AudioPipeline:
+    """
+    Decode-once audio processing pipeline.
+    
+    The uploaded bytes are decoded a single time into a float32 mono array,
+    which is then carried through duration validation, noise suppression,
+    resampling and the final WAV encode. Every stage is fail-open: if the
+    audio cannot be decoded, the original bytes are passed through unchanged.
+    """
+    
+    def __init__(self, audio_content: bytes, filename: str = ""):
+        """
+        Initialize the pipeline.
+        
+        Args:
+            audio_content: Audio file content as bytes
+            filename: Original filename
+        """
+        self.audio_content = audio_content
+        self.filename = filename
+        self.samples: Optional[np.ndarray] = None
+        self.sample_rate: Optional[int] = None
+        self._decode_attempted = False
+        self._probe: Optional[AudioProbe] = None
+        self._canonical: Optional[bool] = None
+        self.trimmed_ratio = 0.0
+    
+    @property
+    def is_canonical(self) -> bool:
+        """Whether the input is already 16 kHz mono 16-bit PCM WAV."""
+        if self._canonical is None:
+            self._canonical = is_canonical_asr_wav(self.audio_content)
+        return self._canonical
+    
+    @property
+    def probe(self) -> AudioProbe:
+        """Container metadata read from the file header (parsed once)."""
+        if self._probe is None:
+            self._probe = probe_audio(self.audio_content)
+        return self._probe
+    
+    def decode(self) -> bool:
+        """
+        Decode the input bytes into a float32 mono array (once).
+        
+        Returns:
+            True if samples are available, False if decoding failed
+        """
+        if self._decode_attempted:
+            return self.samples is not None
+        self._decode_attempted = True
+        
+        if self.is_canonical:
+            # Fast path: read PCM samples straight from the buffer
+            self.samples = _decode_canonical_wav(self.audio_content)
+            self.sample_rate = ASR_SAMPLE_RATE
+            return True
+        
+        if settings.FFMPEG_DECODER_ENABLED and self.probe.format in FFMPEG_FORMATS:
+            # Compressed containers libsndfile cannot read: decode straight to
+            # the ASR rate on a pre-spawned ffmpeg process instead of audioread
+            samples = ffmpeg_decoder_pool.decode(self.audio_content)
+            if samples is not None:
+                self.samples = samples
+                self.sample_rate = ffmpeg_decoder_pool.sample_rate
+                return True
+        
+        if not has_librosa():
+            logger.warning("Cannot decode audio without librosa")
+            return False
+        
+        try:
+            audio_buffer = io.BytesIO(self.audio_content)
+            y, sr = librosa.load(audio_buffer, sr=None, mono=True)
+            self.samples = np.asarray(y, dtype=np.float32)
+            self.sample_rate = int(sr)
+        except Exception as e:
+            logger.error(f"Error decoding audio: {e}")
+        
+        return self.samples is not None
+    
+    @property
+    def duration(self) -> float:
+        """Duration of the decoded audio in seconds (0.0 if undecodable)."""
+        if not self.decode():
+            return 0.0
+        return len(self.samples) / float(self.sample_rate)
+    
+    def validate_duration(self) -> Tuple[bool, Optional[str]]:
+        """
+        Validate audio duration against MAX_AUDIO_DURATION_SEC.
+        
+        The duration stored in the container header is used when available,
+        so over-long files are rejected without decoding. Containers that do
+        not store a duration fall back to the decoded sample count.
+        
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        duration = self.probe.duration
+        if duration is None:
+            duration = self.duration
+        if duration > settings.MAX_AUDIO_DURATION_SEC:
+            return False, _duration_error()
+        return True, None
+    
+    def check_decoded_duration(self):
+        """
+        Enforce MAX_AUDIO_DURATION_SEC on the decoded samples.
+        
+        Header durations come from the upload (e.g. an MP3 Xing frame
+        count) and can understate the real length, so the limit is checked
+        against the decoded samples. WAV and FLAC are decoded to exactly
+        their header length, so their probed duration is used without
+        decoding.
+        
+        Raises:
+            AudioTooLongError: If the decoded audio is longer than allowed
+        """
+        if self.probe.format in HEADER_TRUSTED_FORMATS and self.probe.duration is not None:
+            duration = self.probe.duration
+        elif self.decode():
+            duration = self.duration
+        else:
+            return
+        if duration > settings.MAX_AUDIO_DURATION_SEC:
+            raise AudioTooLongError(_duration_error())
+    
+    def resample(self, target_sr: int = ASR_SAMPLE_RATE) -> "AudioPipeline":
+        """
+        Resample the decoded audio in place.
+        
+        Args:
+            target_sr: Target sample rate
+            
+        Returns:
+            The pipeline, for chaining
+        """
+        if not self.decode() or self.sample_rate == target_sr:
+            return self
+        
+        try:
+            resampled = librosa.resample(self.samples, orig_sr=self.sample_rate, target_sr=target_sr)
+            self.samples = np.asarray(resampled, dtype=np.float32)
+            self.sample_rate = target_sr
+        except Exception as e:
+            logger.error(f"Error resampling audio: {e}")
+        return self
+    
+    def denoise(self) -> "AudioPipeline":
+        """
+        Apply noise suppression to the decoded audio in place.
+        
+        Returns:
+            The pipeline, for chaining
+        """
+        if not settings.NOISE_SUPPRESSION_ENABLED:
+            return self
+        
+        if not has_noisereduce() or not has_librosa():
+            logger.warning("Noise suppression requested but dependencies not available")
+            return self
+        
+        if not self.decode():
+            return self
+        
+        try:
+            self.samples = reduce_noise(self.samples, self.sample_rate)
+        except Exception as e:
+            logger.error(f"Error applying noise suppression: {e}")
+        return self
+    
+    def trim_silence(self) -> "AudioPipeline":
+        """
+        Remove silence from the decoded audio in place (VAD stage).
+        
+        Returns:
+            The pipeline, for chaining
+        """
+        if not self.decode():
+            return self
+        
+        try:
+            original_duration = self.duration
+            self.samples, trimmed_ratio = trim_silence(self.samples, self.sample_rate)
+            self.trimmed_ratio = trimmed_ratio
+            metrics.observe("asr.vad.trimmed_ratio", trimmed_ratio)
+            metrics.increment("asr.vad.input_seconds", original_duration)
+            metrics.increment("asr.vad.trimmed_seconds", original_duration * trimmed_ratio)
+            logger.info(f"VAD trimmed {trimmed_ratio:.1%} of {original_duration:.1f}s audio")
+        except Exception as e:
+            logger.error(f"Error applying voice activity detection: {e}")
+        return self
+    
+    def truncate(self, max_sec: float) -> "AudioPipeline":
+        """
+        Cut the decoded audio to at most max_sec seconds in place.
+        
+        Args:
+            max_sec: Maximum duration in seconds
+            
+        Returns:
+            The pipeline, for chaining
+        """
+        if self.decode():
+            self.samples = self.samples[:int(max_sec * self.sample_rate)]
+        return self
+    
+    def encode_wav(self) -> bytes:
+        """
+        Encode the current samples as 16-bit PCM WAV.
+        
+        Returns:
+            WAV audio content as bytes, or the original content if the
+            audio could not be decoded or encoded
+        """
+        if not self.decode():
+            return self.audio_content
+        
+        try:
+            wav_buffer = io.BytesIO()
+            sf.write(wav_buffer, self.samples, self.sample_rate, format='WAV', subtype='PCM_16')
+            return wav_buffer.getvalue()
+        except Exception as e:
+            logger.error(f"Error encoding audio to WAV: {e}")
+            return self.audio_content
+    
+    def process_for_asr(self, apply_noise_suppression: bool = True) -> bytes:
+        """
+        Run the ASR preparation stages on the decoded audio.
+        
+        Args:
+            apply_noise_suppression: Whether to run the noise suppression stage
+            
+        Returns:
+            16 kHz mono WAV audio content as bytes
+            
+        Raises:
+            AudioTooLongError: If the decoded audio exceeds MAX_AUDIO_DURATION_SEC
+        """
+        self.check_decoded_duration()
+        will_denoise = apply_noise_suppression and settings.NOISE_SUPPRESSION_ENABLED and has_noisereduce()
+        if self.is_canonical and not will_denoise and not settings.VAD_ENABLED:
+            # Already in the backend format and nothing to change: forward untouched
+            return self.audio_content
+        
+        self.resample(ASR_SAMPLE_RATE)
+        if apply_noise_suppression:
+            self.denoise()
+        if settings.VAD_ENABLED:
+            self.trim_silence()
+            if self.is_canonical and not will_denoise and self.trimmed_ratio == 0.0:
+                return self.audio_content
+        return self.encode_wav()
+
+
 def get_audio_duration(file_content: bytes, filename: str) -> float:
     """
     Get audio duration in seconds.
     
+    Reads the duration from the container header when possible and only
+    decodes the audio when the header does not store it.
+    
     Args:
         file_content: Audio file content as bytes
         filename: Original filename
@@ -75,18 +722,10 @@ def get_audio_duration(file_content: bytes, filename: str) -> float:
     Returns:
         Duration in seconds
     """
-    if not HAS_LIBROSA:
-        logger.warning("Cannot get audio duration without librosa")
-        return 0.0
-    
-    try:
-        audio_buffer = io.BytesIO(file_content)
-        y, sr = librosa.load(audio_buffer, sr=None)
-        duration = librosa.get_duration(y=y, sr=sr)
-        return duration
-    except Exception as e:
-        logger.error(f"Error getting audio duration: {e}")
-        return 0.0
+    pipeline = AudioPipeline(file_content, filename)
+    if pipeline.probe.duration is not None:
+        return pipeline.probe.duration
+    return pipeline.duration
 
 
 def validate_audio_duration(file_content: bytes, filename: str) -> Tuple[bool, Optional[str]]:
@@ -100,11 +739,7 @@ def validate_audio_duration(file_content: bytes, filename: str) -> Tuple[bool, O
     Returns:
         Tuple of (is_valid, error_message)
     """
-    duration = get_audio_duration(file_content, filename)
-    if duration > settings.MAX_AUDIO_DURATION_SEC:
-        return False, f"Audio duration exceeds maximum allowed duration of {settings.MAX_AUDIO_DURATION_SEC} seconds"
-    
-    return True, None
+    return AudioPipeline(file_content, filename).validate_duration()
 
 
 def convert_audio_to_wav(audio_content: bytes, input_format: str = None) -> bytes:
@@ -118,25 +753,15 @@ def convert_audio_to_wav(audio_content: bytes, input_format: str = None) -> byte
     Returns:
         WAV audio content as bytes
     """
-    if not HAS_LIBROSA:
+    if is_canonical_asr_wav(audio_content):
+        return audio_content
+    
+    if not has_librosa():
         # If librosa is not available, return original content
         logger.warning("Cannot convert audio without librosa. Returning original content.")
         return audio_content
     
-    try:
-        audio_buffer = io.BytesIO(audio_content)
-        y, sr = librosa.load(audio_buffer, sr=16000)  # Resample to 16kHz
-        
-        # Convert to WAV
-        wav_buffer = io.BytesIO()
-        sf.write(wav_buffer, y, sr, format='WAV')
-        wav_buffer.seek(0)
-        
-        return wav_buffer.read()
-    except Exception as e:
-        logger.error(f"Error converting audio to WAV: {e}")
-        # Return original content if conversion fails
-        return audio_content
+    return AudioPipeline(audio_content).resample(ASR_SAMPLE_RATE).encode_wav()
 
 
 def apply_noise_suppression(audio_content: bytes, filename: str) -> bytes:
@@ -153,28 +778,12 @@ def apply_noise_suppression(audio_content: bytes, filename: str) -> bytes:
     if not settings.NOISE_SUPPRESSION_ENABLED:
         return audio_content
     
-    if not HAS_NOISEREDUCE or not HAS_LIBROSA:
+    if not has_noisereduce() or not has_librosa():
         logger.warning("Noise suppression requested but dependencies not available")
         return audio_content
     
-    try:
-        # Load audio
-        audio_buffer = io.BytesIO(audio_content)
-        y, sr = librosa.load(audio_buffer, sr=16000)
-        
-        # Apply noise reduction
-        reduced_noise = nr.reduce_noise(y=y, sr=sr)
-        
-        # Convert back to bytes
-        output_buffer = io.BytesIO()
-        sf.write(output_buffer, reduced_noise, sr, format='WAV')
-        output_buffer.seek(0)
-        
-        return output_buffer.read()
-    except Exception as e:
-        logger.error(f"Error applying noise suppression: {e}")
-        # Return original content if noise suppression fails
-        return audio_content
+    pipeline = AudioPipeline(audio_content, filename)
+    return pipeline.resample(ASR_SAMPLE_RATE).denoise().encode_wav()
 
 
 def prepare_audio_for_asr(audio_content: bytes, filename: str) -> bytes:
@@ -188,11 +797,4 @@ def prepare_audio_for_asr(audio_content: bytes, filename: str) -> bytes:
     Returns:
         Processed audio content as bytes
     """
-    # Apply noise suppression
-    processed_audio = apply_noise_suppression(audio_content, filename)
-    
-    # Convert to WAV format (if needed)
-    wav_audio = convert_audio_to_wav(processed_audio)
-    
-    return wav_audio
-
+    return AudioPipeline(audio_content, filename).process_for_asr()
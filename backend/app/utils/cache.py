@@ -0,0 +1,117 @@
+"""In-memory caching utilities."""
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache bounded by total byte size.
+    
+    Values are bytes objects; their length counts against the budget.
+    Entries larger than the whole budget are not stored.
+    """
+    
+    def __init__(self, max_bytes: int, name: str = "cache"):
+        """
+        Initialize cache.
+        
+        Args:
+            max_bytes: Maximum total size of cached values in bytes
+            name: Cache name used in statistics
+        """
+        self.name = name
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+    
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """
+        Get a cached value and mark it as recently used.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Cached value, or None on a miss
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: bytes) -> bool:
+        """
+        Store a value, evicting least-recently-used entries as needed.
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+            
+        Returns:
+            True if the value was stored, False if it exceeds the budget
+        """
+        size = len(value)
+        if size > self.max_bytes:
+            return False
+        
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            
+            while self._entries and self._bytes + size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self._evictions += 1
+            
+            self._entries[key] = value
+            self._bytes += size
+            return True
+    
+    def clear(self) -> int:
+        """
+        Remove all entries.
+        
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+            return count
+    
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def stats(self) -> dict:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dictionary with size and hit/miss/eviction counters
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_ratio": self._hits / lookups if lookups else 0.0
+            }
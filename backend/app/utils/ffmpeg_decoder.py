@@ -0,0 +1,254 @@
+"""Pooled ffmpeg decoder for compressed upload formats."""
+import time
+import queue
+import shutil
+import logging
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+import numpy as np
+from app.config import settings
+from app.core.metrics import metrics
+from app.utils.audio_probe import mp4_moov_at_end
+from app.utils.lazy_import import LazyModule, is_available
+
+
+logger = logging.getLogger(__name__)
+
+ffmpeg = LazyModule("ffmpeg", "ffmpeg-python not installed. Compressed uploads will be decoded with librosa.")
+
+# Containers libsndfile cannot read; librosa would fall back to audioread
+# and spawn a new ffmpeg process for every call
+FFMPEG_FORMATS = ("m4a", "webm")
+
+
+class FFmpegDecoderPool:
+    """
+    Pool of pre-spawned ffmpeg processes that decode piped audio to PCM.
+    
+    An ffmpeg process decodes exactly one input stream, so "pooling" means
+    keeping warm spares: each process is started ahead of time and blocks
+    on its stdin until a request hands it the upload bytes. Once a spare is
+    taken, a replacement is spawned on a background thread, keeping process
+    start-up off the request path. MP4/M4A files with the moov atom at the
+    end cannot be demuxed from a pipe and are decoded from a temporary file
+    by a one-off process instead.
+    """
+    
+    def __init__(
+        self,
+        size: int = 2,
+        sample_rate: int = 16000,
+        binary: str = "ffmpeg",
+        timeout: Optional[float] = 60.0
+    ):
+        """
+        Initialize decoder pool.
+        
+        Args:
+            size: Number of idle ffmpeg processes to keep ready
+            sample_rate: Output sample rate (output is always mono float32)
+            binary: ffmpeg executable name or path
+            timeout: Per-decode timeout in seconds (None = no timeout)
+        """
+        self.size = size
+        self.sample_rate = sample_rate
+        self.binary = binary
+        self.timeout = timeout
+        self._spares: "queue.Queue[subprocess.Popen]" = queue.Queue()
+        self._spawner: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self._binary_path: Optional[str] = None
+        self._checked = False
+    
+    def _command(self, source: str = "pipe:0") -> List[str]:
+        """Build the ffmpeg command line: any container from source (default stdin), s16le mono PCM on stdout."""
+        stream = ffmpeg.input(source)
+        stream = stream.output("pipe:1", format="s16le", acodec="pcm_s16le", ac=1, ar=self.sample_rate)
+        stream = stream.global_args("-hide_banner", "-loglevel", "error")
+        return stream.compile(cmd=self._binary_path)
+    
+    @property
+    def available(self) -> bool:
+        """Whether ffmpeg and ffmpeg-python are both installed."""
+        if not self._checked:
+            self._binary_path = shutil.which(self.binary)
+            if self._binary_path is None:
+                logger.warning(f"ffmpeg binary '{self.binary}' not found. Compressed uploads will be decoded with librosa.")
+            self._checked = True
+        return self._binary_path is not None and is_available(ffmpeg)
+    
+    def _spawn(self) -> subprocess.Popen:
+        """Start one ffmpeg process waiting for input."""
+        process = subprocess.Popen(
+            self._command(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        metrics.increment("audio.ffmpeg.spawned")
+        return process
+    
+    def _replenish(self):
+        """Spawn a spare process unless the pool is full or closed."""
+        if self._closed or self._spares.qsize() >= self.size:
+            return
+        try:
+            self._spares.put(self._spawn())
+        except Exception as e:
+            logger.warning(f"Failed to spawn ffmpeg decoder: {e}")
+    
+    def _get_spawner(self) -> ThreadPoolExecutor:
+        """Get or create the background spawner thread."""
+        with self._lock:
+            if self._spawner is None:
+                self._spawner = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ffmpeg-spawn")
+            return self._spawner
+    
+    def start(self) -> bool:
+        """
+        Fill the pool with idle decoder processes in the background.
+        
+        Safe to call repeatedly, including after shutdown().
+        
+        Returns:
+            True if ffmpeg is available
+        """
+        if not self.available:
+            return False
+        self._closed = False
+        spawner = self._get_spawner()
+        for _ in range(max(self.size - self._spares.qsize(), 0)):
+            spawner.submit(self._replenish)
+        return True
+    
+    def _acquire(self) -> subprocess.Popen:
+        """Take an idle process, spawning one inline only if the pool is empty."""
+        while True:
+            try:
+                process = self._spares.get_nowait()
+            except queue.Empty:
+                metrics.increment("audio.ffmpeg.pool_misses")
+                return self._spawn()
+            if process.poll() is None:
+                return process
+            # Spare died while idle (e.g. killed externally); discard it
+    
+    def decode(self, content: bytes) -> Optional[np.ndarray]:
+        """
+        Decode audio bytes to mono float32 samples at the pool sample rate.
+        
+        Args:
+            content: Encoded audio content
+        
+        Returns:
+            Decoded samples, or None if ffmpeg is unavailable or decoding failed
+        """
+        if self._closed or not self.available:
+            return None
+        if mp4_moov_at_end(content):
+            # ffmpeg has to seek to the index at the end, which a pipe cannot do
+            return self.decode_file(content)
+        
+        start = time.perf_counter()
+        try:
+            process = self._acquire()
+        except Exception as e:
+            logger.error(f"Failed to start ffmpeg decoder: {e}")
+            return None
+        # Replace the spare we just took before doing any work
+        self._get_spawner().submit(self._replenish)
+        
+        try:
+            pcm, stderr = process.communicate(input=content, timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            logger.error(f"ffmpeg decode timed out after {self.timeout}s")
+            return None
+        except Exception as e:
+            process.kill()
+            logger.error(f"ffmpeg decode failed: {e}")
+            return None
+        
+        return self._to_samples(process.returncode, pcm, stderr, start)
+    
+    def decode_file(self, content: bytes) -> Optional[np.ndarray]:
+        """
+        Decode audio bytes from a temporary file with a one-off ffmpeg process.
+        
+        Used for inputs ffmpeg cannot read from a pipe, such as MP4/M4A files
+        with the moov atom at the end.
+        
+        Args:
+            content: Encoded audio content
+        
+        Returns:
+            Decoded samples, or None if ffmpeg is unavailable or decoding failed
+        """
+        if self._closed or not self.available:
+            return None
+        
+        start = time.perf_counter()
+        metrics.increment("audio.ffmpeg.file_decodes")
+        with tempfile.NamedTemporaryFile(suffix=".m4a") as source:
+            source.write(content)
+            source.flush()
+            try:
+                result = subprocess.run(self._command(source.name), capture_output=True, timeout=self.timeout)
+            except subprocess.TimeoutExpired:
+                logger.error(f"ffmpeg decode timed out after {self.timeout}s")
+                return None
+            except Exception as e:
+                logger.error(f"ffmpeg decode failed: {e}")
+                return None
+        
+        return self._to_samples(result.returncode, result.stdout, result.stderr, start)
+    
+    def _to_samples(self, returncode: int, pcm: bytes, stderr: bytes, start: float) -> Optional[np.ndarray]:
+        """Convert ffmpeg's PCM output to float32 samples, or None if it failed."""
+        if returncode != 0:
+            message = stderr.decode("utf-8", errors="replace").strip()
+            logger.warning(f"ffmpeg exited with code {returncode}: {message}")
+            metrics.increment("audio.ffmpeg.failures")
+            return None
+        
+        usable = len(pcm) - (len(pcm) % 2)
+        samples = np.frombuffer(pcm[:usable], dtype="<i2").astype(np.float32) / 32768.0
+        metrics.observe("audio.ffmpeg.decode_seconds", time.perf_counter() - start)
+        return samples
+    
+    def stats(self) -> dict:
+        """Return pool statistics for the metrics endpoint."""
+        return {
+            "size": self.size,
+            "idle": self._spares.qsize(),
+            "available": self._binary_path is not None,
+        }
+    
+    def shutdown(self):
+        """Terminate idle processes and stop spawning new ones."""
+        self._closed = True
+        if self._spawner is not None:
+            self._spawner.shutdown(wait=True)
+            self._spawner = None
+        while True:
+            try:
+                process = self._spares.get_nowait()
+            except queue.Empty:
+                break
+            process.kill()
+            process.communicate()
+
+
+# Global decoder pool instance (one per process)
+ffmpeg_decoder_pool = FFmpegDecoderPool(
+    size=settings.FFMPEG_DECODER_POOL_SIZE,
+    sample_rate=16000,
+    binary=settings.FFMPEG_BINARY,
+    timeout=settings.FFMPEG_DECODE_TIMEOUT_SEC or None
+)
+metrics.register_collector("ffmpeg_decoder", ffmpeg_decoder_pool.stats)
@@ -0,0 +1,92 @@
+"""Deferred imports for heavy optional dependencies."""
+import importlib
+import logging
+import threading
+from types import ModuleType
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class LazyModule:
+    """
+    Module proxy that imports the real module on first attribute access.
+    
+    Keeps libraries such as librosa (which pulls in scipy and numba) out of
+    application startup; the cost is paid by the first request that needs
+    them, or by an explicit warm-up.
+    """
+    
+    def __init__(self, module_name: str, missing_message: Optional[str] = None):
+        """
+        Initialize the proxy.
+        
+        Args:
+            module_name: Fully qualified name of the module to import
+            missing_message: Warning logged if the module is not installed
+        """
+        self._module_name = module_name
+        self._missing_message = missing_message or f"{module_name} not installed."
+        self._module: Optional[ModuleType] = None
+        self._failed = False
+        self._lock = threading.Lock()
+    
+    def _lazy_load(self) -> Optional[ModuleType]:
+        """
+        Import the module if needed.
+        
+        Proxy methods are underscore-prefixed so they do not shadow
+        attributes of the wrapped module (e.g. ``librosa.load``).
+        
+        Returns:
+            Imported module, or None if it is not installed
+        """
+        if self._module is not None or self._failed:
+            return self._module
+        with self._lock:
+            if self._module is None and not self._failed:
+                try:
+                    self._module = importlib.import_module(self._module_name)
+                except ImportError:
+                    self._failed = True
+                    logger.warning(self._missing_message)
+        return self._module
+    
+    def __getattr__(self, name: str):
+        module = self._lazy_load()
+        if module is None:
+            raise ImportError(self._missing_message)
+        return getattr(module, name)
+    
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._module_name} ({state})>"
+
+
+def is_available(module: LazyModule) -> bool:
+    """
+    Check whether a lazily imported module is installed.
+    
+    Imports the module on first call.
+    
+    Args:
+        module: Lazy module proxy
+    
+    Returns:
+        True if the module could be imported
+    """
+    return module._lazy_load() is not None
+
+
+def is_loaded(module: LazyModule) -> bool:
+    """
+    Check whether a lazily imported module has already been imported.
+    
+    Args:
+        module: Lazy module proxy
+    
+    Returns:
+        True if the import has happened
+    """
+    return module._module is not None
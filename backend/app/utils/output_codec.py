@@ -0,0 +1,132 @@
+"""Client-facing output formats for synthesized audio."""
+import io
+import logging
+from typing import NamedTuple, Optional
+import numpy as np
+from app.utils.lazy_import import LazyModule
+
+
+logger = logging.getLogger(__name__)
+
+# Imported on first use to keep application startup fast
+sf = LazyModule("soundfile", "soundfile is required for TTS output encoding")
+librosa = LazyModule("librosa", "librosa is required for TTS output resampling")
+
+
+class OutputFormat(NamedTuple):
+    """libsndfile container/subtype and HTTP details of an output format."""
+    container: str
+    subtype: str
+    media_type: str
+    extension: str
+
+
+# Output formats selectable by clients
+OUTPUT_FORMATS = {
+    "wav": OutputFormat("WAV", "PCM_16", "audio/wav", "wav"),
+    "flac": OutputFormat("FLAC", "PCM_16", "audio/flac", "flac"),
+    "mp3": OutputFormat("MP3", "MPEG_LAYER_III", "audio/mpeg", "mp3"),
+    "opus": OutputFormat("OGG", "OPUS", "audio/ogg", "ogg"),
+}
+
+# Sample rates clients may request
+OUTPUT_SAMPLE_RATES = (8000, 16000, 22050, 24000, 44100, 48000)
+
+# Opus only runs at these rates; other rates are raised to the next one
+_OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+
+# Accept header media types (without parameters) and the format they select
+_MEDIA_TYPES = {
+    "audio/wav": "wav",
+    "audio/wave": "wav",
+    "audio/x-wav": "wav",
+    "audio/flac": "flac",
+    "audio/x-flac": "flac",
+    "audio/mpeg": "mp3",
+    "audio/mp3": "mp3",
+    "audio/ogg": "opus",
+    "audio/opus": "opus",
+}
+
+
+def negotiate_output_format(requested: Optional[str], accept: Optional[str]) -> str:
+    """
+    Choose the output format for a TTS response.
+    
+    An explicit format wins. Otherwise the Accept header is used, honouring
+    q-values; wildcards and headers naming no supported audio type select
+    WAV, so existing clients keep getting WAV.
+    
+    Args:
+        requested: Format named in the request body, if any
+        accept: Accept header value, if any
+    
+    Returns:
+        Key of OUTPUT_FORMATS
+    """
+    if requested:
+        return requested
+    if not accept:
+        return "wav"
+    
+    best_format, best_quality = "wav", 0.0
+    for item in accept.split(","):
+        media_type, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        output_format = _MEDIA_TYPES.get(media_type.lower())
+        # Earlier entries win ties, as clients list preferences first
+        if output_format and quality > best_quality:
+            best_format, best_quality = output_format, quality
+    return best_format
+
+
+def _opus_sample_rate(sample_rate: int) -> int:
+    """Smallest Opus rate not below sample_rate (48 kHz at most)."""
+    for rate in _OPUS_SAMPLE_RATES:
+        if rate >= sample_rate:
+            return rate
+    return _OPUS_SAMPLE_RATES[-1]
+
+
+def encode_output_audio(wav_bytes: bytes, output_format: str, sample_rate: Optional[int] = None) -> bytes:
+    """
+    Encode synthesized WAV audio in a client-facing format.
+    
+    CPU-bound; call it off the event loop.
+    
+    Args:
+        wav_bytes: WAV content from the model server
+        output_format: Key of OUTPUT_FORMATS
+        sample_rate: Target sample rate (None keeps the synthesized rate)
+    
+    Returns:
+        Encoded audio
+    
+    Raises:
+        ValueError: If the format is unknown or the audio cannot be encoded
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format: {output_format}")
+    spec = OUTPUT_FORMATS[output_format]
+    
+    data, source_rate = sf.read(io.BytesIO(wav_bytes), dtype='float32', always_2d=True)
+    target_rate = sample_rate or source_rate
+    if output_format == "opus":
+        target_rate = _opus_sample_rate(target_rate)
+    if target_rate != source_rate:
+        data = librosa.resample(data.T, orig_sr=source_rate, target_sr=target_rate).T
+        data = np.clip(data, -1.0, 1.0)
+    
+    buffer = io.BytesIO()
+    try:
+        sf.write(buffer, data, target_rate, format=spec.container, subtype=spec.subtype)
+    except Exception as e:
+        raise ValueError(f"Could not encode audio as {output_format} at {target_rate} Hz: {e}") from e
+    return buffer.getvalue()
@@ -0,0 +1,205 @@
+"""Text segmentation utilities for TTS."""
+import re
+from typing import List, Optional
+
+
+# Sentence terminators by language. Hindi, Marathi and Sanskrit end
+# sentences with the danda (।) and double danda (॥); Kannada and Telugu
+# mostly use the Latin full stop but the danda appears in older and
+# verse-style text. "?" and "!" are shared by all.
+_DANDA = "।॥"
+SENTENCE_TERMINATORS = {
+    "en": ".!?",
+    "hi": _DANDA + ".!?",
+    "mr": _DANDA + ".!?",
+    "ma": _DANDA + ".!?",  # legacy code for Marathi
+    "sa": _DANDA + ".!?",
+    "kn": ".!?" + _DANDA,
+    "te": ".!?" + _DANDA,
+}
+
+# Clause separators used to break sentences that exceed the chunk limit
+CLAUSE_SEPARATORS = ",;:—"
+
+# Characters that may follow a terminator and belong to the same sentence
+_CLOSING_CHARS = "\"')]}’”"
+
+# English abbreviations that end with a full stop but do not end a sentence
+_ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "e.g", "i.e",
+    "no", "fig", "inc", "ltd", "co", "dept", "approx", "mt", "u.s", "a.m", "p.m",
+}
+
+# Unicode blocks of the Indic scripts we support
+_SCRIPT_RANGES = (
+    ("hi", 0x0900, 0x097F),  # Devanagari (Hindi, Marathi, Sanskrit)
+    ("te", 0x0C00, 0x0C7F),  # Telugu
+    ("kn", 0x0C80, 0x0CFF),  # Kannada
+)
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
+
+def detect_script_language(text: str) -> str:
+    """
+    Guess the segmentation language from the dominant script.
+    
+    Args:
+        text: Input text
+    
+    Returns:
+        'hi' for Devanagari, 'kn', 'te', or 'en' for anything else
+    """
+    counts = {}
+    for char in text:
+        code = ord(char)
+        for language, low, high in _SCRIPT_RANGES:
+            if low <= code <= high:
+                counts[language] = counts.get(language, 0) + 1
+                break
+    if not counts:
+        return "en"
+    return max(counts, key=counts.get)
+
+
+def _ends_with_abbreviation(text: str) -> bool:
+    """Check whether the text before a full stop ends with an abbreviation or an initial."""
+    words = text.split()
+    if not words:
+        return False
+    word = words[-1].lstrip(_CLOSING_CHARS + "(\"'").lower()
+    return word in _ABBREVIATIONS or (len(word) == 1 and word.isalpha())
+
+
+def split_sentences(text: str, language: Optional[str] = None) -> List[str]:
+    """
+    Split text into sentences using language-specific terminators.
+    
+    A danda always ends a sentence. Other terminators only end a sentence
+    when followed by whitespace or the end of the text, so decimals such as
+    "3.5" stay intact; English abbreviations and initials are not treated
+    as sentence ends. Blank lines always separate sentences.
+    
+    Args:
+        text: Input text
+        language: Language code (detected from the script if None or unknown)
+    
+    Returns:
+        Non-empty sentences with their terminators, in order
+    """
+    if language not in SENTENCE_TERMINATORS:
+        language = detect_script_language(text)
+    terminators = SENTENCE_TERMINATORS[language]
+    
+    sentences = []
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        start = 0
+        i = 0
+        length = len(paragraph)
+        while i < length:
+            char = paragraph[i]
+            if char not in terminators:
+                i += 1
+                continue
+            
+            # Consume runs like "?!", "..." or "॥" and trailing quotes/brackets
+            end = i + 1
+            while end < length and paragraph[end] in terminators:
+                end += 1
+            while end < length and paragraph[end] in _CLOSING_CHARS:
+                end += 1
+            
+            at_boundary = end >= length or paragraph[end].isspace() or char in _DANDA
+            if at_boundary and not (char == "." and language == "en" and _ends_with_abbreviation(paragraph[start:i])):
+                sentence = paragraph[start:end].strip()
+                if sentence:
+                    sentences.append(sentence)
+                start = end
+            i = end
+        
+        tail = paragraph[start:].strip()
+        if tail:
+            sentences.append(tail)
+    
+    return [" ".join(sentence.split()) for sentence in sentences]
+
+
+def _split_long_sentence(sentence: str, max_chars: int) -> List[str]:
+    """Break a sentence at clause separators, then at word boundaries, to fit max_chars."""
+    clauses = []
+    current = ""
+    for piece in re.split(f"(?<=[{re.escape(CLAUSE_SEPARATORS)}])\\s+", sentence):
+        candidate = f"{current} {piece}".strip()
+        if current and len(candidate) > max_chars:
+            clauses.append(current)
+            current = piece
+        else:
+            current = candidate
+    if current:
+        clauses.append(current)
+    
+    chunks = []
+    for clause in clauses:
+        if len(clause) <= max_chars:
+            chunks.append(clause)
+            continue
+        current = ""
+        for word in clause.split():
+            candidate = f"{current} {word}".strip()
+            if current and len(candidate) > max_chars:
+                chunks.append(current)
+                current = word
+            else:
+                current = candidate
+        if current:
+            chunks.append(current)
+    return chunks
+
+
+def split_text_for_tts(
+    text: str,
+    language: Optional[str] = None,
+    max_chars: int = 250,
+    min_chars: int = 20
+) -> List[str]:
+    """
+    Split text into chunks for concurrent synthesis.
+    
+    Each chunk is a sentence; sentences longer than max_chars are broken at
+    clauses and then words. Fragments shorter than min_chars are merged into
+    the following chunk when the result still fits, to avoid choppy prosody.
+    
+    Args:
+        text: Input text
+        language: Language code (detected from the script if None or unknown)
+        max_chars: Maximum chunk length in characters
+        min_chars: Chunks shorter than this are merged with a neighbour
+    
+    Returns:
+        Text chunks in reading order
+    """
+    pieces = []
+    for sentence in split_sentences(text, language):
+        if len(sentence) > max_chars:
+            pieces.extend(_split_long_sentence(sentence, max_chars))
+        else:
+            pieces.append(sentence)
+    
+    chunks = []
+    pending = ""
+    for piece in pieces:
+        merged = f"{pending} {piece}".strip()
+        if pending and len(merged) > max_chars:
+            chunks.append(pending)
+            merged = piece
+        if len(merged) < min_chars:
+            pending = merged
+        else:
+            chunks.append(merged)
+            pending = ""
+    if pending:
+        if chunks and len(chunks[-1]) + 1 + len(pending) <= max_chars:
+            chunks[-1] = f"{chunks[-1]} {pending}"
+        else:
+            chunks.append(pending)
+    return chunks
@@ -0,0 +1,68 @@
+"""Length-prefixed binary frames for gateway <-> LitServe transport."""
+import json
+import struct
+from typing import Any, Dict, Tuple
+
+
+# Frame layout (big-endian):
+#   magic (4 bytes) | metadata length (uint32) | payload length (uint32)
+#   | metadata (UTF-8 JSON) | payload (raw audio bytes)
+FRAME_MAGIC = b"SLF1"
+FRAME_HEADER = struct.Struct(">4sII")
+FRAME_CONTENT_TYPE = "application/x-audio-frame"
+
+
+def encode_frame(metadata: Dict[str, Any], payload: bytes = b"") -> bytes:
+    """
+    Encode metadata and raw audio bytes into a single frame.
+    
+    Args:
+        metadata: JSON-serializable request/response fields
+        payload: Raw audio bytes
+    
+    Returns:
+        Encoded frame
+    """
+    meta = json.dumps(metadata, separators=(",", ":")).encode("utf-8")
+    return b"".join((FRAME_HEADER.pack(FRAME_MAGIC, len(meta), len(payload)), meta, payload))
+
+
+def decode_frame(frame: bytes) -> Tuple[Dict[str, Any], bytes]:
+    """
+    Decode a frame into its metadata and payload.
+    
+    Args:
+        frame: Encoded frame
+    
+    Returns:
+        Tuple of (metadata, payload)
+    
+    Raises:
+        ValueError: If the frame is truncated or malformed
+    """
+    if len(frame) < FRAME_HEADER.size:
+        raise ValueError("Frame shorter than its header")
+    magic, meta_length, payload_length = FRAME_HEADER.unpack_from(frame)
+    if magic != FRAME_MAGIC:
+        raise ValueError("Invalid frame magic")
+    meta_end = FRAME_HEADER.size + meta_length
+    if len(frame) != meta_end + payload_length:
+        raise ValueError(f"Frame length mismatch: expected {meta_end + payload_length} bytes, got {len(frame)}")
+    
+    metadata = json.loads(frame[FRAME_HEADER.size:meta_end].decode("utf-8"))
+    if not isinstance(metadata, dict):
+        raise ValueError("Frame metadata must be a JSON object")
+    return metadata, frame[meta_end:]
+
+
+def is_frame_content_type(content_type: str) -> bool:
+    """
+    Check whether a Content-Type header denotes a binary frame.
+    
+    Args:
+        content_type: Content-Type header value
+    
+    Returns:
+        True for FRAME_CONTENT_TYPE (parameters are ignored)
+    """
+    return content_type.split(";", 1)[0].strip().lower() == FRAME_CONTENT_TYPE
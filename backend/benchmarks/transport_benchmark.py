@@ -0,0 +1,112 @@
+"""
+Benchmark the base64 JSON and binary frame transports.
+
+Measures the gateway-side cost of building an ASR request and parsing a
+TTS response for each transport: CPU time per call and peak transient
+allocation (tracked with tracemalloc, excluding the input buffer).
+
+Usage:
+    python -m benchmarks.transport_benchmark [--sizes-mb 1 5] [--iterations 20]
+"""
+import os
+import json
+import time
+import base64
+import argparse
+import tracemalloc
+from typing import Callable, Dict, List
+from app.utils.transport_frames import decode_frame, encode_frame
+
+
+def json_asr_request(audio: bytes) -> bytes:
+    """Build an ASR request body with base64 audio in JSON."""
+    payload = {"endpoint": "asr", "language": "en", "audio_base64": base64.b64encode(audio).decode("utf-8")}
+    return json.dumps(payload).encode("utf-8")
+
+
+def binary_asr_request(audio: bytes) -> bytes:
+    """Build an ASR request body as a binary frame."""
+    return encode_frame({"endpoint": "asr", "language": "en"}, audio)
+
+
+def json_tts_response(body: bytes) -> bytes:
+    """Extract audio from a base64 JSON TTS response."""
+    return base64.b64decode(json.loads(body)["audio_base64"])
+
+
+def binary_tts_response(body: bytes) -> bytes:
+    """Extract audio from a binary frame TTS response."""
+    _, audio = decode_frame(body)
+    return audio
+
+
+def measure(fn: Callable[[bytes], bytes], data: bytes, iterations: int) -> Dict[str, float]:
+    """
+    Measure CPU time and peak transient allocation of fn(data).
+    
+    Args:
+        fn: Function under test
+        data: Input buffer (allocated before measuring)
+        iterations: Number of timed calls
+    
+    Returns:
+        Dictionary with cpu_ms per call and peak_mb of transient allocation
+    """
+    fn(data)  # warm up
+    start = time.process_time()
+    for _ in range(iterations):
+        fn(data)
+    cpu_ms = (time.process_time() - start) * 1000 / iterations
+    
+    tracemalloc.start()
+    result = fn(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {"cpu_ms": cpu_ms, "peak_mb": peak / (1024 * 1024)}
+
+
+def run(sizes_mb: List[float], iterations: int) -> List[Dict[str, float]]:
+    """
+    Run the benchmark for each audio size.
+    
+    Args:
+        sizes_mb: Audio sizes in megabytes
+        iterations: Timed calls per measurement
+    
+    Returns:
+        One result row per (size, direction, transport)
+    """
+    rows = []
+    for size_mb in sizes_mb:
+        audio = os.urandom(int(size_mb * 1024 * 1024))
+        cases = {
+            "asr_request": {
+                "json": (json_asr_request, audio),
+                "binary": (binary_asr_request, audio),
+            },
+            "tts_response": {
+                "json": (json_tts_response, json.dumps({"success": True, "audio_base64": base64.b64encode(audio).decode("utf-8")}).encode("utf-8")),
+                "binary": (binary_tts_response, encode_frame({"success": True}, audio)),
+            },
+        }
+        for direction, transports in cases.items():
+            for transport, (fn, data) in transports.items():
+                rows.append({"size_mb": size_mb, "direction": direction, "transport": transport, **measure(fn, data, iterations)})
+    return rows
+
+
+def main():
+    """Run the benchmark and print a results table."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[1.0, 5.0])
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+    
+    print(f"{'size':>7}  {'direction':<13} {'transport':<9} {'cpu ms/call':>12} {'peak MB':>9}")
+    for row in run(args.sizes_mb, args.iterations):
+        print(f"{row['size_mb']:>5.1f}MB  {row['direction']:<13} {row['transport']:<9} {row['cpu_ms']:>12.2f} {row['peak_mb']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
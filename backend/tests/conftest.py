@@ -72,3 +72,22 @@ def sample_audio_base64(sample_audio_bytes):
     """Sample audio base64 for testing."""
     return base64.b64encode(sample_audio_bytes).decode('utf-8')
 
+
+
+@pytest.fixture
+def make_wav_bytes():
+    """Factory producing WAV bytes of a sine tone for audio pipeline tests."""
+    import io
+    import numpy as np
+    import soundfile as sf
+    
+    def _make(duration_sec=1.0, sample_rate=16000, channels=1, subtype="PCM_16", frequency=440.0, format="WAV"):
+        t = np.arange(int(duration_sec * sample_rate)) / sample_rate
+        tone = (0.5 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+        if channels > 1:
+            tone = np.stack([tone] * channels, axis=1)
+        buffer = io.BytesIO()
+        sf.write(buffer, tone, sample_rate, format=format, subtype=subtype)
+        return buffer.getvalue()
+    
+    return _make
@@ -0,0 +1,71 @@
+"""Tests for admin API endpoints."""
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services.tts_service import tts_service
+
+
+@pytest.fixture
+def client():
+    """Create test client."""
+    return TestClient(app)
+
+
+@pytest.fixture
+def admin_key():
+    """Enable admin endpoints with a test key."""
+    with patch('app.core.security.settings.ADMIN_API_KEY', 'test-admin-key'):
+        yield 'test-admin-key'
+
+
+def test_purge_tts_cache(client, admin_key):
+    """Test purging the TTS cache."""
+    tts_service.cache.set("key", b"audio")
+    
+    response = client.delete("/api/v1/admin/cache/tts", headers={"X-Admin-Key": admin_key})
+    
+    assert response.status_code == 200
+    assert response.json() == {"cache": "tts", "purged": 1}
+    assert len(tts_service.cache) == 0
+
+
+def test_cache_stats(client, admin_key):
+    """Test reading cache statistics."""
+    response = client.get("/api/v1/admin/cache", headers={"X-Admin-Key": admin_key})
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert "hit_ratio" in data["tts"]
+    assert "hit_ratio" in data["asr_audio"]
+
+
+def test_purge_unknown_cache(client, admin_key):
+    """Test purging a cache that does not exist."""
+    response = client.delete("/api/v1/admin/cache/nope", headers={"X-Admin-Key": admin_key})
+    
+    assert response.status_code == 404
+
+
+def test_admin_requires_key(client, admin_key):
+    """Test that admin endpoints reject a missing or wrong key."""
+    assert client.delete("/api/v1/admin/cache/tts").status_code == 403
+    assert client.delete("/api/v1/admin/cache/tts", headers={"X-Admin-Key": "wrong"}).status_code == 403
+
+
+def test_admin_disabled_without_key(client):
+    """Test that admin endpoints are disabled when no key is configured."""
+    with patch('app.core.security.settings.ADMIN_API_KEY', ''):
+        response = client.get("/api/v1/admin/cache", headers={"X-Admin-Key": ""})
+    
+    assert response.status_code == 403
+
+
+def test_prerender_status(client, admin_key):
+    """Test reading demo pre-render coverage."""
+    response = client.get("/api/v1/admin/prerender", headers={"X-Admin-Key": admin_key})
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["entries"] > 0
+    assert 0.0 <= data["coverage"] <= 1.0
@@ -2,6 +2,7 @@
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, AsyncMock, MagicMock
+from app.core.exceptions import ServiceOverloadedError
 from app.main import app
 
 
@@ -12,9 +13,9 @@ def client():
 
 
 @pytest.fixture
-def sample_audio_file():
+def sample_audio_file(make_wav_bytes):
     """Create sample audio file for testing."""
-    return ("test.wav", b"fake_audio_data", "audio/wav")
+    return ("test.wav", make_wav_bytes(duration_sec=0.5), "audio/wav")
 
 
 @pytest.mark.asyncio
@@ -79,6 +80,24 @@ async def test_asr_endpoint_service_unavailable(client, sample_audio_file):
         assert "unavailable" in response.json()["detail"].lower()
 
 
+@pytest.mark.asyncio
+async def test_asr_endpoint_overloaded(client, sample_audio_file):
+    """Test that a transcription shed by admission control returns its status with Retry-After."""
+    filename, content, content_type = sample_audio_file
+    
+    with patch('app.api.v1.asr.asr_service.transcribe', new_callable=AsyncMock) as mock_transcribe:
+        mock_transcribe.side_effect = ServiceOverloadedError("Model server is overloaded", retry_after=4, status_code=503)
+        
+        response = client.post(
+            "/api/v1/asr",
+            files={"audio": (filename, content, content_type)},
+            data={"language": "en"}
+        )
+        
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "4"
+
+
 @pytest.mark.asyncio
 async def test_asr_endpoint_invalid_audio(client):
     """Test ASR request with invalid audio file."""
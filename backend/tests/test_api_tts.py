@@ -1,8 +1,13 @@
 """Tests for TTS API endpoints."""
+import io
+import struct
 import pytest
 import base64
+import numpy as np
+import soundfile as sf
 from fastapi.testclient import TestClient
 from unittest.mock import patch, AsyncMock
+from app.core.exceptions import ServiceOverloadedError
 from app.main import app
 
 
@@ -104,3 +109,93 @@ async def test_tts_endpoint_service_unavailable(client):
         assert response.status_code == 503
         assert "unavailable" in response.json()["detail"].lower()
 
+
+def test_tts_endpoints_shed_load(client):
+    """Test that requests shed by admission control return 429/503 with Retry-After."""
+    with patch('app.api.v1.tts.tts_service.synthesize', new_callable=AsyncMock) as mock_synthesize:
+        mock_synthesize.side_effect = ServiceOverloadedError("Too many requests", retry_after=3, status_code=429)
+        response = client.post("/api/v1/tts", json={"text": "Hello, world!", "voice": "patrick"})
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "3"
+        
+        mock_synthesize.side_effect = ServiceOverloadedError("Overloaded", retry_after=2, status_code=503)
+        response = client.post("/api/v1/tts/stream", json={"text": "Hello, world!", "voice": "patrick"})
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "2"
+
+
+
+def _sentence_wav(text: str) -> bytes:
+    """Build a 16 kHz WAV whose length encodes the sentence length."""
+    buffer = io.BytesIO()
+    sf.write(buffer, np.full(len(text) * 10, 0.25, dtype=np.float32), 16000, format='WAV', subtype='PCM_16')
+    return buffer.getvalue()
+
+
+def test_tts_stream_endpoint(client):
+    """Test that the streaming endpoint returns an open-ended WAV with every sentence in order."""
+    text = "First sentence here. Second one is a little longer. Third sentence closes it."
+    
+    async def fake_synthesize(text, *args, **kwargs):
+        return _sentence_wav(text)
+    
+    with patch('app.api.v1.tts.tts_service.synthesize', side_effect=fake_synthesize), \
+            patch('app.services.tts_service.settings.TTS_SENTENCE_PAUSE_MS', 10.0):
+        response = client.post("/api/v1/tts/stream", json={"text": text, "voice": "patrick", "language": "en"})
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "audio/wav"
+    riff, riff_size, wave_id = struct.unpack("<4sI4s", response.content[:12])
+    assert (riff, riff_size, wave_id) == (b"RIFF", 0xFFFFFFFF, b"WAVE")
+    assert struct.unpack("<I", response.content[24:28])[0] == 16000
+    assert response.content[36:44] == b"data" + struct.pack("<I", 0xFFFFFFFF)
+    
+    chunks = ["First sentence here.", "Second one is a little longer.", "Third sentence closes it."]
+    expected_samples = sum(len(chunk) * 10 for chunk in chunks) + 2 * 160
+    assert len(response.content) - 44 == expected_samples * 2
+
+
+def test_tts_stream_endpoint_unavailable(client):
+    """Test that the streaming endpoint returns 503 if no audio can be produced."""
+    with patch('app.api.v1.tts.tts_service.synthesize', new_callable=AsyncMock) as mock_synthesize:
+        mock_synthesize.return_value = None
+        
+        response = client.post("/api/v1/tts/stream", json={"text": "Hello, world!", "voice": "patrick"})
+    
+    assert response.status_code == 503
+
+
+@pytest.mark.parametrize("body_format, accept, expected_format, media_type", [
+    (None, None, "wav", "audio/wav"),
+    ("mp3", None, "mp3", "audio/mpeg"),
+    (None, "audio/ogg", "opus", "audio/ogg"),
+    (None, "audio/flac;q=0.5, audio/mpeg", "mp3", "audio/mpeg"),
+    ("flac", "audio/mpeg", "flac", "audio/flac"),
+])
+def test_tts_endpoint_output_format(client, mock_tts_success, body_format, accept, expected_format, media_type):
+    """Test output format selection by body field and Accept header."""
+    body = {"text": "Hello, world!", "voice": "patrick"}
+    if body_format:
+        body["format"] = body_format
+    headers = {"Accept": accept} if accept else {}
+    
+    with patch('app.api.v1.tts.tts_service.synthesize', new_callable=AsyncMock) as mock_synthesize:
+        mock_synthesize.return_value = mock_tts_success
+        
+        response = client.post("/api/v1/tts", json=body, headers=headers)
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"] == media_type
+    assert mock_synthesize.call_args[1]["output_format"] == expected_format
+
+
+def test_tts_endpoint_rejects_bad_output_options(client):
+    """Test that unknown formats and sample rates are rejected."""
+    response = client.post("/api/v1/tts", json={"text": "Hello", "voice": "patrick", "format": "aac"})
+    assert response.status_code == 422
+    
+    response = client.post("/api/v1/tts", json={"text": "Hello", "voice": "patrick", "sample_rate": 11025})
+    assert response.status_code == 400
+    
+    response = client.post("/api/v1/tts/stream", json={"text": "Hello", "voice": "patrick", "format": "mp3"})
+    assert response.status_code == 400
@@ -1,6 +1,12 @@
 """Tests for ASR service."""
+import io
+import json
+import asyncio
 import pytest
 import base64
+import httpx
+import numpy as np
+import soundfile as sf
 from unittest.mock import AsyncMock, patch
 from httpx import Response
 from app.services.asr_service import ASRService
@@ -137,3 +143,91 @@ async def test_is_available_success(mock_model_server_response_health):
         
         assert result is True
 
+
+
+def _tone(frequency, seconds, sr=16000):
+    t = np.arange(int(seconds * sr)) / sr
+    return (0.3 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+@pytest.mark.asyncio
+async def test_long_form_transcription_fans_out_and_keeps_order():
+    """Test that long audio is split at pauses, transcribed concurrently and stitched in order."""
+    sr = 16000
+    pause = np.zeros(sr, dtype=np.float32)
+    audio = np.concatenate([_tone(200, 20), pause, _tone(400, 20), pause, _tone(800, 20)])
+    buffer = io.BytesIO()
+    sf.write(buffer, audio, sr, format='WAV', subtype='PCM_16')
+    
+    active = 0
+    max_active = 0
+    
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        segment, segment_sr = sf.read(io.BytesIO(base64.b64decode(json.loads(request.content)["audio_base64"])))
+        spectrum = np.abs(np.fft.rfft(segment))
+        frequency = int(round(np.argmax(spectrum) * segment_sr / len(segment), -2))
+        # Later segments answer first, so ordering must come from the stitcher
+        await asyncio.sleep(0.05 * (1000 - frequency) / 200)
+        active -= 1
+        return httpx.Response(200, json={"success": True, "transcription": f"f{frequency}"})
+    
+    service = ASRService()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    
+    with patch.object(service, '_get_client', return_value=client), \
+            patch('app.services.asr_service.settings.ASR_LONG_FORM_ENABLED', True), \
+            patch('app.services.asr_service.settings.ASR_SEGMENT_MAX_SEC', 25.0), \
+            patch('app.services.asr_service.settings.ASR_FANOUT_LIMIT', 2):
+        result = await service.transcribe(buffer.getvalue(), language="en")
+    
+    assert result == "f200 f400 f800"
+    assert max_active == 2
+
+
+@pytest.mark.asyncio
+async def test_long_form_skips_silent_segments():
+    """Test that a segment with no speech is left out instead of failing the request."""
+    sr = 16000
+    pause = np.zeros(sr, dtype=np.float32)
+    audio = np.concatenate([_tone(200, 20), pause, _tone(400, 20), pause, _tone(800, 20)])
+    buffer = io.BytesIO()
+    sf.write(buffer, audio, sr, format='WAV', subtype='PCM_16')
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        segment, segment_sr = sf.read(io.BytesIO(base64.b64decode(json.loads(request.content)["audio_base64"])))
+        spectrum = np.abs(np.fft.rfft(segment))
+        frequency = int(round(np.argmax(spectrum) * segment_sr / len(segment), -2))
+        # The middle segment is noise-only: the model finds no speech in it
+        transcription = "" if frequency == 400 else f"f{frequency}"
+        return httpx.Response(200, json={"success": True, "transcription": transcription})
+    
+    service = ASRService()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    
+    with patch.object(service, '_get_client', return_value=client), \
+            patch('app.services.asr_service.settings.ASR_LONG_FORM_ENABLED', True), \
+            patch('app.services.asr_service.settings.ASR_SEGMENT_MAX_SEC', 25.0):
+        result = await service.transcribe(buffer.getvalue(), language="en")
+    
+    assert result == "f200 f800"
+
+
+@pytest.mark.asyncio
+async def test_short_audio_sent_as_single_request(mock_model_server_response_asr_success):
+    """Test that audio shorter than the segment limit is not split."""
+    buffer = io.BytesIO()
+    sf.write(buffer, _tone(300, 2), 16000, format='WAV', subtype='PCM_16')
+    service = ASRService()
+    
+    with patch.object(service, '_get_client', return_value=AsyncMock()) as mock_get_client:
+        mock_client = AsyncMock()
+        mock_client.post = AsyncMock(return_value=Response(200, json=mock_model_server_response_asr_success))
+        mock_get_client.return_value = mock_client
+        
+        result = await service.transcribe(buffer.getvalue(), language="en")
+    
+    assert result == "This is a test transcription"
+    assert mock_client.post.call_count == 1
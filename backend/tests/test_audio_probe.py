@@ -0,0 +1,117 @@
+"""Tests for header-only audio probing."""
+import io
+import struct
+import numpy as np
+import pytest
+import soundfile as sf
+from unittest.mock import patch
+from app.utils import audio_utils
+from app.utils.audio_probe import probe_audio, sniff_audio_format
+from app.services.audio_service import AudioService
+from app.utils.audio_utils import AudioPipeline, AudioTooLongError, split_audio_for_asr, validate_audio_file
+
+
+@pytest.mark.parametrize("fmt,subtype,expected", [
+    ("WAV", "PCM_16", "wav"),
+    ("FLAC", "PCM_16", "flac"),
+    ("OGG", "VORBIS", "ogg"),
+    ("MP3", "MPEG_LAYER_III", "mp3"),
+])
+def test_probe_soundfile_formats(make_wav_bytes, fmt, subtype, expected):
+    """Test format sniffing and header duration for libsndfile-writable formats."""
+    content = make_wav_bytes(duration_sec=3.0, sample_rate=16000, format=fmt, subtype=subtype)
+    
+    probe = probe_audio(content)
+    
+    assert sniff_audio_format(content) == expected
+    assert probe.format == expected
+    assert probe.duration == pytest.approx(3.0, abs=0.1)
+
+
+def test_mp3_with_leading_junk_accepted(make_wav_bytes):
+    """Test that an MP3 whose first frame follows junk bytes is still detected."""
+    mp3 = make_wav_bytes(duration_sec=3.0, sample_rate=16000, format="MP3", subtype="MPEG_LAYER_III")
+    # Stray 0xFF bytes in the junk must not be taken for a frame sync
+    content = b"\x00\xff\xfb\x90junk" * 64 + mp3
+    
+    is_valid, _ = validate_audio_file(content, "stream.bin")
+    
+    assert sniff_audio_format(content) == "mp3"
+    assert is_valid is True
+    assert probe_audio(content).duration == pytest.approx(3.0, abs=0.1)
+    assert sniff_audio_format(b"\x00" * 8192 + mp3) is None
+
+
+def test_probe_mp4_header():
+    """Test duration is read from the mvhd atom of an M4A file."""
+    mvhd_payload = struct.pack(">B3xII", 0, 0, 0) + struct.pack(">II", 44100, 44100 * 12) + b"\x00" * 80
+    mvhd = struct.pack(">I4s", 8 + len(mvhd_payload), b"mvhd") + mvhd_payload
+    moov = struct.pack(">I4s", 8 + len(mvhd), b"moov") + mvhd
+    ftyp = struct.pack(">I4s4sI", 16, b"ftyp", b"M4A ", 0)
+    
+    probe = probe_audio(ftyp + moov)
+    
+    assert probe.format == "m4a"
+    assert probe.duration == pytest.approx(12.0)
+
+
+def test_probe_webm_without_duration():
+    """Test that WebM without a stored duration reports None."""
+    # EBML header, then a Segment of unknown size containing only a Cluster
+    content = b"\x1a\x45\xdf\xa3\x80" + b"\x18\x53\x80\x67\x01\xff\xff\xff\xff\xff\xff\xff" + b"\x1f\x43\xb6\x75\x80"
+    
+    probe = probe_audio(content)
+    
+    assert probe.format == "webm"
+    assert probe.duration is None
+
+
+def test_validate_audio_file_ignores_extension(make_wav_bytes):
+    """Test that the format is sniffed from content rather than the filename."""
+    is_valid, _ = validate_audio_file(make_wav_bytes(), "recording.bin")
+    assert is_valid is True
+    
+    is_valid, error_msg = validate_audio_file(b"not audio at all", "test.wav")
+    assert is_valid is False
+    assert "Unsupported file format" in error_msg
+
+
+def test_duration_rejected_from_header(make_wav_bytes):
+    """Test that over-long audio is rejected without decoding."""
+    pipeline = AudioPipeline(make_wav_bytes(duration_sec=2.0), "test.wav")
+    
+    with patch.object(audio_utils.settings, 'MAX_AUDIO_DURATION_SEC', 1), \
+            patch.object(audio_utils.librosa, 'load') as mock_load:
+        is_valid, error_msg = pipeline.validate_duration()
+    
+    assert is_valid is False
+    mock_load.assert_not_called()
+
+
+def test_decoded_duration_rejected_when_header_understates():
+    """Test that an MP3 whose Xing frame count understates its length is still rejected."""
+    buffer = io.BytesIO()
+    sf.write(buffer, np.full(16000 * 3, 0.1, dtype=np.float32), 16000, format="MP3")
+    content = bytearray(buffer.getvalue())
+    xing = content.find(b"Xing")
+    assert xing > 0
+    # Claim 10 frames (0.36 s) instead of about 3 s
+    content[xing + 8:xing + 12] = struct.pack(">I", 10)
+    content = bytes(content)
+    
+    # libsndfile stops at the Xing frame count; decoders that read every
+    # frame (audioread, ffmpeg) return the full 3 s
+    full_decode = (np.full(16000 * 3, 0.1, dtype=np.float32), 16000)
+    with patch.object(audio_utils.settings, 'MAX_AUDIO_DURATION_SEC', 1), \
+            patch.object(audio_utils.librosa, 'load', return_value=full_decode):
+        pipeline = AudioPipeline(content, "test.mp3")
+        assert pipeline.probe.duration < 1
+        assert pipeline.validate_duration() == (True, None)
+        
+        is_valid, error_msg, processed = AudioService.validate_and_process_audio(content, "test.mp3")
+        with pytest.raises(AudioTooLongError):
+            split_audio_for_asr(content, 0.2, 300)
+    
+    assert is_valid is False
+    assert "duration" in error_msg
+    assert processed is None
@@ -0,0 +1,62 @@
+"""Tests for audio processing service."""
+import pytest
+from unittest.mock import patch
+from app.services.audio_service import AudioService, processed_audio_cache, processed_audio_cache_key
+
+
+@pytest.mark.asyncio
+async def test_repeat_upload_served_from_cache(make_wav_bytes):
+    """Test that an identical upload skips processing on the second request."""
+    service = AudioService()
+    processed_audio_cache.clear()
+    wav_bytes = make_wav_bytes(duration_sec=0.5, sample_rate=22050)
+    
+    with patch.object(AudioService, 'validate_and_process_audio', wraps=AudioService.validate_and_process_audio) as mock_process:
+        first = await service.validate_and_process_audio_async(wav_bytes, "test.wav")
+        second = await service.validate_and_process_audio_async(wav_bytes, "retry.wav")
+    
+    assert mock_process.call_count == 1
+    assert first == second
+    assert first[0] is True
+    assert processed_audio_cache.stats()["hits"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_cache_key_includes_processing_parameters(make_wav_bytes):
+    """Test that uploads processed with different parameters are cached separately."""
+    service = AudioService()
+    processed_audio_cache.clear()
+    wav_bytes = make_wav_bytes(duration_sec=0.5)
+    
+    with patch.object(AudioService, 'validate_and_process_audio', wraps=AudioService.validate_and_process_audio) as mock_process:
+        await service.validate_and_process_audio_async(wav_bytes, "test.wav")
+        with patch('app.services.audio_service.settings.NOISE_SUPPRESSION_ENABLED', False):
+            await service.validate_and_process_audio_async(wav_bytes, "test.wav")
+    
+    assert mock_process.call_count == 2
+
+
+@pytest.mark.parametrize("setting, value", [
+    ("NOISE_SUPPRESSION_STREAMING", False),
+    ("NOISE_SUPPRESSION_BLOCK_SEC", 10.0),
+    ("NOISE_SUPPRESSION_OVERLAP_SEC", 0.5),
+    ("NOISE_SUPPRESSION_CONTEXT_SEC", 3.0),
+])
+def test_cache_key_includes_streaming_denoise_settings(setting, value):
+    """Test that changing how long audio is denoised block-wise changes the cache key."""
+    before = processed_audio_cache_key(b"audio", True)
+    
+    with patch(f'app.services.audio_service.settings.{setting}', value):
+        assert processed_audio_cache_key(b"audio", True) != before
+
+
+@pytest.mark.asyncio
+async def test_invalid_upload_not_cached():
+    """Test that rejected uploads are not cached."""
+    service = AudioService()
+    processed_audio_cache.clear()
+    
+    is_valid, error_msg, _ = await service.validate_and_process_audio_async(b"not audio", "test.wav")
+    
+    assert is_valid is False
+    assert len(processed_audio_cache) == 0
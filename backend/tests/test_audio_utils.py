@@ -0,0 +1,242 @@
+"""Tests for audio processing utilities."""
+import io
+import numpy as np
+import pytest
+import soundfile as sf
+from unittest.mock import MagicMock, patch
+from app.utils import audio_utils
+from app.utils.audio_utils import AudioPipeline, ASR_SAMPLE_RATE, reduce_noise, _overlap_add
+from app.services.audio_service import AudioService
+from app.utils.lazy_import import is_loaded
+
+
+def test_pipeline_decodes_once(make_wav_bytes):
+    """Test that duration check, resample and encode share a single decode."""
+    wav_bytes = make_wav_bytes(duration_sec=2.0, sample_rate=44100)
+    
+    with patch.object(audio_utils.librosa, 'load', wraps=audio_utils.librosa.load) as mock_load, \
+            patch.object(audio_utils.settings, 'VAD_ENABLED', False):
+        is_valid, error_msg, processed = AudioService.validate_and_process_audio(
+            wav_bytes,
+            "test.wav",
+            apply_noise_reduction=True
+        )
+        
+        assert is_valid is True
+        assert error_msg is None
+        assert mock_load.call_count == 1
+    
+    data, sr = sf.read(io.BytesIO(processed))
+    assert sr == ASR_SAMPLE_RATE
+    assert abs(len(data) / sr - 2.0) < 0.01
+
+
+def test_pipeline_duration(make_wav_bytes):
+    """Test duration from decoded samples."""
+    pipeline = AudioPipeline(make_wav_bytes(duration_sec=1.5, sample_rate=22050), "test.wav")
+    assert abs(pipeline.duration - 1.5) < 0.01
+
+
+def test_pipeline_duration_exceeded(make_wav_bytes):
+    """Test that audio longer than the limit is rejected."""
+    pipeline = AudioPipeline(make_wav_bytes(duration_sec=2.0), "test.wav")
+    
+    with patch.object(audio_utils.settings, 'MAX_AUDIO_DURATION_SEC', 1):
+        is_valid, error_msg = pipeline.validate_duration()
+    
+    assert is_valid is False
+    assert "duration" in error_msg
+
+
+def test_pipeline_undecodable_passthrough():
+    """Test that undecodable input is passed through unchanged."""
+    pipeline = AudioPipeline(b"not_audio_data", "test.wav")
+    
+    assert pipeline.duration == 0.0
+    assert pipeline.process_for_asr() == b"not_audio_data"
+
+
+def test_overlap_add_identity():
+    """Test that block stitching reconstructs the input exactly."""
+    y = np.random.default_rng(0).standard_normal(10007).astype(np.float32)
+    
+    output = _overlap_add(y, block=1000, overlap=300, context=200, process_block=lambda b: b.copy())
+    
+    assert output.dtype == np.float32
+    assert np.allclose(output, y, atol=1e-6)
+
+
+def test_streaming_noise_suppression_matches_whole_signal():
+    """Test that block-wise denoising is equivalent to the stationary whole-signal path."""
+    if not audio_utils.has_noisereduce():
+        pytest.skip("noisereduce not available")
+    
+    sr = 16000
+    t = np.arange(30 * sr) / sr
+    speech = 0.3 * np.sin(2 * np.pi * 220 * t) * (np.sin(2 * np.pi * 0.3 * t) > 0)
+    noise = 0.05 * np.random.default_rng(0).standard_normal(len(t))
+    y = (speech + noise).astype(np.float32)
+    
+    with patch.object(audio_utils.settings, 'NOISE_SUPPRESSION_STATIONARY', True):
+        whole = reduce_noise(y, sr, streaming=False)
+        streamed = reduce_noise(y, sr, streaming=True, block_sec=5.0, overlap_sec=0.5, context_sec=6.0)
+    
+    assert streamed.shape == whole.shape
+    snr_db = 10 * np.log10(np.sum(whole ** 2) / np.sum((whole - streamed) ** 2))
+    assert snr_db > 20
+
+
+@pytest.mark.parametrize("stationary", [False, True])
+def test_streaming_noise_suppression_shares_noise_profile(stationary):
+    """Test that every block is gated against the same whole-signal noise profile."""
+    sr = 16000
+    y = np.random.default_rng(0).standard_normal(30 * sr).astype(np.float32)
+    mock_nr = MagicMock()
+    mock_nr.reduce_noise.side_effect = lambda y, sr, **kwargs: y
+    
+    with patch.object(audio_utils, 'nr', mock_nr), \
+         patch.object(audio_utils.settings, 'NOISE_SUPPRESSION_STATIONARY', stationary):
+        reduce_noise(y, sr, streaming=True, block_sec=5.0, overlap_sec=0.5, context_sec=1.0)
+    
+    calls = mock_nr.reduce_noise.call_args_list
+    assert len(calls) > 1
+    profile = calls[0].kwargs["y_noise"]
+    assert len(profile) > 0
+    assert all(call.kwargs["stationary"] is True for call in calls)
+    assert all(call.kwargs["y_noise"] is profile for call in calls)
+
+
+def test_canonical_wav_forwarded_untouched(make_wav_bytes):
+    """Test that 16 kHz mono PCM WAV skips decode when no denoising is needed."""
+    wav_bytes = make_wav_bytes(duration_sec=1.0, sample_rate=16000)
+    
+    with patch.object(audio_utils.librosa, 'load') as mock_load, \
+            patch.object(audio_utils, '_decode_canonical_wav') as mock_decode:
+        processed = AudioPipeline(wav_bytes, "test.wav").process_for_asr(apply_noise_suppression=False)
+        converted = audio_utils.convert_audio_to_wav(wav_bytes)
+    
+    assert processed is wav_bytes
+    assert converted is wav_bytes
+    mock_load.assert_not_called()
+    mock_decode.assert_not_called()
+
+
+def test_canonical_wav_decoded_from_buffer(make_wav_bytes):
+    """Test that canonical WAV samples are read without librosa."""
+    wav_bytes = make_wav_bytes(duration_sec=1.0, sample_rate=16000)
+    expected, _ = sf.read(io.BytesIO(wav_bytes), dtype='float32')
+    pipeline = AudioPipeline(wav_bytes, "test.wav")
+    
+    with patch.object(audio_utils.librosa, 'load') as mock_load:
+        assert pipeline.decode() is True
+    
+    mock_load.assert_not_called()
+    assert pipeline.sample_rate == ASR_SAMPLE_RATE
+    assert np.allclose(pipeline.samples, expected)
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"sample_rate": 44100},
+    {"channels": 2},
+    {"subtype": "FLOAT"},
+])
+def test_non_canonical_wav_detected(make_wav_bytes, kwargs):
+    """Test that other WAV layouts are not treated as canonical."""
+    assert audio_utils.is_canonical_asr_wav(make_wav_bytes(**kwargs)) is False
+
+
+def _speech_like(seconds, sr=16000, seed=0):
+    """Voiced tone with light background noise."""
+    t = np.arange(int(seconds * sr)) / sr
+    return (0.3 * np.sin(2 * np.pi * 180 * t) + 0.002 * np.random.default_rng(seed).standard_normal(len(t))).astype(np.float32)
+
+
+def _silence(seconds, sr=16000, seed=1):
+    """Low-level background noise."""
+    return (0.002 * np.random.default_rng(seed).standard_normal(int(seconds * sr))).astype(np.float32)
+
+
+def test_vad_trims_leading_trailing_and_long_internal_silence():
+    """Test that VAD keeps speech plus padding and drops long silences."""
+    sr = 16000
+    y = np.concatenate([_silence(1.0), _speech_like(2.0), _silence(3.0), _speech_like(2.0), _silence(1.0)])
+    
+    segments = audio_utils.detect_speech_segments(y, sr, pad_ms=200, min_silence_ms=600)
+    trimmed, ratio = audio_utils.trim_silence(y, sr)
+    
+    assert len(segments) == 2
+    assert segments[0][0] == pytest.approx(0.8 * sr, abs=0.05 * sr)
+    assert segments[1][1] == pytest.approx(8.2 * sr, abs=0.05 * sr)
+    assert len(trimmed) / sr == pytest.approx(4.8, abs=0.1)
+    assert ratio == pytest.approx(1 - 4.8 / 9.0, abs=0.02)
+
+
+def test_vad_keeps_short_pauses():
+    """Test that pauses shorter than the minimum silence are not cut."""
+    sr = 16000
+    y = np.concatenate([_speech_like(1.0), _silence(0.3), _speech_like(1.0)])
+    
+    segments = audio_utils.detect_speech_segments(y, sr, min_silence_ms=600)
+    
+    assert segments == [(0, len(y))]
+
+
+def test_vad_without_speech_returns_input():
+    """Test that audio with no detected speech is left unchanged."""
+    y = np.zeros(16000, dtype=np.float32)
+    
+    trimmed, ratio = audio_utils.trim_silence(y, 16000)
+    
+    assert trimmed is y
+    assert ratio == 0.0
+
+
+def test_pipeline_reports_trimmed_ratio():
+    """Test that the VAD stage reports the trimmed ratio in metrics."""
+    sr = 16000
+    buffer = io.BytesIO()
+    sf.write(buffer, np.concatenate([_silence(2.0), _speech_like(2.0)]), sr, format='WAV', subtype='PCM_16')
+    before = audio_utils.metrics.snapshot()["summaries"].get("asr.vad.trimmed_ratio", {}).get("count", 0)
+    
+    pipeline = AudioPipeline(buffer.getvalue(), "test.wav")
+    with patch.object(audio_utils.settings, 'VAD_ENABLED', True):
+        processed = pipeline.process_for_asr(apply_noise_suppression=False)
+    
+    assert pipeline.trimmed_ratio > 0.4
+    assert len(sf.read(io.BytesIO(processed))[0]) < 3 * sr
+    assert audio_utils.metrics.snapshot()["summaries"]["asr.vad.trimmed_ratio"]["count"] == before + 1
+
+
+def test_split_points_prefer_pauses():
+    """Test that long audio is cut inside pauses and segments respect the limit."""
+    sr = 16000
+    y = np.concatenate([_speech_like(8.0), _silence(1.0), _speech_like(8.0), _silence(1.0), _speech_like(8.0)])
+    
+    cuts = audio_utils.find_split_points(y, sr, max_segment_sec=12.0, min_pause_ms=300)
+    
+    assert len(cuts) == 2
+    assert cuts[0] == pytest.approx(8.5 * sr, abs=0.1 * sr)
+    assert cuts[1] == pytest.approx(17.5 * sr, abs=0.1 * sr)
+
+
+def test_split_without_pauses_respects_limit():
+    """Test that audio without pauses is still cut into bounded segments."""
+    sr = 16000
+    y = _speech_like(25.0)
+    
+    cuts = audio_utils.find_split_points(y, sr, max_segment_sec=10.0, min_pause_ms=300)
+    bounds = [0] + cuts + [len(y)]
+    
+    assert all(end - start <= 10 * sr for start, end in zip(bounds, bounds[1:]))
+
+
+def test_audio_libraries_load_on_first_use(make_wav_bytes):
+    """Test that the pipeline imports its audio libraries on demand."""
+    wav_bytes = make_wav_bytes(duration_sec=1.0, sample_rate=22050)
+    
+    pipeline = AudioPipeline(wav_bytes, "test.wav")
+    
+    assert pipeline.decode()
+    assert pipeline.sample_rate == 22050
+    assert len(pipeline.samples) == 22050
+    assert is_loaded(audio_utils.librosa)
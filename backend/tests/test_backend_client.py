@@ -0,0 +1,294 @@
+"""Tests for load-balanced access to model server replicas."""
+import base64
+import asyncio
+import httpx
+import pytest
+from collections import Counter, deque
+from unittest.mock import patch
+from app.core.concurrency import AdaptiveLimiter
+from app.core.exceptions import BackendUnavailableError, ServiceOverloadedError
+from app.services.backend_client import CIRCUIT_CLOSED, CIRCUIT_OPEN, BackendClient
+from app.services.tts_service import TTSService
+
+
+class StubReplicas:
+    """Several stub LitServe servers behind one mock transport, keyed by host."""
+    
+    def __init__(self, latencies, wav_bytes=b"RIFF"):
+        self.latencies = dict(latencies)
+        self.failing = set()
+        self.unreachable = set()
+        self.calls = Counter()
+        self.audio_base64 = base64.b64encode(wav_bytes).decode("utf-8")
+    
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        if host in self.unreachable:
+            raise httpx.ConnectError("connection refused", request=request)
+        if request.url.path.endswith("/health"):
+            healthy = host not in self.failing
+            return httpx.Response(200 if healthy else 503, json={"status": "healthy" if healthy else "unhealthy"})
+        self.calls[host] += 1
+        await asyncio.sleep(self.latencies[host])
+        if host in self.failing:
+            return httpx.Response(503, json={"detail": "Model not loaded"})
+        return httpx.Response(200, json={"success": True, "audio_base64": self.audio_base64, "transcription": "ok"})
+    
+    def client(self):
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+    
+    @property
+    def urls(self):
+        return [f"http://{host}/predict" for host in self.latencies]
+
+
+@pytest.mark.asyncio
+async def test_routes_to_faster_replica():
+    """Test that most calls go to the replica with lower latency."""
+    stubs = StubReplicas({"fast": 0.005, "slow": 0.05})
+    backend = BackendClient(stubs.urls)
+    
+    async with stubs.client() as client:
+        for _ in range(3):
+            await asyncio.gather(*[backend.post(client, "/predict", json={}) for _ in range(8)])
+    
+    assert stubs.calls["fast"] > stubs.calls["slow"]
+    replicas = backend.stats()["replicas"]
+    assert replicas["http://fast/predict"]["ewma_latency_ms"] < replicas["http://slow/predict"]["ewma_latency_ms"]
+
+
+@pytest.mark.asyncio
+async def test_spreads_outstanding_requests():
+    """Test that concurrent calls are spread by in-flight count."""
+    stubs = StubReplicas({"a": 0.02, "b": 0.02, "c": 0.02})
+    backend = BackendClient(stubs.urls)
+    
+    async with stubs.client() as client:
+        await asyncio.gather(*[backend.post(client, "/predict", json={}) for _ in range(9)])
+    
+    assert sorted(stubs.calls.values()) == [3, 3, 3]
+    assert all(replica.in_flight == 0 for replica in backend.replicas)
+
+
+@pytest.mark.asyncio
+async def test_ejects_failing_replica_and_reprobes():
+    """Test that a failing replica is taken out of rotation and returns once healthy."""
+    stubs = StubReplicas({"good": 0.001, "bad": 0.001})
+    stubs.failing.add("bad")
+    backend = BackendClient(stubs.urls, failure_threshold=2, eject_sec=0.02)
+    
+    async with stubs.client() as client:
+        for _ in range(10):
+            await backend.post(client, "/predict", json={})
+        bad = backend.replicas[1]
+        assert bad.state == CIRCUIT_OPEN
+        assert stubs.calls["bad"] == 2
+        
+        stubs.calls.clear()
+        for _ in range(5):
+            await backend.post(client, "/predict", json={})
+        assert stubs.calls["bad"] == 0
+        
+        stubs.failing.clear()
+        await asyncio.sleep(0.1)
+        # Healthy again: half-open until a trial request succeeds
+        for _ in range(5):
+            await backend.post(client, "/predict", json={})
+        assert bad.state == CIRCUIT_CLOSED
+        assert stubs.calls["bad"] > 0
+        await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_fails_fast_when_all_circuits_open():
+    """Test that calls fail fast once every replica's circuit is open."""
+    stubs = StubReplicas({"only": 0.001})
+    stubs.failing.add("only")
+    backend = BackendClient(stubs.urls, failure_threshold=2, eject_sec=0.05)
+    
+    async with stubs.client() as client:
+        for _ in range(2):
+            response = await backend.post(client, "/predict", json={})
+            assert response.status_code == 503
+        
+        with pytest.raises(BackendUnavailableError):
+            await backend.post(client, "/predict", json={})
+        assert stubs.calls["only"] == 2
+        
+        # The trial request after a good health probe fails: the circuit reopens
+        stubs.failing.discard("only")
+        await asyncio.sleep(0.08)
+        stubs.failing.add("only")
+        await backend.post(client, "/predict", json={})
+        assert backend.replicas[0].state == CIRCUIT_OPEN
+        assert backend.stats()["fast_failures"] == 1
+        await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_application_errors_do_not_open_circuit():
+    """Test that 500s caused by bad requests keep the only replica in rotation."""
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(500, json={"detail": "Could not decode audio"})
+    
+    backend = BackendClient(["http://only/predict"], failure_threshold=2)
+    
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        for _ in range(5):
+            response = await backend.post(client, "/predict", json={})
+            assert response.status_code == 500
+    
+    assert backend.replicas[0].state == CIRCUIT_CLOSED
+    assert backend.replicas[0].consecutive_failures == 0
+
+
+@pytest.mark.asyncio
+async def test_connect_error_retries_other_replica():
+    """Test that a call that cannot connect is sent to another replica."""
+    stubs = StubReplicas({"down": 0.001, "up": 0.001})
+    stubs.unreachable.add("down")
+    backend = BackendClient(stubs.urls)
+    
+    async with stubs.client() as client:
+        for _ in range(4):
+            response = await backend.post(client, "/predict", json={})
+            assert response.status_code == 200
+        
+        stubs.unreachable.add("up")
+        with pytest.raises(httpx.ConnectError):
+            await backend.post(client, "/predict", json={})
+    
+    assert stubs.calls["up"] == 4
+
+
+@pytest.mark.asyncio
+async def test_tts_service_uses_replicas(make_wav_bytes):
+    """Test that TTS requests are balanced across replicas."""
+    wav_bytes = make_wav_bytes(duration_sec=0.2)
+    stubs = StubReplicas({"gpu-1": 0.01, "gpu-2": 0.01}, wav_bytes=wav_bytes)
+    service = TTSService()
+    service.backend = BackendClient(stubs.urls)
+    
+    async with stubs.client() as client:
+        with patch.object(service, '_get_client', return_value=client):
+            results = await asyncio.gather(*[
+                service.synthesize(text=f"Sentence number {i}.", voice="patrick") for i in range(6)
+            ])
+    
+    assert all(result == wav_bytes for result in results)
+    assert stubs.calls["gpu-1"] == stubs.calls["gpu-2"] == 3
+
+
+@pytest.mark.asyncio
+async def test_hedges_stalled_replica():
+    """Test that a call to a stalled replica is duplicated and the loser cancelled."""
+    stubs = StubReplicas({"a": 0.005, "b": 0.005})
+    backend = BackendClient(stubs.urls, hedge_enabled=True, hedge_min_delay_sec=0.01, hedge_max_ratio=0.5)
+    
+    async with stubs.client() as client:
+        for _ in range(25):
+            await backend.post(client, "/predict", json={})
+        assert backend.hedge_delay("/predict") is not None
+        
+        # Replica "a" stalls (e.g. a GC pause): its calls get hedged to "b"
+        stubs.latencies["a"] = 5.0
+        backend.replicas[0].ewma_latency = 0.0
+        start = asyncio.get_running_loop().time()
+        for _ in range(3):
+            response = await backend.post(client, "/predict", json={})
+            assert response.status_code == 200
+        elapsed = asyncio.get_running_loop().time() - start
+    
+    stats = backend.stats()
+    assert elapsed < 1.0
+    assert stats["hedging"]["hedges"] >= 1
+    assert stats["hedging"]["hedge_wins"] >= 1
+    assert 0 < stats["hedging"]["hedge_rate"] <= 0.5
+    assert all(replica.in_flight == 0 for replica in backend.replicas)
+
+
+@pytest.mark.asyncio
+async def test_hedge_prefers_success_when_both_finish_together():
+    """Test that a good response wins even if the failed request completes in the same round."""
+    backend = BackendClient(["http://a/predict", "http://b/predict"], hedge_enabled=True, hedge_min_delay_sec=0.01, hedge_max_ratio=1.0)
+    primary, backup = backend.replicas
+    backend._latencies["/predict"] = deque([0.001] * 20)
+    release = asyncio.Event()
+    
+    async def post_to(replica, client, path, latency_key, update_latency, **kwargs):
+        await release.wait()
+        return httpx.Response(500 if replica is primary else 200, request=httpx.Request("POST", replica.url))
+    
+    for attempt in range(1, 6):
+        release.clear()
+        with patch.object(backend, 'pick', side_effect=[primary, backup]), \
+                patch.object(backend, '_post_to', side_effect=post_to):
+            call = asyncio.ensure_future(backend.post(None, "/predict", json={}))
+            while backend._hedges < attempt:
+                await asyncio.sleep(0.005)
+            await asyncio.sleep(0)
+            # Both requests finish in the same event loop iteration
+            release.set()
+            response = await call
+        assert response.status_code == 200
+    assert backend.stats()["hedging"]["hedge_wins"] == 5
+
+
+@pytest.mark.asyncio
+async def test_hedge_latency_kept_per_operation():
+    """Test that TTS and ASR calls to the same path keep separate hedge delays."""
+    stubs = StubReplicas({"a": 0.001, "b": 0.001})
+    backend = BackendClient(stubs.urls, hedge_enabled=True)
+    
+    async with stubs.client() as client:
+        for _ in range(25):
+            await backend.post(client, "/predict", operation="asr", json={})
+    
+    assert backend.hedge_delay("asr") is not None
+    assert backend.hedge_delay("tts") is None
+    assert "/predict" not in backend._latencies
+    assert set(backend.stats()["hedging"]["delay_sec"]) == {"asr"}
+
+
+@pytest.mark.asyncio
+async def test_hedging_respects_budget():
+    """Test that no more than hedge_max_ratio of calls are hedged."""
+    stubs = StubReplicas({"a": 0.001, "b": 0.001})
+    backend = BackendClient(stubs.urls, hedge_enabled=True, hedge_min_delay_sec=0.0, hedge_max_ratio=0.1)
+    
+    async with stubs.client() as client:
+        for _ in range(20):
+            await backend.post(client, "/predict", json={})
+        stubs.latencies.update({"a": 0.02, "b": 0.02})
+        for _ in range(20):
+            await backend.post(client, "/predict", json={})
+    
+    assert backend.stats()["hedging"]["hedges"] <= 0.1 * 40
+
+
+@pytest.mark.asyncio
+async def test_backend_client_admission_control():
+    """Test that the backend client holds calls to the limit and health checks bypass it."""
+    stubs = StubReplicas({"a": 0.02, "b": 0.02})
+    limiter = AdaptiveLimiter("backend_test", initial_limit=2, min_limit=2, max_limit=2, max_queue=2)
+    backend = BackendClient(stubs.urls, limiter=limiter)
+    peak = 0
+    
+    async def call():
+        nonlocal peak
+        response = backend.post(client, "/predict", json={})
+        task = asyncio.ensure_future(response)
+        await asyncio.sleep(0.005)
+        peak = max(peak, sum(replica.in_flight for replica in backend.replicas))
+        return await task
+    
+    async with stubs.client() as client:
+        results = await asyncio.gather(*[call() for _ in range(5)], return_exceptions=True)
+        health = await backend.post(client, "/health", update_latency=False, hedge=False, admit=False, json={})
+    
+    shed = [result for result in results if isinstance(result, ServiceOverloadedError)]
+    assert len(shed) == 1 and shed[0].status_code == 429
+    assert sum(stubs.calls.values()) == 4
+    assert peak <= 2
+    assert health.status_code == 200
+    assert backend.stats()["concurrency"]["in_flight"] == 0
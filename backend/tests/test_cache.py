@@ -0,0 +1,51 @@
+"""Tests for in-memory caching utilities."""
+from app.utils.cache import LRUCache
+
+
+def test_get_set_and_counters():
+    """Test hit and miss accounting."""
+    cache = LRUCache(max_bytes=100)
+    
+    assert cache.get("a") is None
+    cache.set("a", b"12345")
+    assert cache.get("a") == b"12345"
+    
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["bytes"] == 5
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_evicts_least_recently_used_by_size():
+    """Test that the byte budget evicts the least recently used entry."""
+    cache = LRUCache(max_bytes=10)
+    cache.set("a", b"aaaa")
+    cache.set("b", b"bbbb")
+    cache.get("a")
+    
+    cache.set("c", b"cccc")
+    
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] == 8
+
+
+def test_rejects_oversized_value():
+    """Test that a value larger than the budget is not stored."""
+    cache = LRUCache(max_bytes=4)
+    
+    assert cache.set("a", b"too large") is False
+    assert len(cache) == 0
+
+
+def test_clear():
+    """Test clearing the cache."""
+    cache = LRUCache(max_bytes=100)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    
+    assert cache.clear() == 2
+    assert cache.stats()["bytes"] == 0
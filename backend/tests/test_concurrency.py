@@ -0,0 +1,130 @@
+"""Tests for adaptive concurrency limiting and admission control."""
+import asyncio
+import pytest
+from app.core.concurrency import AdaptiveLimiter
+from app.core.exceptions import ServiceOverloadedError
+from app.core.metrics import metrics
+
+
+@pytest.mark.asyncio
+async def test_limits_concurrency_and_queues_in_order():
+    """Test that calls beyond the limit wait and are admitted first in, first out."""
+    limiter = AdaptiveLimiter("test", initial_limit=2, min_limit=1, max_limit=2)
+    admitted = []
+    
+    async def call(index):
+        await limiter.acquire()
+        admitted.append(index)
+        await asyncio.sleep(0.01)
+        limiter.release(0.01)
+    
+    tasks = [asyncio.ensure_future(call(index)) for index in range(6)]
+    await asyncio.sleep(0)
+    assert limiter.in_flight == 2
+    assert limiter.stats()["queue_depth"] == 4
+    
+    await asyncio.gather(*tasks)
+    assert admitted == list(range(6))
+    assert limiter.in_flight == 0
+    assert limiter.stats()["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_sheds_when_queue_is_full():
+    """Test that a call finding the queue full is rejected with 429."""
+    limiter = AdaptiveLimiter("test", initial_limit=1, min_limit=1, max_queue=1)
+    await limiter.acquire()
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    
+    with pytest.raises(ServiceOverloadedError) as exc_info:
+        await limiter.acquire()
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.retry_after >= 1
+    
+    limiter.release(0.01)
+    await waiter
+    assert limiter.in_flight == 1
+    assert limiter.stats()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sheds_after_max_queue_time():
+    """Test that a call waiting longer than max_queue_sec is rejected with 503."""
+    limiter = AdaptiveLimiter("test", initial_limit=1, min_limit=1, max_queue_sec=0.02)
+    await limiter.acquire()
+    
+    with pytest.raises(ServiceOverloadedError) as exc_info:
+        await limiter.acquire()
+    assert exc_info.value.status_code == 503
+    assert limiter.stats()["queue_timeouts"] == 1
+    
+    # The abandoned wait does not take the next free slot
+    limiter.release(0.01)
+    assert limiter.in_flight == 0
+    await limiter.acquire()
+    assert limiter.in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    """Test that a cancelled waiter gives up its place without leaking a slot."""
+    limiter = AdaptiveLimiter("test", initial_limit=1, min_limit=1)
+    await limiter.acquire()
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert limiter.stats()["queue_depth"] == 0
+    
+    limiter.release(0.01)
+    assert limiter.in_flight == 0
+
+
+def test_limit_grows_while_latency_is_steady():
+    """Test that a fully used limit grows while latency does not rise."""
+    limiter = AdaptiveLimiter("test", initial_limit=4, min_limit=1, max_limit=20)
+    for _ in range(50):
+        limiter.in_flight = int(limiter.limit) + 1
+        limiter.release(0.05)
+    assert limiter.limit == 20
+
+
+def test_limit_does_not_grow_when_unused():
+    """Test that the limit stays put while most of it is idle."""
+    limiter = AdaptiveLimiter("test", initial_limit=8, min_limit=1, max_limit=20)
+    for _ in range(50):
+        limiter.in_flight = 1
+        limiter.release(0.05)
+    assert limiter.limit == 8
+
+
+def test_limit_shrinks_when_latency_rises():
+    """Test that the limit shrinks as backend latency climbs."""
+    limiter = AdaptiveLimiter("test", initial_limit=16, min_limit=2, max_limit=20)
+    for _ in range(20):
+        limiter.in_flight = int(limiter.limit) + 1
+        limiter.release(0.05)
+    steady = limiter.limit
+    
+    for _ in range(20):
+        limiter.in_flight = int(limiter.limit) + 1
+        limiter.release(0.5)
+    assert limiter.limit < steady * 0.6
+
+
+def test_limit_backs_off_on_failures():
+    """Test that failed calls cut the limit down to its floor."""
+    limiter = AdaptiveLimiter("test", initial_limit=10, min_limit=3, max_limit=20)
+    limiter.in_flight = 1
+    limiter.release(dropped=True)
+    assert limiter.limit == pytest.approx(9.0)
+    
+    for _ in range(30):
+        limiter.in_flight = 1
+        limiter.release(dropped=True)
+    assert limiter.limit == 3
+    assert metrics.snapshot()["gauges"]["concurrency.test.limit"] == 3
+
@@ -36,3 +36,23 @@ def test_cors_origins_split():
         assert "http://localhost:3000" in origins
         assert "http://localhost:5173" in origins
 
+
+def test_tts_long_form_disabled_by_default():
+    """Test that sentence-by-sentence synthesis of long text is opt-in."""
+    with patch.dict(os.environ, {}, clear=True):
+        settings = Settings(_env_file=None)
+        assert settings.TTS_LONG_FORM_ENABLED is False
+
+
+def test_asr_long_form_disabled_by_default():
+    """Test that splitting long audio for ASR is opt-in."""
+    with patch.dict(os.environ, {}, clear=True):
+        settings = Settings(_env_file=None)
+        assert settings.ASR_LONG_FORM_ENABLED is False
+
+
+def test_vad_disabled_by_default():
+    """Test that silence trimming before ASR is opt-in."""
+    with patch.dict(os.environ, {}, clear=True):
+        settings = Settings(_env_file=None)
+        assert settings.VAD_ENABLED is False
@@ -0,0 +1,79 @@
+"""Tests for demo catalog pre-rendering."""
+import base64
+import pytest
+from unittest.mock import AsyncMock, patch
+from httpx import Response
+from app.services.demo_prerender import DemoPrerenderer, build_demo_catalog
+from app.services.tts_service import TTSService
+
+
+@pytest.fixture
+def service(make_wav_bytes):
+    """Create a TTS service backed by a mocked model server."""
+    service = TTSService()
+    audio_base64 = base64.b64encode(make_wav_bytes(duration_sec=0.2)).decode("utf-8")
+    mock_client = AsyncMock()
+    mock_client.post = AsyncMock(return_value=Response(200, json={"success": True, "audio_base64": audio_base64}))
+    with patch.object(service, '_get_client', return_value=mock_client):
+        yield service
+
+
+def test_catalog_pairs_examples_with_voices():
+    """Test that every example is paired with the voices of its language."""
+    catalog = build_demo_catalog()
+    
+    english = [entry for entry in catalog if entry["language"] == "en"]
+    assert len(english) == 3 * 2
+    # Marathi examples use the legacy "ma" code but map to the "mr" voices
+    assert {entry["voice"] for entry in catalog if entry["language"] == "mr"} == {"kabir", "neha"}
+    assert not [entry for entry in catalog if entry["language"] == "ma"]
+
+
+@pytest.mark.asyncio
+async def test_prerender_serves_demo_traffic_from_cache(service):
+    """Test that pre-rendered entries are served without the backend."""
+    prerenderer = DemoPrerenderer(service, refresh_interval_sec=3600, concurrency=4)
+    mock_client = await service._get_client()
+    
+    summary = await prerenderer.render_once()
+    backend_calls = mock_client.post.call_count
+    
+    assert summary["rendered"] == len(build_demo_catalog())
+    assert summary["failed"] == 0
+    assert backend_calls == summary["rendered"]
+    
+    entry = build_demo_catalog()[0]
+    assert await service.synthesize(text=entry["text"], voice=entry["voice"], language=entry["language"]) is not None
+    assert mock_client.post.call_count == backend_calls
+    
+    status = prerenderer.snapshot()
+    assert status["coverage"] == 1.0
+    assert status["stale"] == 0
+    
+    # Nothing is missing or stale, so a second run renders nothing
+    assert (await prerenderer.render_once())["rendered"] == 0
+
+
+@pytest.mark.asyncio
+async def test_prerender_refreshes_stale_and_evicted_entries(service):
+    """Test that entries are re-rendered after the refresh interval or a purge."""
+    prerenderer = DemoPrerenderer(service, refresh_interval_sec=3600)
+    await prerenderer.render_once()
+    total = len(build_demo_catalog())
+    
+    service.cache.clear()
+    assert prerenderer.snapshot()["coverage"] == 0.0
+    assert (await prerenderer.render_once())["rendered"] == total
+    
+    with patch('app.services.demo_prerender.time.time', return_value=prerenderer.last_run["finished_at"] + 7200):
+        assert prerenderer.snapshot()["stale"] == total
+        assert (await prerenderer.render_once())["rendered"] == total
+
+
+def test_prerender_disabled_without_cache(service):
+    """Test that the job is disabled when the TTS cache is off."""
+    service.cache = None
+    prerenderer = DemoPrerenderer(service, refresh_interval_sec=0)
+    
+    assert not prerenderer.enabled
+    assert prerenderer.snapshot()["status"] == "disabled"
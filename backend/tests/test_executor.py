@@ -0,0 +1,145 @@
+"""Tests for the audio worker pool."""
+import os
+import sys
+import time
+import asyncio
+import threading
+import pytest
+from unittest.mock import patch
+from app.core.executor import AudioWorkerPool
+from app.core.exceptions import ServiceOverloadedError
+from app.core.metrics import metrics
+from app.utils.ffmpeg_decoder import ffmpeg_decoder_pool
+
+
+def _get_pid() -> int:
+    """Return the current process id (module-level so it pickles)."""
+    return os.getpid()
+
+
+def _record_metric() -> int:
+    """Record a metric inside a worker (module-level so it pickles)."""
+    metrics.increment("test.worker_events", 3)
+    return os.getpid()
+
+
+def _decoder_pids() -> list:
+    """Return the pids of the worker's idle ffmpeg decoders (module-level so it pickles)."""
+    ffmpeg_decoder_pool._get_spawner().submit(lambda: None).result()
+    return [process.pid for process in list(ffmpeg_decoder_pool._spares.queue)]
+
+
+def _is_running(pid: int) -> bool:
+    """Check whether a process exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+@pytest.mark.asyncio
+async def test_run_off_event_loop():
+    """Test that blocking work does not stall the event loop."""
+    pool = AudioWorkerPool(mode="thread", max_workers=2, queue_depth=0)
+    ticks = 0
+    
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+    
+    ticker_task = asyncio.create_task(ticker())
+    try:
+        result = await pool.run(time.sleep, 0.2)
+    finally:
+        ticker_task.cancel()
+        pool.shutdown()
+    
+    assert result is None
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_full():
+    """Test that tasks beyond workers + queue depth are shed."""
+    pool = AudioWorkerPool(mode="thread", max_workers=1, queue_depth=1)
+    release = threading.Event()
+    
+    first = asyncio.create_task(pool.run(release.wait))
+    second = asyncio.create_task(pool.run(release.wait))
+    await asyncio.sleep(0.05)
+    
+    with pytest.raises(ServiceOverloadedError):
+        await pool.run(release.wait)
+    
+    release.set()
+    await asyncio.gather(first, second)
+    await asyncio.sleep(0.01)
+    assert pool.stats()["rejected"] == 1
+    assert pool.stats()["in_flight"] == 0
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_task_timeout():
+    """Test that a slow task raises TimeoutError."""
+    pool = AudioWorkerPool(mode="thread", max_workers=1, queue_depth=0, task_timeout=0.05)
+    
+    with pytest.raises(asyncio.TimeoutError):
+        await pool.run(time.sleep, 0.5)
+    
+    assert pool.stats()["timed_out"] == 1
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_process_mode_prewarm():
+    """Test that process mode runs work in pre-warmed worker processes."""
+    pool = AudioWorkerPool(mode="process", max_workers=2, queue_depth=0)
+    try:
+        await pool.start()
+        pid = await pool.run(_get_pid)
+    finally:
+        pool.shutdown()
+    
+    assert pid != os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_process_mode_forwards_metrics():
+    """Test that metrics recorded in a worker process reach the parent registry."""
+    pool = AudioWorkerPool(mode="process", max_workers=1, queue_depth=0)
+    before = metrics.snapshot()["counters"].get("test.worker_events", 0)
+    try:
+        pid = await pool.run(_record_metric)
+    finally:
+        pool.shutdown()
+    
+    assert pid != os.getpid()
+    assert metrics.snapshot()["counters"]["test.worker_events"] == before + 3
+
+
+@pytest.mark.asyncio
+async def test_process_mode_shutdown_stops_worker_decoders(tmp_path):
+    """Test that shutting the pool down terminates each worker's idle ffmpeg decoders."""
+    # Stand-in ffmpeg that keeps running after its stdin closes
+    script = tmp_path / "ffmpeg"
+    script.write_text(f"#!{sys.executable}\nimport time\ntime.sleep(30)\n")
+    script.chmod(0o755)
+    pool = AudioWorkerPool(mode="process", max_workers=1, queue_depth=0)
+    
+    with patch.object(ffmpeg_decoder_pool, 'binary', str(script)), \
+            patch.object(ffmpeg_decoder_pool, '_checked', False):
+        try:
+            await pool.start()
+            pids = await pool.run(_decoder_pids)
+        finally:
+            pool.shutdown()
+    
+    assert pids
+    deadline = time.monotonic() + 10
+    while any(_is_running(pid) for pid in pids) and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+    assert not any(_is_running(pid) for pid in pids)
@@ -0,0 +1,149 @@
+"""Tests for the pooled ffmpeg decoder."""
+import sys
+import shutil
+import struct
+import numpy as np
+import pytest
+from unittest.mock import patch
+from app.utils import audio_utils
+from app.utils.audio_probe import mp4_moov_at_end
+from app.utils.audio_utils import AudioPipeline
+from app.utils.ffmpeg_decoder import FFmpegDecoderPool
+from app.core.metrics import metrics
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path):
+    """Stand-in ffmpeg that copies its input (stdin or a file, raw int16 PCM) to stdout."""
+    script = tmp_path / "ffmpeg"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        "source = sys.argv[sys.argv.index('-i') + 1]\n"
+        "data = sys.stdin.buffer.read() if source == 'pipe:0' else open(source, 'rb').read()\n"
+        "sys.stdout.buffer.write(data)\n"
+    )
+    script.chmod(0o755)
+    return str(script)
+
+
+@pytest.fixture
+def pool(fake_ffmpeg):
+    """Decoder pool backed by the fake ffmpeg binary."""
+    decoder_pool = FFmpegDecoderPool(size=2, sample_rate=16000, binary=fake_ffmpeg, timeout=10.0)
+    yield decoder_pool
+    decoder_pool.shutdown()
+
+
+def _pcm(n_samples: int) -> bytes:
+    """Generate int16 PCM bytes."""
+    return (np.arange(n_samples) % 1000).astype("<i2").tobytes()
+
+
+def test_decode_returns_float_samples(pool):
+    """Test that decoded PCM is converted to float32 samples."""
+    samples = pool.decode(_pcm(1600))
+    
+    assert samples is not None
+    assert samples.dtype == np.float32
+    assert len(samples) == 1600
+    assert samples[999] == pytest.approx(999 / 32768.0)
+
+
+def test_decode_uses_prespawned_processes(pool):
+    """Test that requests are served by idle processes started ahead of time."""
+    assert pool.start()
+    pool._get_spawner().submit(lambda: None).result()
+    assert pool.stats()["idle"] == 2
+    
+    misses_before = metrics.snapshot()["counters"].get("audio.ffmpeg.pool_misses", 0)
+    for _ in range(3):
+        assert pool.decode(_pcm(160)) is not None
+        # Wait for the background replacement
+        pool._get_spawner().submit(lambda: None).result()
+    misses_after = metrics.snapshot()["counters"].get("audio.ffmpeg.pool_misses", 0)
+    
+    assert misses_after == misses_before
+    assert pool.stats()["idle"] == 2
+
+
+def test_moov_at_end_decoded_from_file(pool):
+    """Test that an M4A with its index after the media data bypasses the stdin pipe."""
+    ftyp = b"\x00\x00\x00\x10ftypM4A \x00\x00\x00\x00"
+    mdat = struct.pack(">I4s", 8 + 3200, b"mdat") + _pcm(1600)
+    moov = struct.pack(">I4s", 8, b"moov")
+    
+    with patch.object(pool, '_acquire') as mock_acquire:
+        samples = pool.decode(ftyp + mdat + moov)
+        # moov first: streamable through the pipe
+        assert not mp4_moov_at_end(ftyp + moov + mdat)
+    
+    mock_acquire.assert_not_called()
+    assert samples is not None
+    assert len(samples) == len(ftyp + mdat + moov) // 2
+
+
+def test_decode_failure_returns_none(tmp_path):
+    """Test that a non-zero ffmpeg exit is reported as a failed decode."""
+    script = tmp_path / "ffmpeg"
+    script.write_text(f"#!{sys.executable}\nimport sys\nsys.stdin.buffer.read()\nsys.exit(1)\n")
+    script.chmod(0o755)
+    decoder_pool = FFmpegDecoderPool(size=1, binary=str(script), timeout=10.0)
+    try:
+        assert decoder_pool.decode(b"not audio") is None
+    finally:
+        decoder_pool.shutdown()
+
+
+def test_missing_binary_is_unavailable():
+    """Test that the pool reports itself unavailable without ffmpeg."""
+    decoder_pool = FFmpegDecoderPool(binary="definitely-not-ffmpeg")
+    
+    assert not decoder_pool.available
+    assert not decoder_pool.start()
+    assert decoder_pool.decode(b"data") is None
+
+
+def test_pipeline_routes_webm_to_pool(pool):
+    """Test that WebM uploads are decoded by the pool at the ASR rate, without librosa."""
+    webm_bytes = b"\x1a\x45\xdf\xa3" + b"\x00" * 64
+    samples = np.zeros(16000, dtype=np.float32)
+    
+    with patch.object(audio_utils, 'ffmpeg_decoder_pool', pool), \
+            patch.object(pool, 'decode', return_value=samples) as mock_decode, \
+            patch.object(audio_utils.librosa, 'load') as mock_load:
+        pipeline = AudioPipeline(webm_bytes, "recording.webm")
+        
+        assert pipeline.decode()
+        assert pipeline.sample_rate == 16000
+        assert pipeline.duration == pytest.approx(1.0)
+    
+    mock_decode.assert_called_once_with(webm_bytes)
+    mock_load.assert_not_called()
+
+
+def test_pipeline_falls_back_to_librosa(make_wav_bytes):
+    """Test that a failed ffmpeg decode falls back to librosa."""
+    webm_bytes = b"\x1a\x45\xdf\xa3" + b"\x00" * 64
+    
+    with patch.object(audio_utils.ffmpeg_decoder_pool, 'decode', return_value=None), \
+            patch.object(audio_utils.librosa, 'load', return_value=(np.zeros(8000, dtype=np.float32), 8000)) as mock_load:
+        pipeline = AudioPipeline(webm_bytes, "recording.webm")
+        
+        assert pipeline.decode()
+        assert pipeline.sample_rate == 8000
+    
+    mock_load.assert_called_once()
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_real_ffmpeg_decodes_to_target_rate(make_wav_bytes):
+    """Test decoding a real file with ffmpeg resamples to the pool rate."""
+    decoder_pool = FFmpegDecoderPool(size=1, sample_rate=16000)
+    try:
+        samples = decoder_pool.decode(make_wav_bytes(duration_sec=1.0, sample_rate=44100, channels=2))
+    finally:
+        decoder_pool.shutdown()
+    
+    assert samples is not None
+    assert abs(len(samples) - 16000) < 200
@@ -0,0 +1,107 @@
+"""Tests for background health probing of model server replicas."""
+import asyncio
+import httpx
+import pytest
+from unittest.mock import patch
+from app.services.backend_client import CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN, BackendClient
+from app.services.health_prober import HealthProber
+
+
+class StubHealth:
+    """Stub LitServe health endpoints keyed by host."""
+    
+    def __init__(self, latencies):
+        self.latencies = dict(latencies)
+        self.unhealthy = set()
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+    
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        host = request.url.host
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.latencies[host])
+        self.in_flight -= 1
+        healthy = host not in self.unhealthy
+        return httpx.Response(200 if healthy else 503, json={"status": "healthy" if healthy else "unhealthy"})
+    
+    def client(self):
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+    
+    @property
+    def urls(self):
+        return [f"http://{host}/predict" for host in self.latencies]
+
+
+@pytest.mark.asyncio
+async def test_probes_replicas_concurrently_and_records_history():
+    """Test that a round probes every replica at once and caches the results."""
+    stubs = StubHealth({"a": 0.02, "b": 0.02, "c": 0.02})
+    stubs.unhealthy.add("c")
+    backend = BackendClient(stubs.urls)
+    prober = HealthProber(backend, interval_sec=1.0)
+    assert prober.cached_health() is None
+    
+    async with stubs.client() as client:
+        with patch.object(prober, '_get_client', return_value=client):
+            assert await prober.probe_once() is True
+            await prober.probe_once()
+    
+    assert stubs.peak == 3
+    
+    assert prober.cached_health() is True
+    replicas = prober.snapshot()["replicas"]
+    assert replicas["http://a/predict"]["healthy"] is True
+    assert replicas["http://a/predict"]["checks"] == 2
+    assert replicas["http://a/predict"]["latency_ms"] >= 20
+    assert replicas["http://c/predict"]["availability"] == 0.0
+    
+    # Results older than three intervals are not served
+    prober.last_probe_at -= 5.0
+    assert prober.cached_health() is None
+
+
+@pytest.mark.asyncio
+async def test_probe_results_drive_circuit_breakers():
+    """Test that failing probes take a replica out of rotation and a healthy probe brings it back."""
+    stubs = StubHealth({"good": 0.001, "bad": 0.001})
+    stubs.unhealthy.add("bad")
+    backend = BackendClient(stubs.urls, failure_threshold=2, eject_sec=0.01)
+    backend.health_checked = True
+    prober = HealthProber(backend, interval_sec=1.0)
+    bad = backend.replicas[1]
+    
+    async with stubs.client() as client:
+        with patch.object(prober, '_get_client', return_value=client):
+            await prober.probe_once()
+            assert bad.state == CIRCUIT_CLOSED
+            await prober.probe_once()
+            assert bad.state == CIRCUIT_OPEN
+            assert backend.pick() is backend.replicas[0]
+            
+            # No circuit probes of its own while the prober runs
+            calls = stubs.calls
+            await asyncio.sleep(0.05)
+            assert stubs.calls == calls
+            
+            stubs.unhealthy.clear()
+            await prober.probe_once()
+    
+    assert bad.state == CIRCUIT_HALF_OPEN
+    assert prober.cached_health() is True
+
+
+@pytest.mark.asyncio
+async def test_cached_health_false_when_all_replicas_fail():
+    """Test that the cached state reports the model server down when no replica is healthy."""
+    stubs = StubHealth({"a": 0.001})
+    stubs.unhealthy.add("a")
+    prober = HealthProber(BackendClient(stubs.urls), interval_sec=1.0)
+    
+    async with stubs.client() as client:
+        with patch.object(prober, '_get_client', return_value=client):
+            assert await prober.probe_once() is False
+    
+    assert prober.cached_health() is False
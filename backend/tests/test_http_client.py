@@ -0,0 +1,117 @@
+"""Tests for the shared model server HTTP client."""
+import asyncio
+import pytest
+from unittest.mock import patch
+from app.core.http_client import ModelServerHTTPClient
+from app.services.asr_service import ASRService
+from app.services.tts_service import TTSService
+
+
+async def _handle_http(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Answer keep-alive HTTP/1.1 requests with a small JSON body."""
+    body = b'{"status": "healthy"}'
+    while True:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            break
+        length = 0
+        for line in head.split(b"\r\n"):
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":", 1)[1])
+        await reader.readexactly(length)
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+            + f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+    writer.close()
+
+
+def test_client_settings_and_http2_fallback():
+    """Test that pool limits and timeouts are applied and HTTP/2 falls back without h2."""
+    factory = ModelServerHTTPClient(
+        http2=True,
+        max_connections=7,
+        max_keepalive_connections=3,
+        keepalive_expiry=12.0,
+        connect_timeout=1.0,
+        read_timeout=90.0,
+        write_timeout=20.0,
+        pool_timeout=2.0
+    )
+    with patch("app.core.http_client.importlib.util.find_spec", return_value=None):
+        client = factory.get()
+    
+    assert factory.http2 is False
+    assert client.timeout.connect == 1.0
+    assert client.timeout.read == 90.0
+    assert client.timeout.write == 20.0
+    assert client.timeout.pool == 2.0
+    assert factory.get() is client
+    
+    stats = factory.stats()
+    assert stats["max_connections"] == 7
+    assert stats["max_keepalive_connections"] == 3
+    assert stats["keepalive_expiry_sec"] == 12.0
+
+
+def test_missing_h2_warning_deferred_until_http2_is_used(caplog):
+    """Test that the missing-h2 warning is logged when a client is created, not when the factory is."""
+    with patch("app.core.http_client.importlib.util.find_spec", return_value=None):
+        factory = ModelServerHTTPClient(http2=True)
+        assert "h2 package" not in caplog.text
+        
+        ModelServerHTTPClient(http2=False).get()
+        assert "h2 package" not in caplog.text
+        
+        factory.get()
+    assert "h2 package" in caplog.text
+
+
+def test_http2_prior_knowledge_disables_http1():
+    """Test that prior knowledge makes the client speak HTTP/2 only."""
+    factory = ModelServerHTTPClient(http2=False, http2_prior_knowledge=True)
+    
+    with patch("app.core.http_client.importlib.util.find_spec", return_value=object()), \
+            patch("app.core.http_client.httpx.AsyncClient") as mock_client:
+        factory.get()
+    
+    assert mock_client.call_args.kwargs["http1"] is False
+    assert mock_client.call_args.kwargs["http2"] is True
+    assert factory.stats()["http2_prior_knowledge"] is True
+
+
+@pytest.mark.asyncio
+async def test_services_share_one_client():
+    """Test that the TTS and ASR services use the same connection pool."""
+    tts, asr = TTSService(), ASRService()
+    
+    assert await tts._get_client() is await asr._get_client()
+
+
+@pytest.mark.asyncio
+async def test_stats_track_connection_reuse():
+    """Test that pool statistics count requests, opened connections and idle connections."""
+    server = await asyncio.start_server(_handle_http, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    factory = ModelServerHTTPClient(http2=False, max_connections=4)
+    
+    try:
+        client = factory.get()
+        for _ in range(5):
+            response = await client.post(f"http://127.0.0.1:{port}/health", json={"endpoint": "health"})
+            assert response.status_code == 200
+        stats = factory.stats()
+    finally:
+        await factory.close()
+        server.close()
+        await server.wait_closed()
+    
+    assert stats["requests"] == 5
+    assert stats["connections_opened"] == 1
+    assert stats["requests_per_connection"] == 5.0
+    assert stats["open_connections"] == 1
+    assert stats["idle_connections"] == 1
+    assert stats["utilization"] == 0.0
+    assert stats["http_versions"] == {"HTTP/1.1": 5}
@@ -28,6 +28,22 @@ async def test_health_check_endpoint(client):
             assert data["tts_model_available"] is True
 
 
+def test_health_check_uses_cached_probe_state(client):
+    """Test that /health answers from the background prober without calling the model server."""
+    with patch('app.main.health_prober.cached_health', return_value=False), \
+            patch('app.services.tts_service.tts_service.is_available', new_callable=AsyncMock) as mock_tts_avail, \
+            patch('app.services.asr_service.asr_service.is_available', new_callable=AsyncMock) as mock_asr_avail:
+        response = client.get("/health")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "degraded"
+    assert data["asr_model_available"] is False
+    assert data["tts_model_available"] is False
+    mock_tts_avail.assert_not_awaited()
+    mock_asr_avail.assert_not_awaited()
+
+
 @pytest.mark.asyncio
 async def test_root_endpoint(client):
     """Test root endpoint."""
@@ -39,6 +55,30 @@ async def test_root_endpoint(client):
     assert "version" in data
 
 
+@pytest.mark.asyncio
+async def test_metrics_endpoint(client):
+    """Test metrics endpoint."""
+    with patch('app.core.security.settings.ADMIN_API_KEY', 'test-admin-key'):
+        response = client.get("/metrics", headers={"X-Admin-Key": "test-admin-key"})
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert "counters" in data
+    assert "asr_audio_cache" in data
+    assert "hits" in data["asr_audio_cache"]
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_requires_admin_key(client):
+    """Test that metrics are not served without the admin key."""
+    assert client.get("/metrics").status_code == 403
+    
+    with patch('app.core.security.settings.ADMIN_API_KEY', 'test-admin-key'):
+        response = client.get("/metrics", headers={"X-Admin-Key": "wrong"})
+    
+    assert response.status_code == 403
+
+
 @pytest.mark.asyncio
 async def test_full_tts_flow(client):
     """Test complete TTS flow from request to response."""
@@ -0,0 +1,165 @@
+"""Tests for single-flight request coalescing."""
+import asyncio
+import pytest
+import httpx
+from unittest.mock import patch
+from app.core.singleflight import SingleFlight
+from app.services.tts_service import TTSService
+from app.services.asr_service import ASRService
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    """Test that identical concurrent calls run the function once."""
+    flight = SingleFlight("test")
+    calls = 0
+    
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "result"
+    
+    results = await asyncio.gather(*[flight.do("key", work) for _ in range(10)])
+    
+    assert results == ["result"] * 10
+    assert calls == 1
+    assert flight.stats() == {"in_flight": 0, "calls": 1, "saved_calls": 9, "abandoned_calls": 0}
+
+
+@pytest.mark.asyncio
+async def test_different_keys_run_separately():
+    """Test that different keys are not coalesced."""
+    flight = SingleFlight("test")
+    
+    async def work(value):
+        await asyncio.sleep(0.01)
+        return value
+    
+    results = await asyncio.gather(flight.do("a", lambda: work(1)), flight.do("b", lambda: work(2)))
+    
+    assert results == [1, 2]
+    assert flight.stats()["calls"] == 2
+
+
+@pytest.mark.asyncio
+async def test_sequential_calls_are_not_coalesced():
+    """Test that a finished call is not reused by later callers."""
+    flight = SingleFlight("test")
+    calls = 0
+    
+    async def work():
+        nonlocal calls
+        calls += 1
+        return calls
+    
+    assert await flight.do("key", work) == 1
+    assert await flight.do("key", work) == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_to_all_callers():
+    """Test that an exception is raised in every waiting caller."""
+    flight = SingleFlight("test")
+    
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("backend failed")
+    
+    results = await asyncio.gather(*[flight.do("key", work) for _ in range(3)], return_exceptions=True)
+    
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_others():
+    """Test that the shared call survives the leader being cancelled."""
+    flight = SingleFlight("test")
+    
+    async def work():
+        await asyncio.sleep(0.05)
+        return "done"
+    
+    leader = asyncio.ensure_future(flight.do("key", work))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(flight.do("key", work))
+    await asyncio.sleep(0)
+    leader.cancel()
+    
+    assert await follower == "done"
+
+
+@pytest.mark.asyncio
+async def test_call_cancelled_when_last_caller_leaves():
+    """Test that the shared call is cancelled once every caller has been cancelled."""
+    flight = SingleFlight("test")
+    cancelled = asyncio.Event()
+    
+    async def work():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+    
+    callers = [asyncio.ensure_future(flight.do("key", work)) for _ in range(2)]
+    await asyncio.sleep(0)
+    callers[0].cancel()
+    await asyncio.sleep(0.01)
+    assert not cancelled.is_set()
+    
+    callers[1].cancel()
+    await asyncio.wait_for(cancelled.wait(), timeout=1.0)
+    assert flight.stats()["abandoned_calls"] == 1
+    assert flight.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_tts_concurrent_requests_coalesced(mock_model_server_response_tts_success):
+    """Test that concurrent identical TTS requests make one backend call."""
+    calls = 0
+    
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=mock_model_server_response_tts_success)
+    
+    service = TTSService()
+    service.cache = None
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    
+    with patch.object(service, '_get_client', return_value=client):
+        results = await asyncio.gather(*[
+            service.synthesize(text="Welcome to Somya Labs.", voice="diana", language="en")
+            for _ in range(5)
+        ])
+    
+    assert calls == 1
+    assert len(set(results)) == 1 and results[0] is not None
+    assert service._inflight.stats()["saved_calls"] == 4
+
+
+@pytest.mark.asyncio
+async def test_asr_concurrent_requests_coalesced(make_wav_bytes, mock_model_server_response_asr_success):
+    """Test that concurrent ASR requests for the same audio make one backend call."""
+    calls = 0
+    
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=mock_model_server_response_asr_success)
+    
+    service = ASRService()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    wav_bytes = make_wav_bytes(duration_sec=1.0, sample_rate=16000)
+    
+    with patch.object(service, '_get_client', return_value=client):
+        same = await asyncio.gather(*[service.transcribe(wav_bytes, language="en") for _ in range(4)])
+        # A different language is a different request
+        other = await service.transcribe(wav_bytes, language="hi")
+    
+    assert same == ["This is a test transcription"] * 4
+    assert other == "This is a test transcription"
+    assert calls == 2
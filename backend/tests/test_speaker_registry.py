@@ -0,0 +1,148 @@
+"""Tests for the reference speaker registry."""
+import io
+import base64
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import soundfile as sf
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, patch
+from app.core.exceptions import ServiceOverloadedError
+from app.main import app
+from app.services.speaker_registry import ReferenceSpeakerRegistry
+
+
+@pytest.fixture
+def registry(tmp_path):
+    """Create a registry backed by a temporary directory."""
+    return ReferenceSpeakerRegistry(storage_dir=str(tmp_path), max_sec=2.0, min_sec=0.5, cache_mb=1)
+
+
+def test_register_converts_to_compact_form(registry, make_wav_bytes):
+    """Test that clips are stored as 16 kHz mono and capped in length."""
+    content = make_wav_bytes(duration_sec=3.0, sample_rate=44100, channels=2)
+    
+    ref_id, error_msg, info = registry.register(content, "speaker.wav")
+    
+    assert error_msg is None
+    assert registry.exists(ref_id)
+    assert info["sample_rate"] == 16000
+    assert info["duration_sec"] == pytest.approx(2.0, abs=0.01)
+    assert info["deduplicated"] is False
+    
+    stored = base64.b64decode(registry.get_base64(ref_id))
+    data, sr = sf.read(io.BytesIO(stored))
+    assert sr == 16000
+    assert data.ndim == 1
+    assert len(stored) < len(content)
+
+
+def test_register_deduplicates_identical_uploads(registry, make_wav_bytes):
+    """Test that the same clip uploaded twice returns the same ref_id."""
+    content = make_wav_bytes(duration_sec=1.0)
+    
+    first_id, _, _ = registry.register(content, "a.wav")
+    with patch('app.services.speaker_registry.AudioPipeline') as mock_pipeline:
+        second_id, _, info = registry.register(content, "b.wav")
+    
+    assert first_id == second_id
+    assert info["deduplicated"] is True
+    mock_pipeline.assert_not_called()
+
+
+def test_concurrent_registrations_of_same_clip(registry, make_wav_bytes):
+    """Test that threads registering the same clip at once all succeed."""
+    content = make_wav_bytes(duration_sec=1.0)
+    
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: registry.register(content, "speaker.wav"), range(8)))
+    
+    assert len({ref_id for ref_id, _, _ in results}) == 1
+    assert all(error_msg is None for _, error_msg, _ in results)
+    assert not list(registry.storage_dir.glob("*.tmp"))
+
+
+def test_register_rejects_short_or_invalid_clips(registry, make_wav_bytes):
+    """Test that clips without enough audio or with bad formats are rejected."""
+    ref_id, error_msg, _ = registry.register(make_wav_bytes(duration_sec=0.2), "short.wav")
+    assert ref_id is None
+    assert "at least" in error_msg
+    
+    ref_id, error_msg, _ = registry.register(b"not audio", "speaker.txt")
+    assert ref_id is None
+    assert error_msg
+
+
+def test_register_rejects_long_clips_before_decoding(registry, make_wav_bytes):
+    """Test that clips over MAX_AUDIO_DURATION_SEC are rejected from the header without decoding."""
+    content = make_wav_bytes(duration_sec=3.0)
+    
+    with patch('app.utils.audio_utils.settings.MAX_AUDIO_DURATION_SEC', 2), \
+         patch('app.services.speaker_registry.AudioPipeline.decode') as mock_decode:
+        ref_id, error_msg, _ = registry.register(content, "long.wav")
+    
+    assert ref_id is None
+    assert "maximum allowed duration" in error_msg
+    mock_decode.assert_not_called()
+
+
+def test_unknown_ref_id(registry):
+    """Test lookups of unknown or malformed ids."""
+    assert registry.get_base64("0" * 32) is None
+    assert not registry.exists("../../etc/passwd")
+
+
+def test_clone_reference_endpoint(tmp_path, make_wav_bytes):
+    """Test registering a clip through the API and using it for TTS."""
+    test_registry = ReferenceSpeakerRegistry(storage_dir=str(tmp_path))
+    content = make_wav_bytes(duration_sec=1.5)
+    
+    with patch('app.services.speaker_registry.reference_speaker_registry', test_registry), \
+         patch('app.api.v1.tts.reference_speaker_registry', test_registry):
+        client = TestClient(app)
+        response = client.post(
+            "/api/v1/voices/clone-reference",
+            files={"audio": ("speaker.wav", content, "audio/wav")}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["sample_rate"] == 16000
+        assert data["deduplicated"] is False
+        
+        again = client.post(
+            "/api/v1/voices/clone-reference",
+            files={"audio": ("speaker.wav", content, "audio/wav")}
+        )
+        assert again.json()["ref_id"] == data["ref_id"]
+        assert again.json()["deduplicated"] is True
+        
+        missing = client.post(
+            "/api/v1/tts",
+            json={"text": "Hello", "voice": "patrick", "ref_id": "f" * 32}
+        )
+        assert missing.status_code == 404
+
+
+def test_clone_reference_endpoint_rejects_invalid_audio():
+    """Test that unsupported uploads return 400."""
+    client = TestClient(app)
+    response = client.post(
+        "/api/v1/voices/clone-reference",
+        files={"audio": ("speaker.txt", b"not audio", "text/plain")}
+    )
+    
+    assert response.status_code == 400
+
+
+def test_clone_reference_endpoint_overloaded(make_wav_bytes):
+    """Test that a shed upload returns the error's status with Retry-After."""
+    client = TestClient(app)
+    
+    with patch('app.api.v1.voices.audio_worker_pool.run', new_callable=AsyncMock) as mock_run:
+        mock_run.side_effect = ServiceOverloadedError("Too many requests", retry_after=3, status_code=429)
+        response = client.post(
+            "/api/v1/voices/clone-reference",
+            files={"audio": ("speaker.wav", make_wav_bytes(duration_sec=1.0), "audio/wav")}
+        )
+    
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "3"
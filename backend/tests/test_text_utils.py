@@ -0,0 +1,70 @@
+"""Tests for TTS text segmentation."""
+import pytest
+from app.utils.text_utils import detect_script_language, split_sentences, split_text_for_tts
+
+
+def test_split_english_sentences():
+    """Test English splitting with abbreviations, decimals and quotes."""
+    text = 'Dr. Rao paid 3.5 dollars. He said "Thank you!" Then he left... Is that all?'
+    
+    assert split_sentences(text, "en") == [
+        "Dr. Rao paid 3.5 dollars.",
+        'He said "Thank you!"',
+        "Then he left...",
+        "Is that all?",
+    ]
+
+
+@pytest.mark.parametrize("language", ["hi", "mr", "sa", None])
+def test_split_devanagari_danda(language):
+    """Test that the danda and double danda end sentences."""
+    text = "नमस्ते। आप कैसे हैं? मैं ठीक हूँ॥धन्यवाद"
+    
+    assert split_sentences(text, language) == ["नमस्ते।", "आप कैसे हैं?", "मैं ठीक हूँ॥", "धन्यवाद"]
+
+
+def test_split_kannada_and_telugu():
+    """Test Kannada and Telugu full stops and question marks."""
+    assert split_sentences("ನಮಸ್ಕಾರ. ನೀವು ಹೇಗಿದ್ದೀರಿ?", "kn") == ["ನಮಸ್ಕಾರ.", "ನೀವು ಹೇಗಿದ್ದೀರಿ?"]
+    assert split_sentences("నమస్కారం. మీరు ఎలా ఉన్నారు?", "te") == ["నమస్కారం.", "మీరు ఎలా ఉన్నారు?"]
+
+
+def test_detect_script_language():
+    """Test script-based language detection."""
+    assert detect_script_language("नमस्ते दुनिया") == "hi"
+    assert detect_script_language("ನಮಸ್ಕಾರ") == "kn"
+    assert detect_script_language("నమస్కారం") == "te"
+    assert detect_script_language("Hello") == "en"
+
+
+def test_paragraph_breaks_split():
+    """Test that blank lines separate sentences without punctuation."""
+    assert split_sentences("Heading\n\nBody text", "en") == ["Heading", "Body text"]
+
+
+def test_long_sentence_split_at_clauses():
+    """Test that over-long sentences are split at clauses, then words."""
+    text = "First clause is here, second clause follows; " + "word " * 40 + "end."
+    
+    chunks = split_text_for_tts(text, "en", max_chars=60)
+    
+    assert all(len(chunk) <= 60 for chunk in chunks)
+    assert chunks[0] == "First clause is here, second clause follows;"
+    assert " ".join(chunks).split() == text.split()
+
+
+def test_short_fragments_merged():
+    """Test that very short sentences are merged with their neighbour."""
+    chunks = split_text_for_tts("Hi. Yes. This sentence is long enough on its own.", "en", max_chars=100)
+    
+    assert chunks == ["Hi. Yes. This sentence is long enough on its own."]
+
+
+def test_chunks_preserve_text():
+    """Test that chunking keeps every word in order."""
+    text = "नमस्ते। " * 30 + "यह एक लंबा वाक्य है, जिसमें कई शब्द हैं।"
+    
+    chunks = split_text_for_tts(text, "hi", max_chars=50)
+    
+    assert " ".join(chunks).split() == text.split()
+    assert all(len(chunk) <= 50 for chunk in chunks)
@@ -0,0 +1,262 @@
+"""Round-trip tests for the gateway <-> LitServe audio transport codecs."""
+import io
+import json
+import base64
+import httpx
+import numpy as np
+import pytest
+import soundfile as sf
+from unittest.mock import patch
+from app.services.asr_service import ASRService
+from app.services.tts_service import TTSService
+from app.utils.audio_codec import concatenate_wav, decode_transport_audio, encode_transport_audio
+from app.utils.transport_frames import FRAME_CONTENT_TYPE, decode_frame, encode_frame, is_frame_content_type
+
+
+def _read_samples(wav_bytes):
+    data, sr = sf.read(io.BytesIO(wav_bytes), dtype='int16')
+    return data, sr
+
+
+def make_stub_litserve(reference_wav, requests_seen, supported_codecs=("wav", "flac", "pcm16"), supports_binary=True):
+    """Build a stub LitServe server that understands the transport codecs and binary frames."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        if is_frame_content_type(request.headers.get("content-type", "")):
+            if not supports_binary:
+                return httpx.Response(415, json={"detail": "Unsupported Media Type"})
+            body, audio_payload = decode_frame(request.content)
+        else:
+            body = json.loads(request.content)
+            audio_payload = base64.b64decode(body["audio_base64"]) if "audio_base64" in body else None
+        requests_seen.append(body)
+        
+        if body["endpoint"] == "asr":
+            codec = body.get("audio_codec", "wav")
+            if codec not in supported_codecs:
+                return httpx.Response(200, json={"success": False, "error": "UNSUPPORTED_CODEC", "message": codec})
+            audio = decode_transport_audio(audio_payload, codec)
+            received, _ = _read_samples(audio)
+            expected, _ = _read_samples(reference_wav)
+            transcription = "lossless" if np.array_equal(received, expected) else "corrupted"
+            return httpx.Response(200, json={"success": True, "transcription": transcription})
+        
+        codec = body.get("response_codec", "wav")
+        if codec not in supported_codecs:
+            codec = "wav"
+        audio, codec = encode_transport_audio(reference_wav, codec)
+        metadata = {"success": True}
+        if codec != "wav":
+            metadata["audio_codec"] = codec
+        if supports_binary and body.get("response_format") == "binary":
+            return httpx.Response(200, content=encode_frame(metadata, audio), headers={"Content-Type": FRAME_CONTENT_TYPE})
+        return httpx.Response(200, json={**metadata, "audio_base64": base64.b64encode(audio).decode('utf-8')})
+    
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("codec", ["wav", "flac", "pcm16"])
+async def test_asr_transport_round_trip(make_wav_bytes, codec):
+    """Test that uploaded audio reaches the backend bit-exact and smaller."""
+    wav_bytes = make_wav_bytes(duration_sec=3.0, sample_rate=16000)
+    requests_seen = []
+    service = ASRService()
+    service.audio_codec = codec
+    client = make_stub_litserve(wav_bytes, requests_seen)
+    
+    with patch.object(service, '_get_client', return_value=client):
+        result = await service.transcribe(wav_bytes, language="en")
+    
+    assert result == "lossless"
+    sent_bytes = len(base64.b64decode(requests_seen[0]["audio_base64"]))
+    if codec != "wav":
+        assert requests_seen[0]["audio_codec"] == codec
+        assert sent_bytes < len(wav_bytes)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("codec", ["wav", "flac", "pcm16"])
+async def test_tts_transport_round_trip(make_wav_bytes, codec):
+    """Test that synthesized audio is decoded back to identical WAV samples."""
+    wav_bytes = make_wav_bytes(duration_sec=3.0, sample_rate=24000)
+    requests_seen = []
+    service = TTSService()
+    service.audio_codec = codec
+    client = make_stub_litserve(wav_bytes, requests_seen)
+    
+    with patch.object(service, '_get_client', return_value=client):
+        result = await service.synthesize(text="Hello", voice="patrick", language="en")
+    
+    received, sr = _read_samples(result)
+    expected, _ = _read_samples(wav_bytes)
+    assert sr == 24000
+    assert np.array_equal(received, expected)
+    if codec != "wav":
+        assert requests_seen[0]["response_codec"] == codec
+
+
+@pytest.mark.asyncio
+async def test_asr_codec_falls_back_when_unsupported(make_wav_bytes):
+    """Test that a call to a backend without codec support is resent as WAV."""
+    wav_bytes = make_wav_bytes(duration_sec=1.0, sample_rate=16000)
+    requests_seen = []
+    service = ASRService()
+    service.audio_codec = "flac"
+    client = make_stub_litserve(wav_bytes, requests_seen, supported_codecs=("wav",))
+    
+    with patch.object(service, '_get_client', return_value=client):
+        result = await service.transcribe(wav_bytes, language="en")
+    
+    assert result == "lossless"
+    assert [request.get("audio_codec") for request in requests_seen] == ["flac", None]
+    # Only this call fell back; the configured codec is unchanged
+    assert service.audio_codec == "flac"
+
+
+def test_encode_non_wav_passthrough():
+    """Test that input which is not WAV is sent unchanged."""
+    payload, codec = encode_transport_audio(b"not a wav file", "pcm16")
+    
+    assert payload == b"not a wav file"
+    assert codec == "wav"
+
+
+def test_concatenate_wav_sample_exact(make_wav_bytes):
+    """Test that concatenation keeps every sample and inserts exact pauses."""
+    first = make_wav_bytes(duration_sec=0.5, sample_rate=22050, frequency=300)
+    second = make_wav_bytes(duration_sec=0.25, sample_rate=22050, frequency=600)
+    
+    combined, sr = _read_samples(concatenate_wav([first, second], pause_ms=100))
+    first_samples, _ = _read_samples(first)
+    second_samples, _ = _read_samples(second)
+    
+    assert sr == 22050
+    assert len(combined) == len(first_samples) + 2205 + len(second_samples)
+    assert np.array_equal(combined[:len(first_samples)], first_samples)
+    assert not combined[len(first_samples):len(first_samples) + 2205].any()
+    assert np.array_equal(combined[-len(second_samples):], second_samples)
+
+
+def test_concatenate_wav_rejects_mismatched_rates(make_wav_bytes):
+    """Test that chunks with different sample rates are rejected."""
+    with pytest.raises(ValueError):
+        concatenate_wav([make_wav_bytes(sample_rate=16000), make_wav_bytes(sample_rate=22050)])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("codec", ["wav", "pcm16"])
+async def test_asr_binary_transport_round_trip(make_wav_bytes, codec):
+    """Test that ASR audio sent as a binary frame arrives bit-exact, without base64."""
+    wav_bytes = make_wav_bytes(duration_sec=2.0, sample_rate=16000)
+    requests_seen = []
+    service = ASRService()
+    service.audio_codec = codec
+    service.transport = "binary"
+    client = make_stub_litserve(wav_bytes, requests_seen)
+    
+    with patch.object(service, '_get_client', return_value=client):
+        result = await service.transcribe(wav_bytes, language="en")
+    
+    assert result == "lossless"
+    assert "audio_base64" not in requests_seen[0]
+    assert requests_seen[0]["language"] == "en"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("codec", ["wav", "flac"])
+async def test_tts_binary_transport_round_trip(make_wav_bytes, codec):
+    """Test that TTS audio returned as a binary frame decodes to identical samples."""
+    wav_bytes = make_wav_bytes(duration_sec=2.0, sample_rate=24000)
+    requests_seen = []
+    service = TTSService()
+    service.audio_codec = codec
+    service.transport = "binary"
+    client = make_stub_litserve(wav_bytes, requests_seen)
+    
+    with patch.object(service, '_get_client', return_value=client):
+        result = await service.synthesize(text="Hello", voice="patrick", language="en")
+    
+    received, _ = _read_samples(result)
+    expected, _ = _read_samples(wav_bytes)
+    assert np.array_equal(received, expected)
+    assert requests_seen[0]["response_format"] == "binary"
+
+
+@pytest.mark.asyncio
+async def test_tts_binary_request_to_legacy_backend(make_wav_bytes):
+    """Test that a backend without frame support still answers with base64 JSON."""
+    wav_bytes = make_wav_bytes(duration_sec=1.0, sample_rate=24000)
+    service = TTSService()
+    service.transport = "binary"
+    client = make_stub_litserve(wav_bytes, [], supports_binary=False)
+    
+    with patch.object(service, '_get_client', return_value=client):
+        result = await service.synthesize(text="Hello", voice="patrick", language="en")
+    
+    assert result == wav_bytes
+
+
+@pytest.mark.asyncio
+async def test_asr_binary_falls_back_to_json(make_wav_bytes):
+    """Test that ASR resends a call as base64 JSON when the backend rejects frames."""
+    wav_bytes = make_wav_bytes(duration_sec=1.0, sample_rate=16000)
+    requests_seen = []
+    service = ASRService()
+    service.transport = "binary"
+    client = make_stub_litserve(wav_bytes, requests_seen, supports_binary=False)
+    
+    with patch.object(service, '_get_client', return_value=client):
+        result = await service.transcribe(wav_bytes, language="en")
+    
+    assert result == "lossless"
+    # Only this call fell back; the configured transport is unchanged
+    assert service.transport == "binary"
+    assert "audio_base64" in requests_seen[-1]
+
+
+@pytest.mark.asyncio
+async def test_asr_binary_does_not_fall_back_on_bad_request(make_wav_bytes):
+    """Test that a plain 400 fails the call without switching transport."""
+    wav_bytes = make_wav_bytes(duration_sec=1.0, sample_rate=16000)
+    requests_seen = []
+    service = ASRService()
+    service.transport = "binary"
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests_seen.append(request.headers["content-type"])
+        return httpx.Response(400, json={"detail": "Invalid language"})
+    
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with patch.object(service, '_get_client', return_value=client):
+        result = await service.transcribe(wav_bytes, language="xx")
+    
+    assert result is None
+    assert service.transport == "binary"
+    assert requests_seen == [FRAME_CONTENT_TYPE]
+
+
+def test_frame_round_trip():
+    """Test encoding and decoding a frame."""
+    frame = encode_frame({"success": True, "audio_codec": "flac"}, b"\x00\x01audio")
+    
+    assert decode_frame(frame) == ({"success": True, "audio_codec": "flac"}, b"\x00\x01audio")
+
+
+def test_frame_rejects_truncation():
+    """Test that truncated or foreign frames are rejected."""
+    frame = encode_frame({"success": True}, b"audio")
+    
+    with pytest.raises(ValueError):
+        decode_frame(frame[:-1])
+    with pytest.raises(ValueError):
+        decode_frame(b"RIFF" + frame[4:])
+
+
+def test_binary_transport_benchmark():
+    """Test that binary frames allocate far less than base64 JSON for 1 MB of audio."""
+    from benchmarks.transport_benchmark import run
+    
+    rows = {(row["direction"], row["transport"]): row for row in run([1.0], iterations=2)}
+    
+    for direction in ("asr_request", "tts_response"):
+        assert rows[(direction, "binary")]["peak_mb"] < rows[(direction, "json")]["peak_mb"] / 2
@@ -1,9 +1,17 @@
 """Tests for TTS service."""
+import io
+import json
+import asyncio
 import pytest
 import base64
+import httpx
+import numpy as np
+import soundfile as sf
 from unittest.mock import AsyncMock, patch
 from httpx import Response
 from app.services.tts_service import TTSService
+from app.utils.output_codec import encode_output_audio
+from app.core.metrics import metrics
 
 
 @pytest.mark.asyncio
@@ -149,3 +157,248 @@ async def test_is_available_failure():
         
         assert result is False
 
+
+
+@pytest.mark.asyncio
+async def test_synthesize_cache_hit(mock_model_server_response_tts_success):
+    """Test that repeated requests are served from the cache."""
+    service = TTSService()
+    
+    mock_response = Response(
+        200,
+        json=mock_model_server_response_tts_success,
+        headers={"Content-Type": "application/json"}
+    )
+    
+    with patch.object(service, '_get_client', return_value=AsyncMock()) as mock_get_client:
+        mock_client = AsyncMock()
+        mock_client.post = AsyncMock(return_value=mock_response)
+        mock_get_client.return_value = mock_client
+        
+        first = await service.synthesize(text="Press one for sales.", voice="diana", language="en")
+        # Whitespace differences normalize to the same key
+        second = await service.synthesize(text="  Press one  for sales. ", voice="diana", language="en")
+        
+        assert first == second
+        assert mock_client.post.call_count == 1
+        assert service.cache.stats()["hits"] == 1
+        
+        # A different voice is a different entry
+        await service.synthesize(text="Press one for sales.", voice="patrick", language="en")
+        assert mock_client.post.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_synthesize_cloning_bypasses_cache(mock_model_server_response_tts_success, sample_audio_base64):
+    """Test that voice-cloning requests always reach the backend."""
+    service = TTSService()
+    
+    mock_response = Response(
+        200,
+        json=mock_model_server_response_tts_success,
+        headers={"Content-Type": "application/json"}
+    )
+    
+    with patch.object(service, '_get_client', return_value=AsyncMock()) as mock_get_client:
+        mock_client = AsyncMock()
+        mock_client.post = AsyncMock(return_value=mock_response)
+        mock_get_client.return_value = mock_client
+        
+        for _ in range(2):
+            await service.synthesize(
+                text="Hello, world!",
+                voice="patrick",
+                cloneing=True,
+                ref_speker_base64=sample_audio_base64
+            )
+        
+        assert mock_client.post.call_count == 2
+        assert len(service.cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_synthesize_failure_not_cached(mock_model_server_response_tts_error):
+    """Test that failed synthesis results are not cached."""
+    service = TTSService()
+    
+    mock_response = Response(
+        200,
+        json=mock_model_server_response_tts_error,
+        headers={"Content-Type": "application/json"}
+    )
+    
+    with patch.object(service, '_get_client', return_value=AsyncMock()) as mock_get_client:
+        mock_client = AsyncMock()
+        mock_client.post = AsyncMock(return_value=mock_response)
+        mock_get_client.return_value = mock_client
+        
+        assert await service.synthesize(text="Hello", voice="patrick") is None
+        assert await service.synthesize(text="Hello", voice="patrick") is None
+        
+        assert mock_client.post.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_long_text_synthesized_per_sentence(make_wav_bytes):
+    """Test that long text is split, synthesized concurrently and stitched in order."""
+    sentences = [f"This is sentence number {i} of the long paragraph, read aloud." for i in range(6)]
+    active = 0
+    max_active = 0
+    
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        index = int(json.loads(request.content)["text"].split()[4])
+        # Earlier sentences finish last, so ordering must come from the stitcher
+        await asyncio.sleep(0.01 * (6 - index))
+        active -= 1
+        audio = make_wav_bytes(duration_sec=0.1 * (index + 1), sample_rate=16000, frequency=200 + 100 * index)
+        return httpx.Response(200, json={"success": True, "audio_base64": base64.b64encode(audio).decode()})
+    
+    service = TTSService()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    
+    with patch.object(service, '_get_client', return_value=client), \
+            patch('app.services.tts_service.settings.TTS_LONG_FORM_ENABLED', True), \
+            patch('app.services.tts_service.settings.TTS_LONG_FORM_MIN_CHARS', 100), \
+            patch('app.services.tts_service.settings.TTS_CHUNK_MAX_CHARS', 80), \
+            patch('app.services.tts_service.settings.TTS_FANOUT_LIMIT', 2), \
+            patch('app.services.tts_service.settings.TTS_SENTENCE_PAUSE_MS', 50.0):
+        result = await service.synthesize(text=" ".join(sentences), voice="diana", language="en")
+    
+    assert result is not None
+    samples, sr = sf.read(io.BytesIO(result), dtype='int16')
+    expected = [sf.read(io.BytesIO(make_wav_bytes(duration_sec=0.1 * (i + 1), sample_rate=16000, frequency=200 + 100 * i)), dtype='int16')[0] for i in range(6)]
+    pause = np.zeros(800, dtype=np.int16)
+    stitched = np.concatenate([part for i, chunk in enumerate(expected) for part in ((pause, chunk) if i else (chunk,))])
+    assert np.array_equal(samples, stitched)
+    assert max_active == 2
+
+
+@pytest.mark.asyncio
+async def test_synthesize_stream_disconnect_cancels_backend_calls(make_wav_bytes):
+    """Test that closing the stream early cancels the in-flight backend requests."""
+    wav_bytes = make_wav_bytes(duration_sec=0.1, sample_rate=16000)
+    cancelled = 0
+    
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal cancelled
+        if json.loads(request.content)["text"].startswith("First"):
+            return httpx.Response(200, json={"success": True, "audio_base64": base64.b64encode(wav_bytes).decode()})
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled += 1
+            raise
+    
+    service = TTSService()
+    service.cache = None
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    
+    with patch.object(service, '_get_client', return_value=client):
+        stream = service.synthesize_stream("First sentence goes here. Second one never ends.", "diana", "en")
+        first = await stream.__anext__()
+        await asyncio.sleep(0.05)
+        # Client disconnects after the first piece
+        await stream.aclose()
+        await asyncio.sleep(0.05)
+    
+    assert first[:4] == b"RIFF"
+    assert cancelled == 1
+    assert service._inflight.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_synthesize_stream_yields_first_sentence_early(make_wav_bytes):
+    """Test that the first sentence is streamed before later sentences finish."""
+    async def fake_synthesize(text, *args, **kwargs):
+        # The last sentence is slow; it must not delay the first piece
+        await asyncio.sleep(0.3 if text.startswith("Last") else 0.01)
+        return make_wav_bytes(duration_sec=0.1, sample_rate=16000)
+    
+    service = TTSService()
+    received = []
+    with patch.object(service, 'synthesize', side_effect=fake_synthesize):
+        start = asyncio.get_running_loop().time()
+        async for piece in service.synthesize_stream("First sentence goes here. Last sentence is slow.", "diana", "en"):
+            received.append((asyncio.get_running_loop().time() - start, piece))
+    
+    assert len(received) == 2
+    assert received[0][0] < 0.2
+    assert received[1][0] >= 0.3
+    assert received[0][1][:4] == b"RIFF"
+    assert metrics.snapshot()["summaries"]["tts.stream.time_to_first_byte_seconds"]["count"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_synthesize_with_ref_id_uses_registry(tmp_path, make_wav_bytes, mock_model_server_response_tts_success):
+    """Test that ref_id requests forward the stored clip and are cached."""
+    from app.services.speaker_registry import ReferenceSpeakerRegistry
+    registry = ReferenceSpeakerRegistry(storage_dir=str(tmp_path))
+    ref_id, _, _ = registry.register(make_wav_bytes(duration_sec=1.5), "speaker.wav")
+    service = TTSService()
+    
+    mock_response = Response(
+        200,
+        json=mock_model_server_response_tts_success,
+        headers={"Content-Type": "application/json"}
+    )
+    
+    with patch('app.services.tts_service.reference_speaker_registry', registry), \
+         patch.object(service, '_get_client', return_value=AsyncMock()) as mock_get_client:
+        mock_client = AsyncMock()
+        mock_client.post = AsyncMock(return_value=mock_response)
+        mock_get_client.return_value = mock_client
+        
+        for _ in range(2):
+            result = await service.synthesize(text="Hello, world!", voice="patrick", ref_id=ref_id)
+            assert result is not None
+        
+        assert mock_client.post.call_count == 1
+        payload = mock_client.post.call_args.kwargs["json"]
+        assert payload["cloneing"] is True
+        assert payload["ref_speker_base64"] == registry.get_base64(ref_id)
+        
+        assert await service.synthesize(text="Hello, world!", voice="patrick", ref_id="0" * 32) is None
+        assert mock_client.post.call_count == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("output_format, sample_rate, expected_rate", [
+    ("flac", None, 24000),
+    ("mp3", 16000, 16000),
+    ("opus", 22050, 24000),
+])
+async def test_synthesize_encodes_output_format(make_wav_bytes, output_format, sample_rate, expected_rate):
+    """Test that encoded variants are cached next to the WAV they come from."""
+    wav_bytes = make_wav_bytes(duration_sec=1.0, sample_rate=24000)
+    service = TTSService()
+    
+    mock_response = Response(
+        200,
+        json={"success": True, "audio_base64": base64.b64encode(wav_bytes).decode("utf-8")},
+        headers={"Content-Type": "application/json"}
+    )
+    
+    with patch.object(service, '_get_client', return_value=AsyncMock()) as mock_get_client:
+        mock_client = AsyncMock()
+        mock_client.post = AsyncMock(return_value=mock_response)
+        mock_get_client.return_value = mock_client
+        
+        with patch('app.services.tts_service.encode_output_audio', wraps=encode_output_audio) as mock_encode:
+            first = await service.synthesize(
+                text="Hello", voice="patrick", output_format=output_format, sample_rate=sample_rate
+            )
+            second = await service.synthesize(
+                text="Hello", voice="patrick", output_format=output_format, sample_rate=sample_rate
+            )
+            wav = await service.synthesize(text="Hello", voice="patrick")
+        
+        assert first == second
+        assert wav == wav_bytes
+        assert mock_encode.call_count == 1
+        assert mock_client.post.call_count == 1
+        data, sr = sf.read(io.BytesIO(first))
+        assert sr == expected_rate
+        assert len(data) / sr == pytest.approx(1.0, abs=0.05)
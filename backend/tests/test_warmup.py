@@ -0,0 +1,81 @@
+"""Tests for startup warm-up and readiness."""
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core import warmup
+from app.core.warmup import WarmupState, run_warmup, warm_audio_pipeline, warmup_state
+
+
+@pytest.fixture
+def client():
+    """Create test client (startup events are not run)."""
+    return TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def reset_warmup_state():
+    """Restore the global warm-up state after each test."""
+    yield
+    warmup_state.reset()
+
+
+def test_warm_audio_pipeline():
+    """Test that the synthetic clip runs through the audio pipeline."""
+    assert warm_audio_pipeline() is True
+
+
+@pytest.mark.asyncio
+async def test_run_warmup_marks_ready():
+    """Test that warm-up runs every step and ends ready."""
+    state = WarmupState()
+    with patch('app.services.asr_service.asr_service.is_available', new=AsyncMock(return_value=True)), \
+            patch('app.services.tts_service.tts_service.is_available', new=AsyncMock(return_value=False)):
+        await run_warmup(state)
+    
+    assert state.ready
+    assert state.steps["audio_pipeline"]["ok"] is True
+    assert state.steps["backend_connections"] == {
+        "ok": True,
+        "asr_available": True,
+        "tts_available": False,
+        "seconds": state.steps["backend_connections"]["seconds"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_failing_step_does_not_block_readiness():
+    """Test that a failed step is reported but the worker still becomes ready."""
+    async def broken_step():
+        raise RuntimeError("boom")
+    
+    state = WarmupState()
+    with patch.object(warmup, 'WARMUP_STEPS', [("broken", broken_step)]):
+        await run_warmup(state)
+    
+    assert state.ready
+    assert state.steps["broken"]["ok"] is False
+    assert state.steps["broken"]["error"] == "boom"
+
+
+def test_ready_endpoint_before_warmup(client):
+    """Test that /ready returns 503 until warm-up has finished."""
+    response = client.get("/ready")
+    
+    assert response.status_code == 503
+    data = response.json()
+    assert data["ready"] is False
+    assert data["status"] == "pending"
+
+
+def test_ready_endpoint_after_warmup(client):
+    """Test that /ready returns 200 once warm-up has finished."""
+    warmup_state.status = "ready"
+    warmup_state.steps = {"audio_pipeline": {"ok": True, "seconds": 1.0}}
+    
+    response = client.get("/ready")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["ready"] is True
+    assert data["steps"]["audio_pipeline"]["ok"] is True